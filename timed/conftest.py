@@ -3,6 +3,7 @@ import inspect
 import pytest
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
+from django.db import transaction
 from factory.base import FactoryMetaClass
 from pytest_factoryboy import register
 from rest_framework.test import APIClient
@@ -96,3 +97,20 @@ def superadmin_client(superadmin_user):
 @pytest.fixture(scope="function", autouse=True)
 def _autoclear_cache():
     cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _run_on_commit(request, monkeypatch):
+    """
+    Run callbacks on commit right away.
+
+    Tests run within a transaction which is never committed, unless they
+    are transactional.
+    """
+    marker = request.node.get_closest_marker("django_db")
+    if "transactional_db" in request.fixturenames or (
+        marker is not None and marker.kwargs.get("transaction")
+    ):
+        return
+
+    monkeypatch.setattr(transaction, "on_commit", lambda func, using=None: func())
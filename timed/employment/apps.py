@@ -8,3 +8,6 @@ class EmploymentConfig(AppConfig):
 
     name = "timed.employment"
     label = "employment"
+
+    def ready(self):
+        from timed.employment import signals  # noqa: F401
@@ -0,0 +1,122 @@
+"""Workday calendars of locations."""
+
+from bisect import bisect_left, bisect_right
+from uuid import uuid4
+
+# calendars of locations built in this process mapped by location id
+_calendars = {}
+
+
+def invalidate(location_id):
+    """Invalidate calendar of location in all processes.
+
+    Token of location is stored in the database, so calendars of other
+    processes are rebuilt once they see the location with the new token.
+    """
+    from timed.employment.models import Location
+
+    Location.objects.filter(id=location_id).update(calendar_token=uuid4())
+    _calendars.pop(location_id, None)
+
+
+class LocationCalendar(object):
+    """Calendar of workdays and public holidays of a location.
+
+    Workdays are stored as bitmask of iso weekdays and public holidays
+    falling on a workday as sorted list, so days within a time frame can
+    be counted without iterating over it.
+    """
+
+    def __init__(self, location, holidays, token=None):
+        self.token = token
+        self.workdays = 0
+        for day in location.workdays:
+            self.workdays |= 1 << (int(day) - 1)
+
+        self.holidays = sorted(
+            holiday for holiday in holidays if self.is_weekday_workday(holiday)
+        )
+
+    @classmethod
+    def get(cls, location):
+        """Get calendar of given location."""
+        return cls.get_many([location])[location.id]
+
+    @classmethod
+    def get_many(cls, locations):
+        """Get calendars of given locations.
+
+        Public holidays of all locations without valid calendar are loaded
+        in a single query.
+
+        :param locations: locations to get calendars of
+        :returns: dict mapping location id to calendar
+        """
+        from timed.employment.models import PublicHoliday
+
+        calendars = {}
+        missing = {}
+        for location in locations:
+            token = location.calendar_token
+            calendar = _calendars.get(location.id)
+            if calendar is not None and calendar.token == token:
+                calendars[location.id] = calendar
+            else:
+                missing[location.id] = (location, token)
+
+        if missing:
+            holidays = {location_id: [] for location_id in missing}
+            for location_id, holiday in PublicHoliday.objects.filter(
+                location__in=missing.keys()
+            ).values_list("location", "date"):
+                holidays[location_id].append(holiday)
+
+            for location_id, (location, token) in missing.items():
+                calendar = cls(location, holidays[location_id], token)
+                _calendars[location_id] = calendars[location_id] = calendar
+
+        return calendars
+
+    def is_weekday_workday(self, day):
+        """Check whether weekday of given day is a workday."""
+        return bool(self.workdays & (1 << (day.isoweekday() - 1)))
+
+    def is_workday(self, day):
+        """Check whether given day is a workday and not a public holiday."""
+        return self.is_weekday_workday(day) and self.count_holidays(day, day) == 0
+
+    def count_weekday_workdays(self, start, end):
+        """Count workdays in time frame including public holidays.
+
+        :param datetime.date start: start of time frame
+        :param datetime.date end: end of time frame
+        :returns: number of workdays
+        """
+        days = (end - start).days + 1
+        if days <= 0:
+            return 0
+
+        weeks, remaining = divmod(days, 7)
+        count = weeks * bin(self.workdays).count("1")
+        weekday = start.isoweekday() - 1
+        for offset in range(remaining):
+            if self.workdays & (1 << ((weekday + offset) % 7)):
+                count += 1
+
+        return count
+
+    def count_holidays(self, start, end):
+        """Count public holidays on workdays in time frame."""
+        if start > end:
+            return 0
+
+        return bisect_right(self.holidays, end) - bisect_left(self.holidays, start)
+
+    def count_workdays(self, start, end):
+        """Count workdays in time frame which are not public holidays.
+
+        :param datetime.date start: start of time frame
+        :param datetime.date end: end of time frame
+        :returns: number of workdays
+        """
+        return self.count_weekday_workdays(start, end) - self.count_holidays(start, end)
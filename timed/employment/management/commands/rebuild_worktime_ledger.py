@@ -0,0 +1,102 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Min
+from django.utils.dateparse import parse_date
+
+from timed.employment.models import Employment, WorktimeLedger
+
+
+class Command(BaseCommand):
+    """
+    Rebuild worktime ledger and verify it against current calculation.
+
+    Per default ledger of all users is rebuilt from their first employment
+    till today. After rebuilding, worktime summed up from ledger is compared
+    with worktime calculated per employment for every user.
+    """
+
+    help = "Rebuild worktime ledger and verify it against current calculation."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            action="append",
+            type=int,
+            dest="users",
+            help="Id of user to rebuild ledger for (default all users).",
+        )
+        parser.add_argument(
+            "--start",
+            type=parse_date,
+            dest="start",
+            help="First day to rebuild (default start of first employment).",
+        )
+        parser.add_argument(
+            "--end",
+            type=parse_date,
+            dest="end",
+            help="Last day to rebuild (default today).",
+        )
+        parser.add_argument(
+            "--verify-only",
+            action="store_true",
+            dest="verify_only",
+            help="Only verify ledger without rebuilding it.",
+        )
+
+    def handle(self, *args, **options):
+        users = options["users"] or get_user_model().objects.values_list(
+            "id", flat=True
+        )
+        start = (
+            options["start"]
+            or Employment.objects.aggregate(start=Min("start_date"))["start"]
+        )
+        end = options["end"] or date.today()
+        if start is None:
+            return
+
+        failures = 0
+        for user in users:
+            if not options["verify_only"]:
+                # rebuild year by year to keep memory footprint low
+                year_start = start
+                while year_start <= end:
+                    year_end = min(date(year_start.year, 12, 31), end)
+                    WorktimeLedger.objects.rebuild([user], year_start, year_end)
+                    year_start = year_end + timedelta(days=1)
+
+            if not self._verify(user, start, end):
+                failures += 1
+
+        if failures:
+            raise CommandError(
+                "Ledger of {0} user(s) does not match calculation".format(failures)
+            )
+
+    def _verify(self, user, start, end):
+        """Compare ledger of user with worktime calculated per employment."""
+        ledger = WorktimeLedger.objects.calculate_worktime([user], start, end)[user]
+
+        employments = Employment.objects.for_user(user, start, end).select_related(
+            "location"
+        )
+        worktimes = [
+            employment.calculate_worktime(start, end) for employment in employments
+        ]
+        calculated = tuple(
+            sum([worktime[index] for worktime in worktimes], timedelta())
+            for index in range(3)
+        )
+
+        if ledger != calculated:
+            self.stderr.write(
+                "User {0}: ledger {1} does not match calculation {2}".format(
+                    user, ledger, calculated
+                )
+            )
+            return False
+
+        return True
@@ -0,0 +1,90 @@
+import time
+from datetime import date
+from functools import partial
+from multiprocessing import Pool
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+
+def _transfer(users, year):
+    """Transfer balances of chunk of users in a single transaction."""
+    absence_credits, overtime_credits = get_user_model().objects.transfer(users, year)
+    return len(users), len(absence_credits) + len(overtime_credits)
+
+
+class Command(BaseCommand):
+    """
+    Transfer worktime and absence balances of all users to new year.
+
+    Same as transfer action of user endpoint but for all users at once.
+    Users are transferred in chunks which are processed in parallel by
+    a pool of processes. Users and absence types which have already been
+    transferred are skipped, so command may be run several times.
+    """
+
+    help = "Transfer worktime and absence balances of all users to new year."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--year",
+            default=date.today().year - 1,
+            type=int,
+            dest="year",
+            help="Year to transfer balances of (default last year).",
+        )
+        parser.add_argument(
+            "--processes",
+            default=1,
+            type=int,
+            dest="processes",
+            help="Number of processes to transfer users with.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            default=50,
+            type=int,
+            dest="chunk_size",
+            help="Number of users transferred in one transaction.",
+        )
+
+    def handle(self, *args, **options):
+        year = options["year"]
+        chunk_size = options["chunk_size"]
+        processes = options["processes"]
+
+        users = list(get_user_model().objects.values_list("id", flat=True))
+        chunks = [
+            users[index : index + chunk_size]
+            for index in range(0, len(users), chunk_size)
+        ]
+        transfer = partial(_transfer, year=year)
+
+        started = time.monotonic()
+        if processes > 1:
+            # forked processes may not share connection of parent
+            connections.close_all()
+            with Pool(processes) as pool:
+                self._report(pool.imap_unordered(transfer, chunks), len(users))
+        else:
+            self._report(map(transfer, chunks), len(users))
+
+        self.stdout.write(
+            "Transferred balances of {0} for {1} users in {2:.1f}s".format(
+                year, len(users), time.monotonic() - started
+            )
+        )
+
+    def _report(self, results, total):
+        """Report progress of transferred chunks."""
+        transferred = 0
+        created = 0
+        for users, credits in results:
+            transferred += users
+            created += credits
+            self.stdout.write(
+                "{0}/{1} users transferred, {2} credits created".format(
+                    transferred, total, created
+                )
+            )
@@ -0,0 +1,47 @@
+# Generated by Django 2.2.13 on 2026-10-17 06:50
+
+import datetime
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employment", "0012_auto_20181026_1528"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WorktimeLedger",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("expected", models.DurationField(default=datetime.timedelta(0))),
+                ("reported", models.DurationField(default=datetime.timedelta(0))),
+                ("absence", models.DurationField(default=datetime.timedelta(0))),
+                (
+                    "overtime_credit",
+                    models.DurationField(default=datetime.timedelta(0)),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="worktime_ledger",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={"unique_together": {("user", "date")},},
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 2.2.13 on 2026-10-17 06:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employment", "0013_worktimeledger"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WorktimeCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateField()),
+                ("reported", models.DurationField()),
+                ("expected", models.DurationField()),
+                ("delta", models.DurationField()),
+                (
+                    "employment",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="worktime_checkpoints",
+                        to="employment.Employment",
+                    ),
+                ),
+            ],
+            options={"unique_together": {("employment", "month")},},
+        ),
+    ]
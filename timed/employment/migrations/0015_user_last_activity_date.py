@@ -0,0 +1,43 @@
+# Generated by Django 2.2.13 on 2026-10-17 07:40
+
+from django.db import migrations, models
+from django.db.models.functions import Greatest
+
+
+def migrate_last_activity_date(apps, schema_editor):
+    User = apps.get_model("employment", "User")
+    Report = apps.get_model("tracking", "Report")
+    Absence = apps.get_model("tracking", "Absence")
+    User.objects.update(
+        last_activity_date=Greatest(
+            models.Subquery(
+                Report.objects.filter(user=models.OuterRef("pk"))
+                .order_by("-date")
+                .values("date")[:1]
+            ),
+            models.Subquery(
+                Absence.objects.filter(
+                    user=models.OuterRef("pk"), on_public_holiday=False
+                )
+                .order_by("-date")
+                .values("date")[:1]
+            ),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employment", "0014_worktimecheckpoint"),
+        ("tracking", "0013_absence_on_public_holiday"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="last_activity_date",
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.RunPython(migrate_last_activity_date, migrations.RunPython.noop),
+    ]
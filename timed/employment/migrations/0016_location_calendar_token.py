@@ -0,0 +1,19 @@
+# Generated by Django 2.2.13 on 2026-10-17 08:41
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employment", "0015_user_last_activity_date"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="location",
+            name="calendar_token",
+            field=models.UUIDField(default=uuid.uuid4, editable=False),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 2.2.13 on 2026-10-17 09:18
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employment", "0016_location_calendar_token"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WorktimeCheckpointVersion",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="worktime_checkpoint_version",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("version", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -1,17 +1,25 @@
 """Models for the employment app."""
 
+import operator
+from collections import defaultdict
 from datetime import date, timedelta
+from functools import reduce
+from itertools import accumulate
+from uuid import uuid4
 
-from dateutil import rrule
+from dateutil.relativedelta import relativedelta
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser, UserManager
+from django.core.cache import cache
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
 from django.db.models import Sum, functions
 from django.utils.translation import ugettext_lazy as _
 
+from timed.employment.calendars import LocationCalendar
 from timed.models import WeekdaysField
 from timed.tracking.models import Absence
+from timed.transaction import on_commit_batched
 
 
 class Location(models.Model):
@@ -25,6 +33,10 @@ class Location(models.Model):
     """
     Workdays defined per location, default is Monday - Friday
     """
+    calendar_token = models.UUIDField(default=uuid4, editable=False)
+    """
+    Version of workdays and public holidays, see `calendars.invalidate`
+    """
 
     def __str__(self):
         """Represent the model as a string.
@@ -164,6 +176,27 @@ class OvertimeCredit(models.Model):
     """
 
 
+def _within_employment(lookup, start, end):
+    """Get filter for given date lookup to be within time frame and employment.
+
+    Filter needs to be applied on a employment queryset. End date NULL of an
+    employment is like employment is ending today.
+
+    :param str lookup: date lookup of relation to filter
+    :param datetime.date start: start of time frame
+    :param datetime.date end: end of time frame
+    :returns: Q object
+    """
+    return (
+        models.Q(**{lookup + "__range": [start, end]})
+        & models.Q(**{lookup + "__gte": models.F("start_date")})
+        & (
+            models.Q(**{"end_date__isnull": True, lookup + "__lte": date.today()})
+            | models.Q(**{lookup + "__lte": models.F("end_date")})
+        )
+    )
+
+
 class EmploymentManager(models.Manager):
     """Custom manager for employments."""
 
@@ -198,6 +231,118 @@ class EmploymentManager(models.Manager):
             models.Q(end__lt=start) | models.Q(start_date__gt=end)
         )
 
+    def for_users(self, users, start, end):
+        """Get employments in given time frame for given users.
+
+        This includes overlapping employments.
+
+        :param users: ids of users of the searched employments
+        :param datetime.date start: start of time frame
+        :param datetime.date end: end of time frame
+        :returns: queryset of employments
+        """
+        queryset = self.annotate(
+            end=functions.Coalesce("end_date", models.Value(date.today()))
+        )
+        return queryset.filter(user__in=users).exclude(
+            models.Q(end__lt=start) | models.Q(start_date__gt=end)
+        )
+
+    def _calculate_absences(self, employments, start, end, frames):
+        """Calculate duration of absences within given employments.
+
+        :param employments: employments to calculate absences for
+        :param start: calculate absences starting on given day.
+        :param end:   calculate absences till given day
+        :param frames: dict mapping employment id to shortened time frame
+        :returns:     generator of tuples of employment id and absence duration
+        """
+        employments_per_user = defaultdict(list)
+        for employment in employments:
+            employments_per_user[employment.user_id].append(employment)
+
+        absences = Absence.objects.filter(
+            user__in=employments_per_user.keys(), date__range=[start, end]
+        ).select_related("type")
+        absences_employments = [
+            (absence, employment)
+            for absence in absences
+            for employment in employments_per_user[absence.user_id]
+            if frames[employment.id][0] <= absence.date <= frames[employment.id][1]
+        ]
+        durations = Absence.objects.calculate_durations(
+            [absence for absence, employment in absences_employments], employments
+        )
+
+        for absence, employment in absences_employments:
+            yield employment.id, durations[absence.id]
+
+    def calculate_worktime(self, employments, start, end):
+        """Calculate reported, expected and balance for given employments.
+
+        Same as `Employment.calculate_worktime` but for several employments
+        at once. Instead of calculating each employment on its own all
+        needed data is loaded in a fixed number of grouped queries
+        independent of the number of given employments.
+
+        :param employments: employments with selected location
+        :param start: calculate worktime starting on given day.
+        :param end:   calculate worktime till given day
+        :returns:     dict mapping employment id to tuple of 3 values
+                      reported, expected and delta in given time frame
+        """
+        employments = {employment.id: employment for employment in employments}
+        if not employments:
+            return {}
+
+        worktimes = {
+            employment: [timedelta(), timedelta()] for employment in employments
+        }
+        today = date.today()
+
+        # shorten time frame to employments
+        frames = {
+            employment.id: (
+                max(start, employment.start_date),
+                min(employment.end_date or today, end),
+            )
+            for employment in employments.values()
+        }
+
+        # expected worktime
+        calendars = LocationCalendar.get_many(
+            {employment.location for employment in employments.values()}
+        )
+        for employment in employments.values():
+            workdays = calendars[employment.location_id].count_workdays(
+                *frames[employment.id]
+            )
+            worktimes[employment.id][1] += employment.worktime_per_day * workdays
+
+        # reported worktime and overtime credits summed up per employment
+        for lookup in ["reports", "overtime_credits"]:
+            durations = (
+                self.filter(
+                    _within_employment("user__{0}__date".format(lookup), start, end),
+                    id__in=employments.keys(),
+                )
+                .values("id")
+                .annotate(duration=Sum("user__{0}__duration".format(lookup)))
+            )
+            for entry in durations:
+                worktimes[entry["id"]][0] += entry["duration"]
+
+        # absences
+        for employment, duration in self._calculate_absences(
+            employments.values(), start, end, frames
+        ):
+            worktimes[employment][0] += duration
+
+        return {
+            employment: (reported, expected, reported - expected)
+            for employment, (reported, expected) in worktimes.items()
+        }
+
 
 class Employment(models.Model):
     """Employment model.
@@ -263,26 +408,8 @@ class Employment(models.Model):
         start = max(start, self.start_date)
         end = min(self.end_date or date.today(), end)
 
-        # workdays is in isoweekday, byweekday expects Monday to be zero
-        week_workdays = [int(day) - 1 for day in self.location.workdays]
-        workdays = rrule.rrule(
-            rrule.DAILY, dtstart=start, until=end, byweekday=week_workdays
-        ).count()
-
-        # converting workdays as db expects 1 (Sunday) to 7 (Saturday)
-        workdays_db = [
-            # special case for Sunday
-            int(day) == 7 and 1 or int(day) + 1
-            for day in self.location.workdays
-        ]
-        holidays = PublicHoliday.objects.filter(
-            location=self.location,
-            date__gte=start,
-            date__lte=end,
-            date__week_day__in=workdays_db,
-        ).count()
-
-        expected_worktime = self.worktime_per_day * (workdays - holidays)
+        calendar = LocationCalendar.get(self.location)
+        expected_worktime = self.worktime_per_day * calendar.count_workdays(start, end)
 
         overtime_credit_data = OvertimeCredit.objects.filter(
             user=self.user_id, date__gte=start, date__lte=end
@@ -294,14 +421,11 @@ class Employment(models.Model):
         ).aggregate(duration_total=Sum("duration"))
         reported_worktime = reported_worktime_data["duration_total"] or timedelta()
 
+        absences = Absence.objects.filter(
+            user=self.user_id, date__gte=start, date__lte=end
+        ).select_related("type")
         absences = sum(
-            [
-                absence.calculate_duration(self)
-                for absence in Absence.objects.filter(
-                    user=self.user_id, date__gte=start, date__lte=end
-                ).select_related("type")
-            ],
-            timedelta(),
+            Absence.objects.calculate_durations(absences, [self]).values(), timedelta()
         )
 
         reported = reported_worktime + absences + overtime_credit
@@ -331,6 +455,170 @@ class UserManager(UserManager):
         )
         return objects.filter(supervisors_count__gt=0)
 
+    def lock(self, users):
+        """Lock rows of given users till end of current transaction.
+
+        Serializes writes of data which is derived per user, like ledger
+        entries. Rows are locked ordered by id to prevent
+        deadlocks.
+
+        :param users: ids or queryset of users to lock
+        """
+        list(
+            self.select_for_update()
+            .filter(id__in=users)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+
+    def update_last_activity_date(self, users):
+        """Update date of latest report or absence of given users.
+
+        :param users: ids of users to update
+        """
+        from timed.tracking.models import Report
+
+        self.filter(id__in=users).update(
+            last_activity_date=functions.Greatest(
+                models.Subquery(
+                    Report.objects.filter(user=models.OuterRef("pk"))
+                    .order_by("-date")
+                    .values("date")[:1]
+                ),
+                models.Subquery(
+                    Absence.objects.filter(user=models.OuterRef("pk"))
+                    .order_by("-date")
+                    .values("date")[:1]
+                ),
+            )
+        )
+
+    def calculate_transfers(self, users, year):
+        """Calculate credits transferring balances of given year to next year.
+
+        For every absence type which does not fill worktime the remaining
+        days and for worktime the balance of given year is credited on the
+        first day of next year. Users and absence types which already have
+        been transferred are skipped.
+
+        :param users: ids of users to transfer balances of
+        :param int year: year to transfer balances of
+        :returns: tuple of lists of unsaved absence credits and overtime
+                  credits
+        """
+        start = date(year, 1, 1)
+        end = date(year, 12, 31)
+        transfer_date = date(year + 1, 1, 1)
+        comment = _("Transfer %(year)s") % {"year": year}
+
+        transferred = set(
+            AbsenceCredit.objects.filter(
+                user__in=users, date=transfer_date, transfer=True
+            ).values_list("user", "absence_type")
+        )
+        credits = {
+            (entry["user"], entry["absence_type"]): entry["days"]
+            for entry in AbsenceCredit.objects.filter(
+                user__in=users, date__range=[start, end]
+            )
+            .values("user", "absence_type")
+            .annotate(days=Sum("days"))
+        }
+        used_days = {
+            (entry["user"], entry["type"]): entry["used_days"]
+            for entry in Absence.objects.filter(
+                user__in=users, date__range=[start, end]
+            )
+            .values("user", "type")
+            .annotate(used_days=models.Count("id"))
+        }
+
+        absence_credits = []
+        absence_types = AbsenceType.objects.filter(fill_worktime=False)
+        for user in users:
+            for absence_type in absence_types:
+                key = (user, absence_type.id)
+                if key in transferred:
+                    continue
+
+                balance = credits.get(key, 0) - used_days.get(key, 0)
+                if balance != 0:
+                    absence_credits.append(
+                        AbsenceCredit(
+                            absence_type=absence_type,
+                            user_id=user,
+                            comment=comment,
+                            date=transfer_date,
+                            days=balance,
+                            transfer=True,
+                        )
+                    )
+
+        transferred = set(
+            OvertimeCredit.objects.filter(
+                user__in=users, date=transfer_date, transfer=True
+            ).values_list("user", flat=True)
+        )
+        # year is over so deltas are summed up from monthly checkpoints
+        worktimes = WorktimeCheckpoint.objects.calculate_worktime(
+            [user for user in users if user not in transferred], start, end
+        )
+        overtime_credits = [
+            OvertimeCredit(
+                user_id=user,
+                comment=comment,
+                date=transfer_date,
+                duration=delta,
+                transfer=True,
+            )
+            for user, (reported, expected, delta) in worktimes.items()
+        ]
+
+        return absence_credits, overtime_credits
+
+    @transaction.atomic
+    def transfer(self, users, year):
+        """Transfer balances of given users and year to next year.
+
+        :param users: ids of users to transfer balances of
+        :param int year: year to transfer balances of
+        :returns: tuple of lists of created absence credits and overtime
+                  credits
+        """
+        absence_credits, overtime_credits = self.calculate_transfers(users, year)
+        AbsenceCredit.objects.bulk_create(absence_credits)
+        OvertimeCredit.objects.bulk_create(overtime_credits)
+
+        # bulk create does not send signals which maintain worktime
+        transfer_date = date(year + 1, 1, 1)
+        users = [overtime_credit.user_id for overtime_credit in overtime_credits]
+        WorktimeCheckpoint.objects.invalidate(
+            transfer_date, transfer_date, user__in=users
+        )
+        if settings.WORKTIME_LEDGER_ENABLED:
+            WorktimeLedger.objects.rebuild(users, transfer_date, transfer_date)
+
+        return absence_credits, overtime_credits
+
+    def calculate_worktime(self, users, start, end):
+        """Calculate reported, expected and balance for given users.
+
+        Same as `User.calculate_worktime` but for several users at once.
+        Worktime is either summed up from the worktime ledger or from
+        monthly checkpoints, so the number of queries is independent of
+        the number of given users.
+
+        :param users: ids of users to calculate worktime for
+        :param start: calculate worktime starting on given day.
+        :param end:   calculate worktime till given day
+        :returns:     dict mapping user id to tuple of 3 values reported,
+                      expected and delta in given time frame
+        """
+        if settings.WORKTIME_LEDGER_ENABLED:
+            return WorktimeLedger.objects.calculate_worktime(users, start, end)
+
+        return WorktimeCheckpoint.objects.calculate_worktime(users, start, end)
+
 
 class User(AbstractUser):
     """Timed specific user."""
@@ -350,10 +638,20 @@ class User(AbstractUser):
     May also be name of organization if need to.
     """
 
+    last_activity_date = models.DateField(null=True, blank=True)
+    """
+    Date of latest report or absence of user.
+
+    Maintained by signal handlers on reports and absences.
+    """
+
     objects = UserManager()
 
     @property
     def is_reviewer(self):
+        if "reviews" in getattr(self, "_prefetched_objects_cache", {}):
+            return bool(self.reviews.all())
+
         return self.reviews.exists()
 
     @property
@@ -372,16 +670,512 @@ class User(AbstractUser):
         :returns:     tuple of 3 values reported, expected and delta in given
                       time frame
         """
-        employments = Employment.objects.for_user(self, start, end).select_related(
-            "location"
+        worktimes = User.objects.calculate_worktime([self.id], start, end)
+        return worktimes[self.id]
+
+
+class WorktimeLedgerManager(models.Manager):
+    """Custom manager for the worktime ledger."""
+
+    def build(self, users, start, end):
+        """Build ledger entries of given users from reports, absences etc.
+
+        Entries are built for each day a user is employed within given time
+        frame. Like in `Employment.calculate_worktime` an employment without
+        end date is considered to end today.
+
+        Entries are not saved to the database.
+
+        :param users: ids of users to build entries for
+        :param datetime.date start: start of time frame
+        :param datetime.date end: end of time frame
+        :returns: list of unsaved ledger entries
+        """
+        from timed.tracking.models import Report
+
+        today = date.today()
+        employments = list(
+            Employment.objects.for_users(users, start, end).select_related("location")
         )
+        calendars = LocationCalendar.get_many(
+            {employment.location for employment in employments}
+        )
+        reports = {
+            (entry["user"], entry["date"]): entry["duration"]
+            for entry in Report.objects.filter(user__in=users, date__range=[start, end])
+            .values("user", "date")
+            .annotate(duration=Sum("duration"))
+        }
+        overtime_credits = {
+            (entry["user"], entry["date"]): entry["duration"]
+            for entry in OvertimeCredit.objects.filter(
+                user__in=users, date__range=[start, end]
+            )
+            .values("user", "date")
+            .annotate(duration=Sum("duration"))
+        }
+        absences = {
+            (absence.user_id, absence.date): absence
+            for absence in Absence.objects.filter(
+                user__in=users, date__range=[start, end]
+            ).select_related("type")
+        }
+
+        entries = []
+        for employment in employments:
+            calendar = calendars[employment.location_id]
+            day = max(start, employment.start_date)
+            while day <= min(employment.end_date or today, end):
+                key = (employment.user_id, day)
+                entry = self.model(
+                    user_id=employment.user_id,
+                    date=day,
+                    reported=reports.get(key, timedelta()),
+                    overtime_credit=overtime_credits.get(key, timedelta()),
+                )
+                if calendar.is_workday(day):
+                    entry.expected = employment.worktime_per_day
+
+                absence = absences.get(key)
+                if absence is not None:
+                    entry.absence = employment.worktime_per_day
+                    if absence.type.fill_worktime:
+                        # prevent negative duration in case user already
+                        # reported more time than worktime per day
+                        entry.absence = max(entry.absence - entry.reported, timedelta())
+
+                entries.append(entry)
+                day += timedelta(days=1)
+
+        return entries
+
+    @transaction.atomic
+    def rebuild(self, users, start, end):
+        """Rebuild ledger entries of given users in given time frame.
+
+        :param users: ids of users to rebuild entries for
+        :param datetime.date start: start of time frame
+        :param datetime.date end: end of time frame
+        """
+        # entries of user are rebuilt one at a time
+        User.objects.lock(users)
+        self.filter(user__in=users, date__range=[start, end]).delete()
+        self.bulk_create(self.build(users, start, end))
 
-        balances = [
-            employment.calculate_worktime(start, end) for employment in employments
-        ]
+    def extend(self):
+        """Extend ledger of employments without end date till today.
+
+        Employments without end date are considered to end today so
+        entries of such employments need to be added day by day.
+        This only runs once a day.
+        """
+        today = date.today()
+        cache_key = "worktime-ledger-extended-{0}".format(today.isoformat())
+        if cache.get(cache_key):
+            return
+
+        employments = Employment.objects.filter(
+            end_date__isnull=True, start_date__lte=today
+        ).annotate(
+            last_date=models.Subquery(
+                self.filter(user=models.OuterRef("user"))
+                .order_by("-date")
+                .values("date")[:1]
+            )
+        )
 
-        reported = sum([balance[0] for balance in balances], timedelta())
-        expected = sum([balance[1] for balance in balances], timedelta())
-        balance = sum([balance[2] for balance in balances], timedelta())
+        # group users by day their ledger needs to be extended from
+        users_per_start = defaultdict(list)
+        for employment in employments:
+            if employment.last_date is None:
+                users_per_start[employment.start_date].append(employment.user_id)
+            elif employment.last_date < today:
+                users_per_start[employment.last_date + timedelta(days=1)].append(
+                    employment.user_id
+                )
 
-        return (reported, expected, balance)
+        for start, users in users_per_start.items():
+            self.bulk_create(self.build(users, start, today), ignore_conflicts=True)
+
+        cache.set(cache_key, True, 24 * 60 * 60)
+
+    def calculate_worktime(self, users, start, end):
+        """Calculate reported, expected and balance for given users.
+
+        Same as `UserManager.calculate_worktime` but summed up from ledger.
+
+        :param users: ids of users to calculate worktime for
+        :param start: calculate worktime starting on given day.
+        :param end:   calculate worktime till given day
+        :returns:     dict mapping user id to tuple of 3 values reported,
+                      expected and delta in given time frame
+        """
+        self.extend()
+
+        worktimes = {user: (timedelta(), timedelta(), timedelta()) for user in users}
+        entries = (
+            self.filter(user__in=users, date__range=[start, end])
+            .values("user")
+            .annotate(
+                reported=Sum("reported") + Sum("absence") + Sum("overtime_credit"),
+                expected=Sum("expected"),
+            )
+        )
+        for entry in entries:
+            worktimes[entry["user"]] = (
+                entry["reported"],
+                entry["expected"],
+                entry["reported"] - entry["expected"],
+            )
+
+        return worktimes
+
+    def calculate_balances(self, user, dates):
+        """Calculate worktime balances of user at given dates.
+
+        Same as balance of `User.calculate_worktime` from first day of year
+        till date, but for many dates at once. Worktime of every day is
+        loaded once and summed up cumulatively per year.
+
+        :param user: id of user to calculate balances for
+        :param dates: dates to calculate balances at
+        :returns: dict mapping date to balance
+        """
+        dates = sorted(dates)
+        if not dates:
+            return {}
+
+        start = date(dates[0].year, 1, 1)
+        end = dates[-1]
+        if settings.WORKTIME_LEDGER_ENABLED:
+            self.extend()
+            entries = self.filter(user=user, date__range=[start, end])
+        else:
+            entries = self.build([user], start, end)
+
+        deltas = [timedelta()] * ((end - start).days + 1)
+        for entry in entries:
+            deltas[(entry.date - start).days] += (
+                entry.reported + entry.absence + entry.overtime_credit - entry.expected
+            )
+
+        balances = {}
+        for year in range(start.year, end.year + 1):
+            # balance starts from zero every year
+            first = (date(year, 1, 1) - start).days
+            last = (min(date(year, 12, 31), end) - start).days
+            cumulated = list(accumulate(deltas[first : last + 1]))
+            for day in dates:
+                if day.year == year:
+                    balances[day] = cumulated[(day - start).days - first]
+
+        return balances
+
+
+class WorktimeLedger(models.Model):
+    """Worktime ledger model.
+
+    A ledger entry holds the worktime of a user on a single day. The
+    ledger is maintained whenever reports, absences, overtime credits,
+    employments or public holidays change so worktime balances can be
+    summed up instead of calculated.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="worktime_ledger",
+    )
+    date = models.DateField()
+    expected = models.DurationField(default=timedelta(0))
+    reported = models.DurationField(default=timedelta(0))
+    absence = models.DurationField(default=timedelta(0))
+    overtime_credit = models.DurationField(default=timedelta(0))
+    objects = WorktimeLedgerManager()
+
+    def __str__(self):
+        """Represent the model as a string.
+
+        :return: The string representation
+        :rtype:  str
+        """
+        return "{0} {1}".format(self.user, self.date.strftime("%d.%m.%Y"))
+
+    class Meta:
+        """Meta information for the worktime ledger model."""
+
+        unique_together = ("user", "date")
+
+
+def _split_months(start, end):
+    """Split time frame into checkpoint months and remaining time frames.
+
+    A month is a checkpoint month when it lies completely within the given
+    time frame and is already over. Days outside of such months are merged
+    into continuous time frames.
+
+    :param datetime.date start: start of time frame
+    :param datetime.date end: end of time frame
+    :returns: tuple of list of first days of checkpoint months and list of
+              tuples of start and end of remaining time frames
+    """
+    today = date.today()
+    months = []
+    frames = []
+    month = start.replace(day=1)
+    while month <= end:
+        month_end = month + relativedelta(months=1, days=-1)
+        if month >= start and month_end <= end and month_end < today:
+            months.append(month)
+        elif frames and frames[-1][1] == month - timedelta(days=1):
+            frames[-1] = (frames[-1][0], min(month_end, end))
+        else:
+            frames.append((max(month, start), min(month_end, end)))
+        month += relativedelta(months=1)
+
+    return months, frames
+
+
+class WorktimeCheckpointManager(models.Manager):
+    """Custom manager for worktime checkpoints."""
+
+    def calculate_worktime(self, users, start, end):
+        """Calculate reported, expected and balance for given users.
+
+        Same as `UserManager.calculate_worktime` but months which are over
+        are summed up from checkpoints. Missing checkpoints are calculated
+        and stored, so only days of the current month or of partially
+        requested months are calculated on each call.
+
+        :param users: ids of users to calculate worktime for
+        :param start: calculate worktime starting on given day.
+        :param end:   calculate worktime till given day
+        :returns:     dict mapping user id to tuple of 3 values reported,
+                      expected and delta in given time frame
+        """
+        users = set(users)
+        worktimes = {user: [timedelta(), timedelta()] for user in users}
+        months, frames = _split_months(start, end)
+        employments, checkpoints = self._get_checkpoints(users, start, end, months)
+
+        employments = {employment.id: employment for employment in employments}
+        for employment, month, reported, expected in checkpoints:
+            worktimes[employments[employment].user_id][0] += reported
+            worktimes[employments[employment].user_id][1] += expected
+
+        for frame_start, frame_end in frames:
+            worktimes_per_employment = Employment.objects.calculate_worktime(
+                [
+                    employment
+                    for employment in employments.values()
+                    if employment.start_date <= frame_end
+                    and employment.end >= frame_start
+                ],
+                frame_start,
+                frame_end,
+            )
+            for employment, worktime in worktimes_per_employment.items():
+                reported, expected, delta = worktime
+                worktimes[employments[employment].user_id][0] += reported
+                worktimes[employments[employment].user_id][1] += expected
+
+        return {
+            user: (reported, expected, reported - expected)
+            for user, (reported, expected) in worktimes.items()
+        }
+
+    def _get_checkpoints(self, users, start, end, months):
+        """Get checkpoints of given months, calculating missing ones.
+
+        :returns: tuple of employments of users within time frame and list
+                  of tuples of employment, month, reported and expected
+        """
+        employments = list(
+            Employment.objects.for_users(users, start, end)
+            .select_related("location")
+            .annotate(
+                checkpoint_version=models.Subquery(
+                    WorktimeCheckpointVersion.objects.filter(
+                        user=models.OuterRef("user")
+                    ).values("version")
+                )
+            )
+        )
+        checkpoints = list(
+            self.filter(employment__in=employments, month__in=months).values_list(
+                "employment", "month", "reported", "expected"
+            )
+        )
+        existing = {(checkpoint[0], checkpoint[1]) for checkpoint in checkpoints}
+
+        # calculate missing checkpoints month by month
+        missing = []
+        for month in months:
+            month_end = month + relativedelta(months=1, days=-1)
+            month_employments = [
+                employment
+                for employment in employments
+                if employment.start_date <= month_end
+                and employment.end >= month
+                and (employment.id, month) not in existing
+            ]
+            worktimes_per_employment = Employment.objects.calculate_worktime(
+                month_employments, month, month_end
+            )
+            for employment, worktime in worktimes_per_employment.items():
+                reported, expected, delta = worktime
+                missing.append(
+                    self.model(
+                        employment_id=employment,
+                        month=month,
+                        reported=reported,
+                        expected=expected,
+                        delta=delta,
+                    )
+                )
+                checkpoints.append((employment, month, reported, expected))
+
+        if missing:
+            # checkpoints might have been created concurrently
+            self.bulk_create(missing, ignore_conflicts=True)
+            self._discard_outdated(employments, months)
+
+        return employments, checkpoints
+
+    def _discard_outdated(self, employments, months):
+        """
+        Delete checkpoints of users invalidated while being calculated.
+
+        Version of users is read along with employments before worktime is
+        calculated. Invalidation bumps version before deleting checkpoints,
+        so a checkpoint stored after being deleted by an invalidation is
+        detected by a changed version.
+        """
+        versions = dict(
+            WorktimeCheckpointVersion.objects.filter(
+                user__in={employment.user_id for employment in employments}
+            ).values_list("user", "version")
+        )
+        outdated = {
+            employment.user_id
+            for employment in employments
+            if versions.get(employment.user_id) != employment.checkpoint_version
+        }
+        if outdated:
+            self.filter(employment__user__in=outdated, month__in=months).delete()
+
+    def _bump_versions(self, users):
+        """Bump version of checkpoints of given users."""
+        users = set(users)
+        WorktimeCheckpointVersion.objects.bulk_create(
+            [
+                WorktimeCheckpointVersion(user_id=user)
+                for user in User.objects.filter(
+                    id__in=users, worktime_checkpoint_version__isnull=True
+                ).values_list("id", flat=True)
+            ],
+            ignore_conflicts=True,
+        )
+        WorktimeCheckpointVersion.objects.filter(user__in=users).update(
+            version=models.F("version") + 1
+        )
+
+    def invalidate(self, start=None, end=None, **filters):
+        """Delete checkpoints of months within given time frame.
+
+        Checkpoints are deleted once current transaction commits, so they
+        may not be calculated again from data which is not yet committed.
+
+        :param datetime.date start: first day of time frame (default no limit)
+        :param datetime.date end: last day of time frame (default no limit)
+        :param filters: filters of employments, e.g. user of employment
+        """
+        transaction.on_commit(lambda: self._invalidate(start, end, filters))
+
+    def _invalidate(self, start, end, filters):
+        employments = Employment.objects.filter(**filters)
+        self._bump_versions(employments.values_list("user", flat=True))
+
+        checkpoints = self.filter(employment__in=employments)
+        if start is not None:
+            checkpoints = checkpoints.filter(month__gte=start.replace(day=1))
+        if end is not None:
+            checkpoints = checkpoints.filter(month__lte=end)
+        checkpoints.delete()
+
+    def invalidate_days(self, days):
+        """Delete checkpoints of months of given days.
+
+        Like `invalidate` but days of all calls within a transaction are
+        invalidated at once, e.g. of all reports deleted by a cascade.
+
+        :param days: tuples of user id and day
+        """
+        on_commit_batched(self._invalidate_days, days)
+
+    def _invalidate_days(self, days):
+        months = defaultdict(set)
+        for user, day in days:
+            months[user].add(day.replace(day=1))
+
+        self._bump_versions(months.keys())
+        self.filter(
+            reduce(
+                operator.or_,
+                (
+                    models.Q(employment__user=user, month__in=user_months)
+                    for user, user_months in months.items()
+                ),
+            )
+        ).delete()
+
+
+class WorktimeCheckpoint(models.Model):
+    """Worktime checkpoint model.
+
+    A checkpoint holds the worktime of an employment within a month which
+    is already over. Checkpoints are deleted whenever data of the month
+    changes and calculated again when needed.
+    """
+
+    employment = models.ForeignKey(
+        Employment, on_delete=models.CASCADE, related_name="worktime_checkpoints"
+    )
+    month = models.DateField()
+    """
+    First day of month
+    """
+
+    reported = models.DurationField()
+    expected = models.DurationField()
+    delta = models.DurationField()
+    objects = WorktimeCheckpointManager()
+
+    def __str__(self):
+        """Represent the model as a string.
+
+        :return: The string representation
+        :rtype:  str
+        """
+        return "{0} {1}".format(self.employment, self.month.strftime("%m.%Y"))
+
+    class Meta:
+        """Meta information for the worktime checkpoint model."""
+
+        unique_together = ("employment", "month")
+
+
+class WorktimeCheckpointVersion(models.Model):
+    """Version of worktime checkpoints of a user.
+
+    Version is bumped on every invalidation of checkpoints of the user, so
+    checkpoints calculated concurrently to an invalidation can be detected.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="worktime_checkpoint_version",
+    )
+    version = models.PositiveIntegerField(default=0)
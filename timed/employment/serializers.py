@@ -1,12 +1,14 @@
 """Serializers for the employment app."""
 
+from collections import defaultdict
 from datetime import date, timedelta
 
 from django.contrib.auth import get_user_model
-from django.db.models import Max, Value
+from django.db.models import Count, Value
 from django.db.models.functions import Coalesce
 from django.utils.duration import duration_string
 from django.utils.translation import ugettext_lazy as _
+from rest_framework.serializers import ListSerializer
 from rest_framework_json_api import relations
 from rest_framework_json_api.serializers import (
     ModelSerializer,
@@ -16,7 +18,7 @@ from rest_framework_json_api.serializers import (
 )
 
 from timed.employment import models
-from timed.tracking.models import Absence, Report
+from timed.tracking.models import Absence
 
 
 class UserSerializer(ModelSerializer):
@@ -56,6 +58,30 @@ class UserSerializer(ModelSerializer):
         ]
 
 
+class WorktimeBalanceListSerializer(ListSerializer):
+    """Calculate worktime balances of all listed users at once."""
+
+    def to_representation(self, data):
+        instances_per_date = defaultdict(list)
+        for instance in data:
+            # balance may already be calculated by view
+            if "balance" not in instance:
+                balance_date = self.child.get_date(instance)
+                instances_per_date[balance_date].append(instance)
+
+        for balance_date, instances in instances_per_date.items():
+            start = date(balance_date.year, 1, 1)
+            # id is mapped to user instance
+            worktimes = get_user_model().objects.calculate_worktime(
+                [instance.id.id for instance in instances], start, balance_date
+            )
+            for instance in instances:
+                _, _, balance = worktimes[instance.id.id]
+                instance["balance"] = duration_string(balance)
+
+        return super().to_representation(data)
+
+
 class WorktimeBalanceSerializer(Serializer):
     date = SerializerMethodField()
     balance = SerializerMethodField()
@@ -64,28 +90,13 @@ class WorktimeBalanceSerializer(Serializer):
     )
 
     def get_date(self, instance):
-        user = instance.id
-        today = date.today()
-
-        if instance.date is not None:
-            return instance.date
-
-        # calculate last reported day if no specific date is set
-        max_absence_date = Absence.objects.filter(user=user, date__lt=today).aggregate(
-            date=Max("date")
-        )
-        max_report_date = Report.objects.filter(user=user, date__lt=today).aggregate(
-            date=Max("date")
-        )
-
-        last_reported_date = max(
-            max_absence_date["date"] or date.min, max_report_date["date"] or date.min
-        )
-
-        instance.date = last_reported_date
+        # without date filter last reported date is annotated by view
         return instance.date
 
     def get_balance(self, instance):
+        if "balance" in instance:
+            return instance["balance"]
+
         balance_date = self.get_date(instance)
         start = date(balance_date.year, 1, 1)
 
@@ -97,6 +108,77 @@ class WorktimeBalanceSerializer(Serializer):
 
     class Meta:
         resource_name = "worktime-balances"
+        list_serializer_class = WorktimeBalanceListSerializer
+
+
+class AbsenceBalanceListSerializer(ListSerializer):
+    """Calculate absence balances of all listed users and types at once."""
+
+    def to_representation(self, data):
+        instances_per_date = defaultdict(list)
+        for instance in data:
+            instances_per_date[instance.date].append(instance)
+
+        for balance_date, instances in instances_per_date.items():
+            self._calculate(instances, date(balance_date.year, 1, 1), balance_date)
+
+        return super().to_representation(data)
+
+    def _calculate(self, instances, start, end):
+        # user is mapped to user instance and id to absence type
+        users = {instance.user.id for instance in instances}
+        absence_types = {instance.id.id for instance in instances}
+
+        absence_credits = defaultdict(list)
+        for absence_credit in models.AbsenceCredit.objects.filter(
+            user__in=users, absence_type__in=absence_types, date__range=[start, end]
+        ).select_related("user"):
+            absence_credits[
+                (absence_credit.user_id, absence_credit.absence_type_id)
+            ].append(absence_credit)
+
+        used_days = {
+            (entry["user"], entry["type"]): entry["used_days"]
+            for entry in Absence.objects.filter(
+                user__in=users,
+                type__in=absence_types,
+                type__fill_worktime=False,
+                date__range=[start, end],
+            )
+            .values("user", "type")
+            .annotate(used_days=Count("id"))
+        }
+
+        used_durations = defaultdict(timedelta)
+        if any(instance.id.fill_worktime for instance in instances):
+            absences = Absence.objects.filter(
+                user__in=users,
+                type__in=absence_types,
+                type__fill_worktime=True,
+                date__range=[start, end],
+            ).select_related("type")
+            employments = models.Employment.objects.filter(
+                user__in=users, start_date__lte=end
+            )
+            durations = Absence.objects.calculate_durations(absences, employments)
+            for absence in absences:
+                used_durations[(absence.user_id, absence.type_id)] += durations.get(
+                    absence.id, timedelta()
+                )
+
+        for instance in instances:
+            key = (instance.user.id, instance.id.id)
+            instance["absence_credits"] = absence_credits[key]
+            if instance.id.fill_worktime:
+                instance["credit"] = None
+                instance["used_days"] = None
+                instance["used_duration"] = duration_string(used_durations[key])
+            else:
+                instance["credit"] = sum(
+                    absence_credit.days for absence_credit in absence_credits[key]
+                )
+                instance["used_days"] = used_days.get(key, 0)
+                instance["used_duration"] = None
 
 
 class AbsenceBalanceSerializer(Serializer):
@@ -167,23 +249,23 @@ class AbsenceBalanceSerializer(Serializer):
 
         For absence types which fill worktime this will be None.
         """
+        if "used_duration" in instance:
+            return instance["used_duration"]
+
         # id is mapped to absence type
         absence_type = instance.id
         if not absence_type.fill_worktime:
             return None
 
         start = self._get_start(instance)
+        absences = Absence.objects.filter(
+            user=instance.user, date__range=[start, instance.date], type_id=instance.id
+        ).select_related("type")
+        employments = models.Employment.objects.filter(
+            user=instance.user, start_date__lte=instance.date
+        )
         absences = sum(
-            [
-                absence.calculate_duration(
-                    models.Employment.objects.get_at(instance.user, absence.date)
-                )
-                for absence in Absence.objects.filter(
-                    user=instance.user,
-                    date__range=[start, instance.date],
-                    type_id=instance.id,
-                ).select_related("type")
-            ],
+            Absence.objects.calculate_durations(absences, employments).values(),
             timedelta(),
         )
         return duration_string(absences)
@@ -223,6 +305,7 @@ class AbsenceBalanceSerializer(Serializer):
 
     class Meta:
         resource_name = "absence-balances"
+        list_serializer_class = AbsenceBalanceListSerializer
 
 
 class EmploymentSerializer(ModelSerializer):
@@ -0,0 +1,278 @@
+"""Signal handlers for the employment app."""
+
+from datetime import date
+from uuid import uuid4
+
+from django.conf import settings
+from django.db.models import DateField, Max, Min, Value
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from timed.employment import calendars
+from timed.employment.models import (
+    AbsenceType,
+    Employment,
+    Location,
+    OvertimeCredit,
+    PublicHoliday,
+    User,
+    WorktimeCheckpoint,
+    WorktimeLedger,
+)
+from timed.tracking.models import Absence, Report
+
+
+def _get_previous(sender, instance, *fields):
+    """Get values of given fields as currently stored in the database."""
+    if instance.pk is None:
+        return None
+
+    # base manager as default manager of absences does not include all
+    return sender._base_manager.filter(pk=instance.pk).values(*fields).first()
+
+
+def _to_date(instance, field):
+    """Get value of date field of instance as date."""
+    return instance._meta.get_field(field).to_python(getattr(instance, field))
+
+
+@receiver(pre_save, sender=Absence)
+@receiver(pre_save, sender=OvertimeCredit)
+@receiver(pre_save, sender=Report)
+def remember_previous_day(sender, instance, **kwargs):
+    fields = ["user", "date"]
+    if sender is Report:
+        # rollup of tracking app is also refreshed for previous task
+        fields += ["task", "task__project"]
+    instance._previous_day = _get_previous(sender, instance, *fields)
+
+
+def _get_days(instance):
+    """Get days of user the instance was and is on."""
+    # date may not yet be converted when instance is created with a string
+    days = {(instance.user_id, _to_date(instance, "date"))}
+    previous = getattr(instance, "_previous_day", None)
+    if previous is not None:
+        days.add((previous["user"], previous["date"]))
+
+    return days
+
+
+@receiver(post_save, sender=Absence)
+@receiver(post_save, sender=OvertimeCredit)
+@receiver(post_save, sender=Report)
+@receiver(post_delete, sender=Absence)
+@receiver(post_delete, sender=OvertimeCredit)
+@receiver(post_delete, sender=Report)
+def invalidate_checkpoints_day(sender, instance, **kwargs):
+    """Invalidate checkpoints of months the instance was and is on."""
+    WorktimeCheckpoint.objects.invalidate_days(_get_days(instance))
+
+
+@receiver(post_save, sender=Absence)
+@receiver(post_save, sender=Report)
+@receiver(post_delete, sender=Absence)
+@receiver(post_delete, sender=Report)
+def update_last_activity_date(sender, instance, created=False, **kwargs):
+    """Update date of latest report or absence of users of instance."""
+    days = _get_days(instance)
+    if created:
+        # absences on public holidays are hidden
+        if not getattr(instance, "on_public_holiday", False):
+            User.objects.filter(id=instance.user_id).update(
+                last_activity_date=Greatest(
+                    "last_activity_date", Value(_to_date(instance, "date"), DateField())
+                )
+            )
+    elif kwargs["signal"] is post_delete or len(days) > 1:
+        User.objects.update_last_activity_date({user for user, day in days})
+
+
+@receiver(post_save, sender=Absence)
+@receiver(post_save, sender=OvertimeCredit)
+@receiver(post_save, sender=Report)
+@receiver(post_delete, sender=Absence)
+@receiver(post_delete, sender=OvertimeCredit)
+@receiver(post_delete, sender=Report)
+def update_ledger_day(sender, instance, **kwargs):
+    """Update ledger entries of days the instance was and is on."""
+    if not settings.WORKTIME_LEDGER_ENABLED:
+        return
+
+    for user, day in _get_days(instance):
+        WorktimeLedger.objects.rebuild([user], day, day)
+
+
+@receiver(pre_save, sender=Employment)
+def remember_previous_employment(sender, instance, **kwargs):
+    instance._previous_employment = _get_previous(
+        sender, instance, "user", "start_date", "end_date"
+    )
+
+
+def _get_frames(instance):
+    """Get time frames of user the employment was and is in."""
+    frames = [
+        (
+            instance.user_id,
+            _to_date(instance, "start_date"),
+            _to_date(instance, "end_date"),
+        )
+    ]
+    previous = getattr(instance, "_previous_employment", None)
+    if previous is not None:
+        frames.append((previous["user"], previous["start_date"], previous["end_date"]))
+
+    return frames
+
+
+@receiver(post_save, sender=Employment)
+@receiver(post_delete, sender=Employment)
+def update_absences_employment(sender, instance, **kwargs):
+    """Update whether absences of user are on a public holiday."""
+    users = {user for user, start, end in _get_frames(instance)}
+    Absence.objects.update_public_holidays(user__in=users)
+    User.objects.update_last_activity_date(users)
+
+
+@receiver(post_save, sender=Employment)
+@receiver(post_delete, sender=Employment)
+def invalidate_checkpoints_employment(sender, instance, **kwargs):
+    """Invalidate checkpoints of user of previous and current employment.
+
+    Besides worktime within the employment, absences on public holidays of
+    its location are hidden, which may affect any other employment of user.
+    """
+    for user, start, end in _get_frames(instance):
+        WorktimeCheckpoint.objects.invalidate(user=user)
+
+
+@receiver(post_save, sender=Employment)
+@receiver(post_delete, sender=Employment)
+def update_ledger_employment(sender, instance, **kwargs):
+    """Update ledger entries within previous and current employment."""
+    if not settings.WORKTIME_LEDGER_ENABLED:
+        return
+
+    for user, start, end in _get_frames(instance):
+        WorktimeLedger.objects.rebuild([user], start, end or date.today())
+
+
+@receiver(pre_save, sender=PublicHoliday)
+def remember_previous_holiday(sender, instance, **kwargs):
+    instance._previous_holiday = _get_previous(sender, instance, "location", "date")
+
+
+def _get_holidays(instance):
+    """Get days of location the holiday was and is on."""
+    holidays = {(instance.location_id, _to_date(instance, "date"))}
+    previous = getattr(instance, "_previous_holiday", None)
+    if previous is not None:
+        holidays.add((previous["location"], previous["date"]))
+
+    return holidays
+
+
+@receiver(post_save, sender=PublicHoliday)
+@receiver(post_delete, sender=PublicHoliday)
+def invalidate_calendar_holiday(sender, instance, **kwargs):
+    """Invalidate calendars of locations the holiday was and is at."""
+    for location, day in _get_holidays(instance):
+        calendars.invalidate(location)
+
+
+@receiver(post_save, sender=PublicHoliday)
+@receiver(post_delete, sender=PublicHoliday)
+def update_absences_holiday(sender, instance, **kwargs):
+    """Update whether absences on day of holiday are on a public holiday."""
+    days = {day for location, day in _get_holidays(instance)}
+    Absence.objects.update_public_holidays(date__in=days)
+    User.objects.update_last_activity_date(
+        Absence._base_manager.filter(date__in=days).values("user")
+    )
+
+
+@receiver(post_save, sender=PublicHoliday)
+@receiver(post_delete, sender=PublicHoliday)
+def invalidate_checkpoints_holiday(sender, instance, **kwargs):
+    """Invalidate checkpoints of users employed at location of holiday."""
+    for location, day in _get_holidays(instance):
+        # absences of users employed at location are hidden on holiday
+        WorktimeCheckpoint.objects.invalidate(
+            day, day, user__employments__location=location
+        )
+
+
+@receiver(post_save, sender=PublicHoliday)
+@receiver(post_delete, sender=PublicHoliday)
+def update_ledger_holiday(sender, instance, **kwargs):
+    """
+    Update ledger entries of users employed at location of holiday.
+
+    Absences on public holidays do not count so all users which have ever
+    been employed at location need to be updated.
+    """
+    if not settings.WORKTIME_LEDGER_ENABLED:
+        return
+
+    for location, day in _get_holidays(instance):
+        users = Employment.objects.filter(location=location).values_list(
+            "user", flat=True
+        )
+        WorktimeLedger.objects.rebuild(set(users), day, day)
+
+
+@receiver(pre_save, sender=Location)
+def invalidate_calendar_location(sender, instance, **kwargs):
+    """Invalidate calendar of location as workdays may change.
+
+    Token is renewed on saved instance, so calendars are rebuilt once
+    location is seen with new token, including the saved instance.
+    """
+    instance.calendar_token = uuid4()
+
+
+@receiver(post_save, sender=Location)
+def invalidate_checkpoints_location(sender, instance, created, **kwargs):
+    """Invalidate checkpoints of employments at location as workdays may change."""
+    if not created:
+        WorktimeCheckpoint.objects.invalidate(location=instance)
+
+
+@receiver(post_save, sender=AbsenceType)
+def invalidate_checkpoints_absence_type(sender, instance, created, **kwargs):
+    """Invalidate checkpoints of users with absences of changed type."""
+    if not created:
+        WorktimeCheckpoint.objects.invalidate(user__absences__type=instance)
+
+
+@receiver(post_save, sender=AbsenceType)
+def update_ledger_absence_type(sender, instance, created, **kwargs):
+    """Update ledger entries of days with absences of changed type."""
+    if not settings.WORKTIME_LEDGER_ENABLED or created:
+        return
+
+    frames = (
+        Absence.objects.filter(type=instance)
+        .values("user")
+        .annotate(start=Min("date"), end=Max("date"))
+        .values_list("user", "start", "end")
+    )
+    for user, start, end in frames:
+        WorktimeLedger.objects.rebuild([user], start, end)
+
+
+@receiver(post_save, sender=Location)
+def update_ledger_location(sender, instance, created, **kwargs):
+    """Update ledger entries of employments at location as workdays may change."""
+    if not settings.WORKTIME_LEDGER_ENABLED or created:
+        return
+
+    employments = Employment.objects.filter(location=instance)
+    for employment in employments:
+        WorktimeLedger.objects.rebuild(
+            [employment.user_id],
+            employment.start_date,
+            employment.end_date or date.today(),
+        )
@@ -30,7 +30,7 @@ def test_absence_balance_full_day(auth_client, django_assert_num_queries):
 
     url = reverse("absence-balance-list")
 
-    with django_assert_num_queries(6):
+    with django_assert_num_queries(5):
         result = auth_client.get(
             url,
             data={
@@ -73,7 +73,7 @@ def test_absence_balance_fill_worktime(auth_client, django_assert_num_queries):
     AbsenceFactory.create(date=day, user=user, type=absence_type)
 
     url = reverse("absence-balance-list")
-    with django_assert_num_queries(11):
+    with django_assert_num_queries(9):
         result = auth_client.get(
             url,
             data={
@@ -182,3 +182,76 @@ def test_absence_balance_invalid_user(auth_client):
 
     result = auth_client.get(url, data={"date": "2017-03-01", "user": "invalid"})
     assert result.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_absence_balance_list_supervisor(auth_client, django_assert_num_queries):
+    day = date(2017, 2, 28)
+    absence_type = AbsenceTypeFactory.create(fill_worktime=False)
+    fill_worktime_type = AbsenceTypeFactory.create(fill_worktime=True)
+    supervisees = UserFactory.create_batch(3)
+    for supervisee in supervisees:
+        supervisee.supervisors.add(auth_client.user)
+        EmploymentFactory.create(
+            user=supervisee, start_date=day, worktime_per_day=timedelta(hours=8)
+        )
+        AbsenceCreditFactory.create(
+            date=day, user=supervisee, days=10, absence_type=absence_type
+        )
+        AbsenceFactory.create(date=day, user=supervisee, type=absence_type)
+        AbsenceFactory.create(
+            date=day + timedelta(days=1), user=supervisee, type=fill_worktime_type
+        )
+    # not a supervisee
+    UserFactory.create()
+
+    url = reverse("absence-balance-list")
+
+    # number of queries is independent of number of users and types
+    with django_assert_num_queries(10):
+        result = auth_client.get(
+            url,
+            data={
+                "date": "2017-03-01",
+                "supervisor": auth_client.user.id,
+                "include": "absence_credits,absence_type",
+            },
+        )
+    assert result.status_code == status.HTTP_200_OK
+
+    json = result.json()
+    assert len(json["data"]) == 6
+    balances = {
+        (
+            int(entry["relationships"]["user"]["data"]["id"]),
+            int(entry["relationships"]["absence-type"]["data"]["id"]),
+        ): entry["attributes"]
+        for entry in json["data"]
+    }
+    for supervisee in supervisees:
+        attributes = balances[(supervisee.id, absence_type.id)]
+        assert attributes["credit"] == 10
+        assert attributes["used-days"] == 1
+        assert attributes["balance"] == 9
+        attributes = balances[(supervisee.id, fill_worktime_type.id)]
+        assert attributes["used-duration"] == "08:00:00"
+
+
+def test_absence_balance_list_users_not_supervisee(auth_client):
+    AbsenceTypeFactory.create()
+    user = UserFactory.create()
+
+    url = reverse("absence-balance-list")
+    result = auth_client.get(
+        url,
+        data={
+            "date": "2017-03-01",
+            "users": "{0},{1}".format(auth_client.user.id, user.id),
+        },
+    )
+    assert result.status_code == status.HTTP_200_OK
+
+    json = result.json()
+    assert len(json["data"]) == 1
+    assert json["data"][0]["relationships"]["user"]["data"]["id"] == str(
+        auth_client.user.id
+    )
@@ -0,0 +1,71 @@
+from datetime import date, timedelta
+
+import pytest
+from dateutil import rrule
+
+from timed.employment import calendars
+from timed.employment.calendars import LocationCalendar
+from timed.employment.factories import LocationFactory, PublicHolidayFactory
+
+
+@pytest.mark.parametrize(
+    "workdays", [["1", "2", "3", "4", "5"], ["1", "3", "6", "7"], ["7"]]
+)
+def test_location_calendar_count_weekday_workdays(db, workdays):
+    location = LocationFactory.create(workdays=workdays)
+    calendar = LocationCalendar(location, [])
+    start = date(2017, 1, 1)
+
+    for days in range(-1, 30):
+        end = start + timedelta(days=days)
+        expected = rrule.rrule(
+            rrule.DAILY,
+            dtstart=start,
+            until=end,
+            byweekday=[int(day) - 1 for day in workdays],
+        ).count()
+        assert calendar.count_weekday_workdays(start, end) == expected
+
+
+def test_location_calendar_count_workdays(db, django_assert_num_queries):
+    location = LocationFactory.create(workdays=["1", "2", "3", "4", "5"])
+    # holiday on a weekend is not counted
+    PublicHolidayFactory.create(location=location, date=date(2017, 1, 1))
+    PublicHolidayFactory.create(location=location, date=date(2017, 1, 2))
+    holiday = PublicHolidayFactory.create(location=location, date=date(2017, 1, 6))
+
+    with django_assert_num_queries(1):
+        calendar = LocationCalendar.get(location)
+        assert calendar.count_workdays(date(2017, 1, 1), date(2017, 1, 31)) == 20
+        assert calendar.count_workdays(date(2017, 1, 3), date(2017, 1, 5)) == 3
+        assert not calendar.is_workday(date(2017, 1, 2))
+        assert calendar.is_workday(date(2017, 1, 3))
+
+    # calendar is cached till a holiday changes
+    with django_assert_num_queries(0):
+        assert LocationCalendar.get(location) is calendar
+
+    holiday.date = date(2017, 1, 5)
+    holiday.save()
+    calendar = LocationCalendar.get(location)
+    assert calendar.count_workdays(date(2017, 1, 3), date(2017, 1, 5)) == 2
+
+    location.workdays = ["1", "2", "3", "4"]
+    location.save()
+    calendar = LocationCalendar.get(location)
+    assert calendar.count_workdays(date(2017, 1, 1), date(2017, 1, 31)) == 16
+
+
+def test_location_calendar_invalidate_other_process(db):
+    location = LocationFactory.create(workdays=["1", "2", "3", "4", "5"])
+    holiday = PublicHolidayFactory.create(location=location, date=date(2017, 1, 6))
+    calendar = LocationCalendar.get(location)
+
+    holiday.date = date(2017, 1, 5)
+    holiday.save()
+    # calendar of other process is still built from previous holiday
+    calendars._calendars[location.id] = calendar
+
+    location.refresh_from_db()
+    calendar = LocationCalendar.get(location)
+    assert calendar.holidays == [date(2017, 1, 5)]
@@ -9,7 +9,7 @@ from rest_framework import status
 from timed.employment import factories
 from timed.employment.admin import EmploymentForm
 from timed.employment.factories import EmploymentFactory, LocationFactory, UserFactory
-from timed.employment.models import Employment
+from timed.employment.models import Employment, User
 from timed.tracking.factories import ReportFactory
 
 
@@ -294,3 +294,66 @@ def test_employment_for_user(db):
     employments = Employment.objects.for_user(user, date(2017, 2, 1), date(2017, 12, 1))
 
     assert employments.count() == 4
+
+
+def test_worktime_balance_multiple_users(db, django_assert_num_queries):
+    """Test calculation of worktime of several users at once."""
+    start = date(2017, 3, 1)
+    end = date(2017, 3, 31)
+    employments = [
+        # employment ending in time frame
+        factories.EmploymentFactory.create(
+            start_date=date(2017, 1, 1),
+            end_date=date(2017, 3, 15),
+            worktime_per_day=timedelta(hours=8),
+        ),
+        # employment starting in time frame
+        factories.EmploymentFactory.create(
+            start_date=date(2017, 3, 20), worktime_per_day=timedelta(hours=6)
+        ),
+    ]
+    # second employment of first user
+    employments.append(
+        factories.EmploymentFactory.create(
+            user=employments[0].user,
+            start_date=date(2017, 3, 16),
+            worktime_per_day=timedelta(hours=4),
+        )
+    )
+    for employment in employments:
+        factories.PublicHolidayFactory.create(
+            date=employment.start_date, location=employment.location
+        )
+        factories.OvertimeCreditFactory.create(
+            user=employment.user,
+            date=employment.start_date,
+            duration=timedelta(hours=2),
+        )
+        ReportFactory.create(
+            user=employment.user,
+            date=employment.start_date + timedelta(days=1),
+            duration=timedelta(hours=10),
+        )
+    user_without_employment = factories.UserFactory.create()
+
+    users = [employments[0].user.id, employments[1].user.id, user_without_employment.id]
+    # checkpoints of march are calculated, stored and checked against
+    # concurrent invalidations
+    with django_assert_num_queries(8):
+        worktimes = User.objects.calculate_worktime(users, start, end)
+
+    for user in users:
+        employment_worktimes = [
+            employment.calculate_worktime(start, end)
+            for employment in employments
+            if employment.user_id == user
+        ]
+        assert worktimes[user] == (
+            sum([worktime[0] for worktime in employment_worktimes], timedelta()),
+            sum([worktime[1] for worktime in employment_worktimes], timedelta()),
+            sum([worktime[2] for worktime in employment_worktimes], timedelta()),
+        )
+
+    # only employments and checkpoints are read, nothing is locked or written
+    with django_assert_num_queries(2):
+        assert User.objects.calculate_worktime(users, start, end) == worktimes
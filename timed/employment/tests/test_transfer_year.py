@@ -0,0 +1,57 @@
+from datetime import date, timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from timed.employment.factories import (
+    AbsenceCreditFactory,
+    AbsenceTypeFactory,
+    EmploymentFactory,
+    UserFactory,
+)
+from timed.employment.models import AbsenceCredit, OvertimeCredit
+from timed.tracking.factories import AbsenceFactory
+
+
+@pytest.mark.freeze_time("2018-01-07")
+def test_transfer_year(db):
+    users = UserFactory.create_batch(3)
+    absence_type = AbsenceTypeFactory.create(fill_worktime=False)
+    AbsenceTypeFactory.create(fill_worktime=True)
+    for user in users:
+        EmploymentFactory.create(
+            user=user, start_date=date(2017, 12, 28), percentage=100
+        )
+        AbsenceCreditFactory.create(
+            user=user, absence_type=absence_type, date=date(2017, 1, 1), days=5
+        )
+        AbsenceFactory.create(user=user, type=absence_type, date=date(2017, 12, 29))
+
+    # already transferred user is skipped
+    OvertimeCredit.objects.create(
+        user=users[0], date=date(2018, 1, 1), duration=timedelta(), transfer=True
+    )
+
+    stdout = StringIO()
+    call_command("transfer_year", chunk_size=2, stdout=stdout)
+    assert "2/3 users transferred" in stdout.getvalue()
+    assert "Transferred balances of 2017 for 3 users" in stdout.getvalue()
+
+    # running transfer twice should lead to same result
+    call_command("transfer_year", stdout=StringIO())
+
+    for user in users:
+        absence_credit = AbsenceCredit.objects.get(user=user, transfer=True)
+        assert absence_credit.date == date(2018, 1, 1)
+        assert absence_credit.days == 4
+        assert absence_credit.comment == "Transfer 2017"
+        assert absence_credit.absence_type == absence_type
+
+        overtime_credit = OvertimeCredit.objects.get(user=user, transfer=True)
+        assert overtime_credit.date == date(2018, 1, 1)
+
+    assert OvertimeCredit.objects.get(user=users[0]).duration == timedelta()
+    assert OvertimeCredit.objects.get(user=users[1]).duration == timedelta(
+        hours=-8, minutes=-30
+    )
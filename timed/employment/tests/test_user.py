@@ -7,6 +7,7 @@ from rest_framework import status
 from timed.employment.factories import (
     AbsenceTypeFactory,
     EmploymentFactory,
+    PublicHolidayFactory,
     UserFactory,
 )
 from timed.projects.factories import ProjectFactory
@@ -247,3 +248,26 @@ def test_user_me_anonymous(client):
 
     response = client.get(url)
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_user_last_activity_date(db):
+    user = UserFactory.create()
+    report = ReportFactory.create(user=user, date=date(2017, 3, 1))
+    absence = AbsenceFactory.create(user=user, date=date(2017, 3, 3))
+    user.refresh_from_db()
+    assert user.last_activity_date == date(2017, 3, 3)
+
+    report.date = date(2017, 3, 6)
+    report.save()
+    user.refresh_from_db()
+    assert user.last_activity_date == date(2017, 3, 6)
+
+    report.delete()
+    user.refresh_from_db()
+    assert user.last_activity_date == date(2017, 3, 3)
+
+    # absences on public holidays are hidden
+    employment = EmploymentFactory.create(user=user, start_date=date(2017, 1, 1))
+    PublicHolidayFactory.create(location=employment.location, date=absence.date)
+    user.refresh_from_db()
+    assert user.last_activity_date is None
@@ -6,11 +6,13 @@ from django.utils.duration import duration_string
 from rest_framework import status
 
 from timed.employment.factories import (
+    AbsenceTypeFactory,
     EmploymentFactory,
     OvertimeCreditFactory,
     PublicHolidayFactory,
     UserFactory,
 )
+from timed.projects.factories import TaskFactory
 from timed.tracking.factories import AbsenceFactory, ReportFactory
 
 
@@ -89,7 +91,7 @@ def test_worktime_balance_with_employments(auth_client, django_assert_num_querie
         args=["{0}_{1}".format(auth_client.user.id, end_date.strftime("%Y-%m-%d"))],
     )
 
-    with django_assert_num_queries(11):
+    with django_assert_num_queries(8):
         result = auth_client.get(url)
     assert result.status_code == status.HTTP_200_OK
 
@@ -159,6 +161,57 @@ def test_worktime_balance_list_supervisor(auth_client):
     assert len(json["data"]) == 2
 
 
+def test_worktime_balance_list_supervisor_balances(
+    auth_client, django_assert_num_queries
+):
+    start_date = date(2017, 3, 20)
+    fill_worktime_type = AbsenceTypeFactory.create(fill_worktime=True)
+    supervisees = UserFactory.create_batch(3)
+    for supervisee in supervisees:
+        auth_client.user.supervisees.add(supervisee)
+        employment = EmploymentFactory.create(
+            user=supervisee, start_date=start_date, worktime_per_day=timedelta(hours=8),
+        )
+        PublicHolidayFactory.create(date=start_date, location=employment.location)
+        ReportFactory.create(
+            user=supervisee,
+            date=start_date + timedelta(days=1),
+            duration=timedelta(hours=10),
+        )
+        ReportFactory.create(
+            user=supervisee,
+            date=start_date + timedelta(days=2),
+            duration=timedelta(hours=3),
+        )
+        AbsenceFactory.create(user=supervisee, date=start_date + timedelta(days=2))
+        AbsenceFactory.create(
+            user=supervisee,
+            date=start_date + timedelta(days=3),
+            type=fill_worktime_type,
+        )
+
+    url = reverse("worktime-balance-list")
+
+    # number of queries is independent of number of users
+    with django_assert_num_queries(9):
+        result = auth_client.get(url, data={"date": "2017-03-24"})
+
+    assert result.status_code == status.HTTP_200_OK
+
+    json = result.json()
+    balances = {
+        int(entry["relationships"]["user"]["data"]["id"]): entry["attributes"][
+            "balance"
+        ]
+        for entry in json["data"]
+    }
+    assert balances[auth_client.user.id] == "00:00:00"
+    for supervisee in supervisees:
+        # 4 workdays of 8 hours, 13 hours reported, 8 hours absence
+        # and 8 hours filled absence
+        assert balances[supervisee.id] == duration_string(timedelta(hours=-3))
+
+
 def test_worktime_balance_list_filter_user(auth_client):
     supervisee = UserFactory.create()
     UserFactory.create()
@@ -215,7 +268,7 @@ def test_worktime_balance_list_last_reported_date(
 
     url = reverse("worktime-balance-list")
 
-    with django_assert_num_queries(9):
+    with django_assert_num_queries(8):
         result = auth_client.get(url, data={"last_reported_date": 1})
 
     assert result.status_code == status.HTTP_200_OK
@@ -225,3 +278,121 @@ def test_worktime_balance_list_last_reported_date(
     entry = json["data"][0]
     assert entry["attributes"]["date"] == "2017-02-01"
     assert entry["attributes"]["balance"] == "02:00:00"
+
+
+@pytest.mark.freeze_time("2017-02-02")
+def test_worktime_balance_list_last_reported_date_many_users(
+    superadmin_client, django_assert_num_queries
+):
+    users = UserFactory.create_batch(3)
+    for index, user in enumerate(users):
+        EmploymentFactory.create(
+            user=user, start_date=date(2017, 1, 2), worktime_per_day=timedelta(hours=8)
+        )
+        ReportFactory.create(
+            user=user, date=date(2017, 2, 1), duration=timedelta(hours=index + 8)
+        )
+
+    url = reverse("worktime-balance-list")
+
+    # number of queries is independent of number of users, including
+    # calculation of january checkpoints
+    with django_assert_num_queries(13):
+        result = superadmin_client.get(url, data={"last_reported_date": 1})
+
+    assert result.status_code == status.HTTP_200_OK
+
+    json = result.json()
+    balances = {
+        int(entry["relationships"]["user"]["data"]["id"]): (
+            entry["attributes"]["date"],
+            entry["attributes"]["balance"],
+        )
+        for entry in json["data"]
+    }
+    assert balances == {
+        user.id: ("2017-02-01", duration_string(timedelta(hours=index - 8 * 22)))
+        for index, user in enumerate(users)
+    }
+
+
+@pytest.mark.parametrize("ledger_enabled", [True, False])
+@pytest.mark.parametrize(
+    "interval,dates",
+    [
+        ("day", ["2016-12-30", "2016-12-31", "2017-01-01", "2017-01-02"]),
+        ("week", ["2016-12-18", "2016-12-25", "2017-01-01", "2017-01-02"]),
+        ("month", ["2016-12-31", "2017-01-02"]),
+    ],
+)
+def test_worktime_balance_series(
+    auth_client,
+    django_assert_max_num_queries,
+    settings,
+    ledger_enabled,
+    interval,
+    dates,
+):
+    settings.WORKTIME_LEDGER_ENABLED = ledger_enabled
+    user = auth_client.user
+    EmploymentFactory.create(
+        user=user, start_date=date(2016, 12, 1), worktime_per_day=timedelta(hours=8)
+    )
+    task = TaskFactory.create()
+    for day in [date(2016, 12, 15), date(2016, 12, 30), date(2017, 1, 2)]:
+        ReportFactory.create(
+            user=user, date=day, duration=timedelta(hours=10), task=task
+        )
+    OvertimeCreditFactory.create(
+        user=user, date=date(2016, 12, 28), duration=timedelta(hours=2)
+    )
+
+    url = reverse("worktime-balance-series")
+    start = "2016-12-30" if interval == "day" else "2016-12-12"
+    with django_assert_max_num_queries(10):
+        result = auth_client.get(
+            url,
+            data={
+                "user": user.id,
+                "start": start,
+                "end": "2017-01-02",
+                "interval": interval,
+            },
+        )
+    assert result.status_code == status.HTTP_200_OK
+
+    json = result.json()
+    assert [entry["attributes"]["date"] for entry in json["data"]] == dates
+    for entry in json["data"]:
+        day = date(*map(int, entry["attributes"]["date"].split("-")))
+        _, _, balance = user.calculate_worktime(date(day.year, 1, 1), day)
+        assert entry["id"] == "{0}_{1}".format(user.id, day)
+        assert entry["attributes"]["balance"] == duration_string(balance)
+
+
+def test_worktime_balance_series_not_supervisee(auth_client):
+    user = UserFactory.create()
+
+    url = reverse("worktime-balance-series")
+    result = auth_client.get(
+        url, data={"user": user.id, "start": "2017-01-01", "end": "2017-01-31"}
+    )
+    assert result.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"start": "2017-01-01", "end": "2017-01-31"},
+        {"user": "invalid", "start": "2017-01-01", "end": "2017-01-31"},
+        {"user": 1, "start": "2017-01-01"},
+        {"user": 1, "start": "invalid", "end": "2017-01-31"},
+        {"user": 1, "start": "2017-01-31", "end": "2017-01-01"},
+        {"user": 1, "start": "2017-01-01", "end": "2017-01-31", "interval": "year"},
+    ],
+)
+def test_worktime_balance_series_invalid_params(auth_client, params):
+    url = reverse("worktime-balance-series")
+
+    result = auth_client.get(url, data=params)
+    assert result.status_code == status.HTTP_400_BAD_REQUEST
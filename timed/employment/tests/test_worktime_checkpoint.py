@@ -0,0 +1,120 @@
+from datetime import date, timedelta
+
+import pytest
+
+from timed.employment.factories import (
+    AbsenceTypeFactory,
+    EmploymentFactory,
+    PublicHolidayFactory,
+)
+from timed.employment.models import Employment, User, WorktimeCheckpoint
+from timed.tracking.factories import AbsenceFactory, ReportFactory
+
+
+@pytest.mark.freeze_time("2017-03-15")
+def test_worktime_checkpoint(db, django_assert_num_queries):
+    employment = EmploymentFactory.create(
+        start_date=date(2017, 1, 1), worktime_per_day=timedelta(hours=8)
+    )
+    user = employment.user
+    ReportFactory.create(user=user, date=date(2017, 1, 3), duration=timedelta(hours=9))
+    ReportFactory.create(user=user, date=date(2017, 3, 1), duration=timedelta(hours=9))
+    start = date(2017, 1, 1)
+    end = date(2017, 3, 15)
+
+    worktime = User.objects.calculate_worktime([user.id], start, end)[user.id]
+    assert worktime == employment.calculate_worktime(start, end)
+    assert set(WorktimeCheckpoint.objects.values_list("employment", "month")) == {
+        (employment.id, date(2017, 1, 1)),
+        (employment.id, date(2017, 2, 1)),
+    }
+
+    # january and february are read from checkpoints
+    with django_assert_num_queries(5):
+        assert User.objects.calculate_worktime([user.id], start, end)[user.id] == (
+            worktime
+        )
+
+    # backdated edit invalidates checkpoint of month
+    report = ReportFactory.create(
+        user=user, date=date(2017, 2, 6), duration=timedelta(hours=2)
+    )
+    assert not WorktimeCheckpoint.objects.filter(month=date(2017, 2, 1)).exists()
+    assert WorktimeCheckpoint.objects.filter(month=date(2017, 1, 1)).exists()
+
+    report.date = date(2017, 1, 9)
+    report.save()
+    assert not WorktimeCheckpoint.objects.exists()
+    assert User.objects.calculate_worktime([user.id], start, end)[user.id] == (
+        employment.calculate_worktime(start, end)
+    )
+
+
+@pytest.mark.freeze_time("2017-03-15")
+def test_worktime_checkpoint_invalidate(db):
+    employment = EmploymentFactory.create(
+        start_date=date(2017, 1, 1), worktime_per_day=timedelta(hours=8)
+    )
+    user = employment.user
+    absence_type = AbsenceTypeFactory.create(fill_worktime=False)
+    AbsenceFactory.create(user=user, date=date(2017, 1, 5), type=absence_type)
+    start = date(2017, 1, 1)
+    end = date(2017, 2, 28)
+
+    User.objects.calculate_worktime([user.id], start, end)
+    holiday = PublicHolidayFactory.create(
+        date=date(2017, 2, 7), location=employment.location
+    )
+    assert list(WorktimeCheckpoint.objects.values_list("month", flat=True)) == [
+        date(2017, 1, 1)
+    ]
+
+    User.objects.calculate_worktime([user.id], start, end)
+    absence_type.fill_worktime = True
+    absence_type.save()
+    assert not WorktimeCheckpoint.objects.exists()
+
+    User.objects.calculate_worktime([user.id], start, end)
+    employment.worktime_per_day = timedelta(hours=6)
+    employment.save()
+    assert not WorktimeCheckpoint.objects.exists()
+    holiday.delete()
+
+    # absences on holidays of other employment are hidden
+    other = EmploymentFactory.create(
+        user=user, start_date=date(2016, 1, 1), end_date=date(2016, 12, 31)
+    )
+    User.objects.calculate_worktime([user.id], start, end)
+    other.delete()
+    assert not WorktimeCheckpoint.objects.exists()
+
+    assert User.objects.calculate_worktime([user.id], start, end)[user.id] == (
+        employment.calculate_worktime(start, end)
+    )
+
+
+@pytest.mark.freeze_time("2017-03-15")
+def test_worktime_checkpoint_concurrent_invalidate(db, mocker):
+    employment = EmploymentFactory.create(
+        start_date=date(2017, 1, 1), worktime_per_day=timedelta(hours=8)
+    )
+    user = employment.user
+    start = date(2017, 1, 1)
+    end = date(2017, 3, 15)
+    calculate_worktime = Employment.objects.calculate_worktime
+
+    def invalidate(employments, start, end):
+        # report is committed while checkpoints are calculated
+        worktime = calculate_worktime(employments, start, end)
+        ReportFactory.create(user=user, date=start, duration=timedelta(hours=2))
+        return worktime
+
+    mocker.patch.object(
+        Employment.objects, "calculate_worktime", side_effect=invalidate
+    )
+    User.objects.calculate_worktime([user.id], start, end)
+    assert not WorktimeCheckpoint.objects.exists()
+
+    mocker.stopall()
+    User.objects.calculate_worktime([user.id], start, end)
+    assert WorktimeCheckpoint.objects.count() == 2
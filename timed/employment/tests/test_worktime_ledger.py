@@ -0,0 +1,123 @@
+from datetime import date, timedelta
+
+import pytest
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+
+from timed.employment.factories import (
+    AbsenceTypeFactory,
+    EmploymentFactory,
+    OvertimeCreditFactory,
+    PublicHolidayFactory,
+    UserFactory,
+)
+from timed.employment.models import User, WorktimeLedger
+from timed.tracking.factories import AbsenceFactory, ReportFactory
+
+
+@pytest.fixture
+def ledger(settings):
+    settings.WORKTIME_LEDGER_ENABLED = True
+    cache.clear()
+
+
+def calculate(user, start, end):
+    """Calculate worktime of user per employment without ledger."""
+    worktimes = [
+        employment.calculate_worktime(start, end)
+        for employment in user.employments.all()
+    ]
+    return tuple(
+        sum([worktime[index] for worktime in worktimes], timedelta())
+        for index in range(3)
+    )
+
+
+@pytest.mark.freeze_time("2017-03-31")
+def test_worktime_ledger_maintained(db, ledger):
+    start = date(2017, 3, 1)
+    end = date(2017, 3, 31)
+    user = UserFactory.create()
+    employment = EmploymentFactory.create(
+        user=user, start_date=start, worktime_per_day=timedelta(hours=8)
+    )
+    holiday = PublicHolidayFactory.create(
+        date=date(2017, 3, 6), location=employment.location
+    )
+    report = ReportFactory.create(
+        user=user, date=date(2017, 3, 7), duration=timedelta(hours=10)
+    )
+    ReportFactory.create(user=user, date=date(2017, 3, 8), duration=timedelta(hours=3))
+    AbsenceFactory.create(user=user, date=date(2017, 3, 9))
+    absence_type = AbsenceTypeFactory.create(fill_worktime=True)
+    AbsenceFactory.create(user=user, date=date(2017, 3, 8), type=absence_type)
+    OvertimeCreditFactory.create(
+        user=user, date=date(2017, 3, 10), duration=timedelta(hours=2)
+    )
+
+    assert User.objects.calculate_worktime([user.id], start, end)[user.id] == calculate(
+        user, start, end
+    )
+
+    # move report and holiday to another day
+    report.date = date(2017, 3, 14)
+    report.save()
+    holiday.date = date(2017, 3, 13)
+    holiday.save()
+    assert User.objects.calculate_worktime([user.id], start, end)[user.id] == calculate(
+        user, start, end
+    )
+
+    # shorten employment
+    employment.end_date = date(2017, 3, 20)
+    employment.save()
+    assert not WorktimeLedger.objects.filter(date__gt=date(2017, 3, 20)).exists()
+    assert User.objects.calculate_worktime([user.id], start, end)[user.id] == calculate(
+        user, start, end
+    )
+
+    # absences of type count differently
+    absence_type.fill_worktime = False
+    absence_type.save()
+    assert User.objects.calculate_worktime([user.id], start, end)[user.id] == calculate(
+        user, start, end
+    )
+
+    report.delete()
+    holiday.delete()
+    assert User.objects.calculate_worktime([user.id], start, end)[user.id] == calculate(
+        user, start, end
+    )
+
+
+def test_worktime_ledger_extend(db, ledger, freezer):
+    freezer.move_to("2017-03-15")
+    user = UserFactory.create()
+    EmploymentFactory.create(
+        user=user, start_date=date(2017, 3, 1), worktime_per_day=timedelta(hours=8)
+    )
+    assert WorktimeLedger.objects.filter(user=user).count() == 15
+
+    freezer.move_to("2017-03-20")
+    _, expected, _ = User.objects.calculate_worktime(
+        [user.id], date(2017, 3, 1), date(2017, 3, 20)
+    )[user.id]
+    assert WorktimeLedger.objects.filter(user=user).count() == 20
+    assert expected == timedelta(hours=8 * 14)
+
+
+@pytest.mark.freeze_time("2017-03-31")
+def test_rebuild_worktime_ledger(db, ledger):
+    user = UserFactory.create()
+    EmploymentFactory.create(
+        user=user, start_date=date(2017, 3, 1), worktime_per_day=timedelta(hours=8)
+    )
+    ReportFactory.create(user=user, date=date(2017, 3, 7))
+    WorktimeLedger.objects.filter(date=date(2017, 3, 7)).update(reported=timedelta())
+
+    with pytest.raises(CommandError):
+        call_command("rebuild_worktime_ledger", verify_only=True)
+
+    call_command("rebuild_worktime_ledger")
+    assert WorktimeLedger.objects.filter(user=user).count() == 31
+    call_command("rebuild_worktime_ledger", verify_only=True)
@@ -1,10 +1,24 @@
 """Viewsets for the employment app."""
 import datetime
 
+from dateutil.relativedelta import relativedelta
 from django.contrib.auth import get_user_model
-from django.db.models import CharField, DateField, IntegerField, Q, Value
-from django.db.models.functions import Concat
+from django.db.models import (
+    Case,
+    CharField,
+    DateField,
+    F,
+    Func,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Concat, Greatest
 from django.shortcuts import get_object_or_404
+from django.utils.duration import duration_string
 from django.utils.translation import ugettext_lazy as _
 from rest_framework import exceptions, status
 from rest_framework.decorators import action
@@ -24,6 +38,7 @@ from timed.permissions import (
     IsSupervisor,
     IsUpdateOnly,
 )
+from timed.serializers import AggregateObject
 from timed.tracking.models import Absence, Report
 
 
@@ -74,42 +89,7 @@ class UserViewSet(ModelViewSet):
         user = self.get_object()
 
         year = datetime.date.today().year
-        start_year = datetime.date(year, 1, 1)
-        start = datetime.date(year - 1, 1, 1)
-        end = datetime.date(year - 1, 12, 31)
-
-        # transfer absence types
-        transfered_absence_credits = user.absence_credits.filter(
-            date=start_year, transfer=True
-        )
-        types = models.AbsenceType.objects.filter(fill_worktime=False).exclude(
-            id__in=transfered_absence_credits.values("absence_type")
-        )
-        for absence_type in types:
-            credit = absence_type.calculate_credit(user, start, end)
-            used_days = absence_type.calculate_used_days(user, start, end)
-            balance = credit - used_days
-            if balance != 0:
-                models.AbsenceCredit.objects.create(
-                    absence_type=absence_type,
-                    user=user,
-                    comment=_("Transfer %(year)s") % {"year": year - 1},
-                    date=start_year,
-                    days=balance,
-                    transfer=True,
-                )
-
-        # transfer overtime
-        overtime_credit = user.overtime_credits.filter(date=start_year, transfer=True)
-        if not overtime_credit.exists():
-            reported, expected, delta = user.calculate_worktime(start, end)
-            models.OvertimeCredit.objects.create(
-                user=user,
-                comment=_("Transfer %(year)s") % {"year": year - 1},
-                date=start_year,
-                duration=delta,
-                transfer=True,
-            )
+        get_user_model().objects.transfer([user.id], year - 1)
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
@@ -151,18 +131,45 @@ class WorktimeBalanceViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
 
             return None
 
+    def _last_reported_date(self):
+        """
+        Get expression of last day before today a user reported on.
+
+        Latest activity of a user is maintained on the user, only when it
+        is today or in the future activities need to be looked up.
+        """
+        today = datetime.date.today()
+        return Case(
+            When(last_activity_date__lt=today, then=F("last_activity_date")),
+            default=Coalesce(
+                Greatest(
+                    Subquery(
+                        Report.objects.filter(user=OuterRef("pk"), date__lt=today)
+                        .order_by("-date")
+                        .values("date")[:1]
+                    ),
+                    Subquery(
+                        Absence.objects.filter(user=OuterRef("pk"), date__lt=today)
+                        .order_by("-date")
+                        .values("date")[:1]
+                    ),
+                ),
+                Value(datetime.date.min),
+            ),
+            output_field=DateField(),
+        )
+
     def get_queryset(self):
         date = self._extract_date()
         user = self.request.user
         queryset = get_user_model().objects.values("id")
-        queryset = queryset.annotate(date=Value(date, DateField()))
-        # last_reported_date filter is set, a date can only be calucated
-        # for users with either at least one absence or report
         if date is None:
-            users_with_reports = Report.objects.values("user").distinct()
-            users_with_absences = Absence.objects.values("user").distinct()
-            active_users = users_with_reports.union(users_with_absences)
-            queryset = queryset.filter(id__in=active_users)
+            # last_reported_date filter is set, a date can only be calucated
+            # for users with either at least one absence or report
+            queryset = queryset.filter(last_activity_date__isnull=False)
+            queryset = queryset.annotate(date=self._last_reported_date())
+        else:
+            queryset = queryset.annotate(date=Value(date, DateField()))
 
         queryset = queryset.annotate(
             pk=Concat("id", Value("_"), "date", output_field=CharField())
@@ -173,6 +180,83 @@ class WorktimeBalanceViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
 
         return queryset
 
+    def _extract_series_params(self):
+        """Extract user, time frame and interval of series from request."""
+        query_params = self.request.query_params
+        try:
+            user_id = int(query_params["user"])
+        except KeyError:
+            raise exceptions.ParseError(_("User filter needs to be set"))
+        except ValueError:
+            raise exceptions.ParseError(_("User is invalid"))
+
+        try:
+            start, end = [
+                datetime.datetime.strptime(query_params[param], "%Y-%m-%d").date()
+                for param in ("start", "end")
+            ]
+        except KeyError:
+            raise exceptions.ParseError(_("Start and end filter need to be set"))
+        except ValueError:
+            raise exceptions.ParseError(_("Date is invalid"))
+
+        if start > end:
+            raise exceptions.ParseError(_("Start may not be after end"))
+
+        interval = query_params.get("interval", "day")
+        if interval not in ("day", "week", "month"):
+            raise exceptions.ParseError(_("Interval is invalid"))
+
+        return user_id, start, end, interval
+
+    def _get_series_dates(self, start, end, interval):
+        """Get last day of each interval within time frame."""
+        dates = []
+        day = start
+        while day <= end:
+            if interval == "week":
+                day += datetime.timedelta(days=6 - day.weekday())
+            elif interval == "month":
+                day += relativedelta(day=31)
+            dates.append(min(day, end))
+            day += datetime.timedelta(days=1)
+
+        return dates
+
+    @action(methods=["get"], detail=False)
+    def series(self, request):
+        """
+        Get worktime balances of a user at end of each day, week or month.
+
+        Worktime of time frame is only loaded once instead of calculating
+        balance for each date separately.
+        """
+        user_id, start, end, interval = self._extract_series_params()
+
+        users = get_user_model().objects.all()
+        if not request.user.is_superuser:
+            users = users.filter(
+                Q(id=request.user.id) | Q(supervisors=request.user)
+            ).distinct()
+        user = get_object_or_404(users, pk=user_id)
+
+        dates = self._get_series_dates(start, end, interval)
+        balances = models.WorktimeLedger.objects.calculate_balances(user.id, dates)
+        data = [
+            AggregateObject(
+                id=user,
+                pk="{0}_{1}".format(user.id, day),
+                date=day,
+                balance=duration_string(balances[day]),
+            )
+            for day in dates
+        ]
+
+        serializer = self.serializer_class(
+            data, many=True, context=self.get_serializer_context()
+        )
+        return Response(serializer.data)
+
 
 class AbsenceBalanceViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
     """Calculate absence balance for different user on different dates."""
@@ -207,61 +291,74 @@ class AbsenceBalanceViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
         except TypeError:
             raise exceptions.ParseError(_("Date filter needs to be set"))
 
-    def _extract_user(self):
+    def _extract_users(self):
         """
-        Extract user from request.
+        Extract ids of users from request.
 
-        In detail route extract it from pk and it list
-        from query params.
+        In detail route extract it from pk and in list from query params.
+        List may be requested for a single `user`, for a comma separated
+        list of `users` or for all supervisees of a `supervisor`.
         """
         pk = self.request.parser_context["kwargs"].get("pk")
 
         # detail case
         if pk is not None:
             try:
-                user_id = int(pk.split("_")[0])
-                # avoid query if user is self
-                if self.request.user.id == user_id:
-                    return self.request.user
-                return get_user_model().objects.get(pk=pk.split("_")[0])
-            except (ValueError, get_user_model().DoesNotExist):
+                return [int(pk.split("_")[0])]
+            except ValueError:
                 raise exceptions.NotFound()
 
         # list case
+        query_params = self.request.query_params
         try:
-            user_id = self.request.query_params.get("user")
-            if user_id is None:
-                raise exceptions.ParseError(_("User filter needs to be set"))
-
-            # avoid query if user is self
-            if self.request.user.id == int(user_id):
-                return self.request.user
-
-            return get_user_model().objects.get(pk=user_id)
-        except (ValueError, get_user_model().DoesNotExist):
+            if "supervisor" in query_params:
+                return list(
+                    get_user_model()
+                    .objects.filter(supervisors=int(query_params["supervisor"]))
+                    .values_list("id", flat=True)
+                )
+            if "users" in query_params:
+                return [int(user) for user in query_params["users"].split(",")]
+            if "user" in query_params:
+                return [int(query_params["user"])]
+        except ValueError:
             raise exceptions.ParseError(_("User is invalid"))
 
+        raise exceptions.ParseError(_("User filter needs to be set"))
+
     def get_queryset(self):
         date = self._extract_date()
-        user = self._extract_user()
+        users = self._extract_users()
+
+        # avoid query if user is self
+        current_user = self.request.user
+        if users != [current_user.id]:
+            queryset = get_user_model().objects.filter(id__in=users)
+            # only myself, superuser and supervisors may see by absence balances
+            if not current_user.is_superuser:
+                queryset = queryset.filter(
+                    Q(id=current_user.id) | Q(supervisors=current_user)
+                )
+            users = sorted(set(queryset.values_list("id", flat=True)))
+
+        if not users:
+            return models.AbsenceType.objects.none()
 
         queryset = models.AbsenceType.objects.values("id")
         queryset = queryset.annotate(date=Value(date, DateField()))
-        queryset = queryset.annotate(user=Value(user.id, IntegerField()))
+        if len(users) == 1:
+            queryset = queryset.annotate(user=Value(users[0], IntegerField()))
+        else:
+            # one row per absence type and user
+            queryset = queryset.annotate(
+                user=Func(Value(users), function="unnest", output_field=IntegerField())
+            )
         queryset = queryset.annotate(
             pk=Concat(
                 "user", Value("_"), "id", Value("_"), "date", output_field=CharField()
             )
         )
 
-        # only myself, superuser and supervisors may see by absence balances
-        current_user = self.request.user
-
-        if not current_user.is_superuser:
-            if current_user.id != user.id:
-                if not current_user.supervisees.filter(id=user.id).exists():
-                    return models.AbsenceType.objects.none()
-
         return queryset
 
 
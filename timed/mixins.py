@@ -1,5 +1,7 @@
+from django.db.models import DurationField, F, Func, IntegerField, Window
 from rest_framework_json_api import relations
 
+from timed.pagination import PageNumberPagination
 from timed.serializers import AggregateObject
 
 
@@ -46,8 +48,8 @@ class AggregateQuerysetMixin(object):
             return super().get_serializer(data, *args, **kwargs)
 
         many = kwargs.get("many")
-        if not many:
-            data = [data]
+        # evaluate aggregate (or page of it) only once
+        data = list(data) if many else [data]
 
         # prefetch data for all related fields
         prefetch_per_field = {}
@@ -55,10 +57,11 @@ class AggregateQuerysetMixin(object):
         for key, value in serializer_class._declared_fields.items():
             if self._is_related_field(value):
                 source = value.source or key
-                if many:
-                    obj_ids = data.values_list(source, flat=True)
-                else:
-                    obj_ids = [data[0][source]]
+                # related field may be null e.g. in subtotals
+                obj_ids = {entry[source] for entry in data} - {None}
+                if not obj_ids:
+                    prefetch_per_field[source] = {}
+                    continue
 
                 qs = value.model.objects.filter(id__in=obj_ids)
                 qs = qs.select_related()
@@ -76,7 +79,7 @@ class AggregateQuerysetMixin(object):
                 **{
                     **entry,
                     **{
-                        field: objects[entry[field]]
+                        field: objects.get(entry[field])
                         for field, objects in prefetch_per_field.items()
                     },
                 }
@@ -88,3 +91,45 @@ class AggregateQuerysetMixin(object):
             data = data[0]
 
         return super().get_serializer(data, *args, **kwargs)
+
+
+class WindowSum(Func):
+    """Sum over window which may also sum up aggregates."""
+
+    function = "SUM"
+    window_compatible = True
+
+
+class WindowCount(Func):
+    """Count rows of window."""
+
+    template = "COUNT(*)"
+    window_compatible = True
+
+
+class TotalTimeMixin(object):
+    """
+    Calculate total time and count of list in same query as page.
+
+    Window functions annotate total time and number of rows of the whole
+    filtered result to every row, so neither `TotalTimeRootMetaMixin` nor
+    pagination need to run an additional aggregate.
+
+    Paginators which calculate totals themselves (`calculates_totals`)
+    get rows without annotation.
+    """
+
+    pagination_class = PageNumberPagination
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action != "list" or getattr(self.paginator, "calculates_totals", False):
+            return queryset
+
+        duration_field = self.get_serializer_class().duration_field
+        return queryset.annotate(
+            total_time=Window(
+                WindowSum(F(duration_field)), output_field=DurationField()
+            ),
+            total_count=Window(WindowCount(), output_field=IntegerField()),
+        )
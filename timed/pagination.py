@@ -0,0 +1,207 @@
+"""Pagination classes to be used in all apps."""
+
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+from datetime import date, timedelta
+
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import Count, Q, Sum
+from django.utils.duration import duration_string
+from django.utils.translation import ugettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from rest_framework_json_api.pagination import JsonApiPageNumberPagination
+
+
+class WindowCountPaginator(Paginator):
+    """
+    Paginator which takes count from rows of page.
+
+    Rows annotated with `total_count` by `timed.mixins.TotalTimeMixin`
+    already contain number of all rows, so no additional count query is
+    needed. Falls back to a count query otherwise.
+    """
+
+    def page(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            return super().page(number)
+
+        query = getattr(self.object_list, "query", None)
+        if (
+            number < 1
+            or "count" in self.__dict__
+            or "total_count" not in getattr(query, "annotations", {})
+        ):
+            return super().page(number)
+
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page])
+        if not rows:
+            return super().page(number)
+
+        if isinstance(rows[0], dict):
+            count = rows[0].get("total_count")
+        else:
+            count = getattr(rows[0], "total_count", None)
+        if count is None:
+            return super().page(number)
+
+        # count is a cached property of paginator
+        self.__dict__["count"] = count
+        return self._get_page(rows, number, self)
+
+
+class PageNumberPagination(JsonApiPageNumberPagination):
+    """Page number pagination of views using `timed.mixins.TotalTimeMixin`."""
+
+    django_paginator_class = WindowCountPaginator
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginate by cursor over ordering of `date` and `id`.
+
+    Instead of an offset, a cursor of last row of a page is passed on
+    and next page is filtered to rows after it, so deep pages are as fast
+    as first one. An empty cursor requests first page.
+
+    As counting all rows is expensive, number of rows and total time are
+    only calculated on request with `page[count]=exact`. An estimate
+    of number of rows taken from query planner may be requested with
+    `page[count]=estimate`.
+    """
+
+    cursor_query_param = "page[cursor]"
+    page_size_query_param = "page[size]"
+    count_query_param = "page[count]"
+    page_size = 100
+    max_page_size = 100
+    ordering = ("date", "id")
+
+    # totals are part of pagination meta, see `timed.mixins.TotalTimeMixin`
+    calculates_totals = True
+
+    def _encode_cursor(self, row, reverse):
+        position = "{0}_{1}_{2}".format(row.date.isoformat(), row.id, int(reverse))
+        return b64encode(position.encode()).decode()
+
+    def _decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            day, row_id, reverse = b64decode(encoded.encode()).decode().split("_")
+            year, month, day = map(int, day.split("-"))
+            return date(year, month, day), int(row_id), bool(int(reverse))
+        except (TypeError, ValueError):
+            raise exceptions.NotFound(_("Invalid cursor"))
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        return min(max(page_size, 1), self.max_page_size)
+
+    def _get_count(self, request, queryset):
+        count_type = request.query_params.get(self.count_query_param)
+        if count_type is None:
+            return {}
+
+        if count_type == "exact":
+            totals = queryset.order_by().aggregate(
+                count=Count("id"), total_time=Sum("duration")
+            )
+            return {
+                "count": totals["count"],
+                "estimated": False,
+                "total_time": duration_string(totals["total_time"] or timedelta(0)),
+            }
+
+        if count_type == "estimate":
+            sql, params = queryset.order_by().query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute("EXPLAIN (FORMAT JSON) {0}".format(sql), params)
+                plan = cursor.fetchone()[0]
+            return {"count": plan[0]["Plan"]["Plan Rows"], "estimated": True}
+
+        raise exceptions.ParseError(
+            _("Count needs to be either exact or estimate, not {0}").format(count_type)
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        ordering = request.query_params.get("ordering")
+        if ordering and tuple(ordering.split(",")) != self.ordering:
+            raise exceptions.ParseError(
+                _("Cursor pagination only supports ordering by date and id")
+            )
+
+        self.request = request
+        self.totals = self._get_count(request, queryset)
+
+        page_size = self.get_page_size(request)
+        cursor = self._decode_cursor(request)
+        reverse = cursor is not None and cursor[2]
+
+        queryset = queryset.order_by(*self.ordering)
+        if cursor is not None:
+            day, row_id, _reverse = cursor
+            if reverse:
+                queryset = queryset.filter(
+                    Q(date__lt=day) | Q(date=day, id__lt=row_id), date__lte=day
+                ).reverse()
+            else:
+                queryset = queryset.filter(
+                    Q(date__gt=day) | Q(date=day, id__gt=row_id), date__gte=day
+                )
+
+        rows = list(queryset[: page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.rows = rows
+        return rows
+
+    def _build_link(self, cursor):
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        next_link = None
+        prev_link = None
+        if self.rows and self.has_next:
+            next_link = self._build_link(self._encode_cursor(self.rows[-1], False))
+        if self.rows and self.has_previous:
+            prev_link = self._build_link(self._encode_cursor(self.rows[0], True))
+
+        totals = OrderedDict(self.totals)
+        total_time = totals.pop("total_time", None)
+        meta = {"pagination": totals}
+        if total_time is not None:
+            meta["total_time"] = total_time
+
+        return Response(
+            {
+                "results": data,
+                "meta": meta,
+                "links": OrderedDict(
+                    [
+                        ("first", self._build_link("")),
+                        ("next", next_link),
+                        ("prev", prev_link),
+                    ]
+                ),
+            }
+        )
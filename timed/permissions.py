@@ -1,8 +1,39 @@
+from django.utils.functional import cached_property
 from rest_framework.permissions import SAFE_METHODS, BasePermission, IsAuthenticated
 
 from timed.projects import models as projects_models
 
 
+class PermissionContext(object):
+    """
+    Supervisees and reviewed projects of requesting user.
+
+    Ids are loaded on first use only and then checked in memory by
+    all permissions of a request, no matter for how many objects.
+    """
+
+    def __init__(self, user):
+        self.user = user
+
+    @cached_property
+    def supervisee_ids(self):
+        return set(self.user.supervisees.values_list("id", flat=True))
+
+    @cached_property
+    def reviewed_project_ids(self):
+        return set(self.user.reviews.values_list("id", flat=True))
+
+
+def get_permission_context(request):
+    """Get permission context of request, created once per request."""
+    context = getattr(request, "permission_context", None)
+    if context is None or context.user != request.user:
+        context = PermissionContext(request.user)
+        request.permission_context = context
+
+    return context
+
+
 class IsUnverified(BasePermission):
     """Allows access only to verified objects."""
 
@@ -83,7 +114,7 @@ class IsSupervisor(IsAuthenticated):
     """Allows access to object only to supervisors."""
 
     def has_object_permission(self, request, view, obj):
-        return request.user.supervisees.filter(id=obj.user_id).exists()
+        return obj.user_id in get_permission_context(request).supervisee_ids
 
 
 class IsReviewer(IsAuthenticated):
@@ -91,16 +122,16 @@ class IsReviewer(IsAuthenticated):
 
     def has_permission(self, request, view):
         if request.method not in SAFE_METHODS:
-            return request.user.reviews.exists()
+            return bool(get_permission_context(request).reviewed_project_ids)
         return True
 
     def has_object_permission(self, request, view, obj):
-        user = request.user
+        reviewed_project_ids = get_permission_context(request).reviewed_project_ids
 
         if isinstance(obj, projects_models.Task):
-            return obj.project.reviewers.filter(id=user.id).exists()
+            return obj.project_id in reviewed_project_ids
 
-        return obj.task.project.reviewers.filter(id=user.id).exists()
+        return obj.task.project_id in reviewed_project_ids
 
 
 class IsSuperUser(BasePermission):
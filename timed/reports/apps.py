@@ -0,0 +1,13 @@
+"""Configuration for reports app."""
+
+from django.apps import AppConfig
+
+
+class ReportsConfig(AppConfig):
+    """App configuration for reports app."""
+
+    name = "timed.reports"
+    label = "reports"
+
+    def ready(self):
+        from timed.reports import signals  # noqa: F401
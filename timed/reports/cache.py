@@ -0,0 +1,107 @@
+"""Cache of statistics calculated on reports."""
+
+import hashlib
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+
+# generation of all reports, bumped on any change of reports
+REPORTS_GENERATION = "statistic-generation-reports"
+# generation of customers, projects, tasks and users shown in statistics
+MASTER_DATA_GENERATION = "statistic-generation-master-data"
+
+HITS = "statistic-cache-hits"
+MISSES = "statistic-cache-misses"
+
+
+def _get_project_generation_key(project_id):
+    return "statistic-generation-project-{0}".format(project_id)
+
+
+def get_generation(key):
+    """Get current generation of given key.
+
+    Generation is a random token instead of a counter, so a generation
+    evicted from the cache may not match a cached statistic again.
+    """
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, uuid4().hex, None)
+        generation = cache.get(key)
+
+    return generation
+
+
+def bump_reports(project_ids):
+    """Invalidate statistics of reports of given projects."""
+    cache.delete_many(
+        [REPORTS_GENERATION]
+        + [_get_project_generation_key(project_id) for project_id in project_ids]
+    )
+
+
+def bump_master_data():
+    """Invalidate all statistics."""
+    cache.delete(MASTER_DATA_GENERATION)
+
+
+def get_key(name, params, scope):
+    """
+    Get cache key of statistic.
+
+    :param name: name of statistic
+    :param params: query params statistic is calculated with
+    :param scope: scope of user the statistic is visible to
+    :returns: cache key including generations of statistic
+    """
+    normalized = sorted(
+        (param, sorted(values)) for param, values in params.lists() if values
+    )
+    project = params.get("project")
+    if project is not None and project.isdigit():
+        # statistic only changes with reports of filtered project
+        generation_key = _get_project_generation_key(project)
+    else:
+        generation_key = REPORTS_GENERATION
+
+    value = repr(
+        (
+            name,
+            normalized,
+            scope,
+            get_generation(MASTER_DATA_GENERATION),
+            get_generation(generation_key),
+        )
+    )
+    return "statistic-{0}".format(hashlib.sha1(value.encode()).hexdigest())
+
+
+def _count(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        # counter got evicted or was never set
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def load(key):
+    """Get cached statistic and count hit or miss."""
+    value = cache.get(key)
+    _count(MISSES if value is None else HITS)
+    return value
+
+
+def store(key, value):
+    """Cache statistic for configured timeout."""
+    cache.set(key, value, settings.STATISTIC_CACHE_TIMEOUT)
+
+
+def get_stats():
+    """Get number of hits and misses of statistic cache."""
+    return {"hits": cache.get(HITS, 0), "misses": cache.get(MISSES, 0)}
+
+
+def reset_stats():
+    cache.delete_many([HITS, MISSES])
@@ -80,25 +80,28 @@ class Command(BaseCommand):
         """
         supervisees_shorttime = {}
         supervisees = get_user_model().objects.all_supervisees()
+        supervisees = [supervisee.id for supervisee in supervisees]
 
         start_year = date(end.year, 1, 1)
 
+        worktimes = get_user_model().objects.calculate_worktime(supervisees, start, end)
+        balances = get_user_model().objects.calculate_worktime(
+            supervisees, start_year, end
+        )
+
         for supervisee in supervisees:
-            worktime = supervisee.calculate_worktime(start, end)
-            reported, expected, delta = worktime
+            reported, expected, delta = worktimes[supervisee]
             if expected == timedelta(0):
                 continue
 
             supervisee_ratio = reported / expected
             if supervisee_ratio < ratio:
-                supervisees_shorttime[supervisee.id] = {
+                supervisees_shorttime[supervisee] = {
                     "reported": self._decimal_hours(reported),
                     "expected": self._decimal_hours(expected),
                     "delta": self._decimal_hours(delta),
                     "ratio": supervisee_ratio,
-                    "balance": self._decimal_hours(
-                        supervisee.calculate_worktime(start_year, end)[2]
-                    ),
+                    "balance": self._decimal_hours(balances[supervisee][2]),
                 }
 
         return supervisees_shorttime
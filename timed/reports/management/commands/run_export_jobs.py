@@ -0,0 +1,64 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from timed.reports.models import ExportJob
+
+
+class Command(BaseCommand):
+    """
+    Run pending background export jobs.
+
+    Jobs are queued in the database, so no broker is needed. Several
+    workers may run concurrently as each job is claimed by one worker
+    only. Jobs exceeding retention are deleted along with their files and
+    running jobs exceeding timeout are failed.
+    """
+
+    help = "Run pending background export jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            dest="once",
+            help="Run pending jobs and exit instead of polling for new ones.",
+        )
+        parser.add_argument(
+            "--sleep",
+            default=5,
+            type=float,
+            dest="sleep",
+            help="Seconds to wait between polling for new jobs.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            ExportJob.objects.cleanup()
+            ExportJob.objects.fail_stale()
+
+            job = ExportJob.objects.claim()
+            while job is not None:
+                self._run(job)
+                job = ExportJob.objects.claim()
+
+            if options["once"]:
+                break
+            time.sleep(options["sleep"])
+
+    def _run(self, job):
+        try:
+            job.run()
+        except Exception as exc:
+            # failing job may not stop worker from running other jobs
+            job.status = ExportJob.FAILED
+            job.error = str(exc)
+            job.finished = timezone.now()
+            job.save(update_fields=["status", "error", "finished"])
+            self.stderr.write("Export job {0} failed: {1}".format(job.pk, exc))
+            return
+
+        self.stdout.write(
+            "Export job {0} of {1} {2}".format(job.pk, job.user.username, job.status)
+        )
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from timed.reports import cache as statistic_cache
+
+
+class Command(BaseCommand):
+    """
+    Show hits and misses of statistic cache.
+
+    Helps to tune `DJANGO_STATISTIC_CACHE_TIMEOUT`. Counters are stored
+    in the cache and therefore shared between all processes.
+    """
+
+    help = "Show hits and misses of statistic cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            dest="reset",
+            help="Reset counters after showing them.",
+        )
+
+    def handle(self, *args, **options):
+        stats = statistic_cache.get_stats()
+        total = stats["hits"] + stats["misses"]
+        ratio = total and stats["hits"] / total
+        self.stdout.write(
+            "{0} hits, {1} misses, hit ratio {2:.1%}".format(
+                stats["hits"], stats["misses"], ratio
+            )
+        )
+
+        if options["reset"]:
+            statistic_cache.reset_stats()
@@ -0,0 +1,203 @@
+"""Models for the reports app."""
+
+import hashlib
+import re
+from datetime import timedelta
+from tempfile import TemporaryFile
+
+from django.conf import settings
+from django.core.files import File
+from django.db import IntegrityError, models, transaction
+from django.http import HttpRequest, QueryDict
+from django.utils import timezone
+from rest_framework.authentication import BaseAuthentication
+
+
+class ExportJobAuthentication(BaseAuthentication):
+    """Authenticate request of export job as user who submitted job."""
+
+    def authenticate(self, request):
+        return (request._request.export_job.user, None)
+
+
+class ExportJobManager(models.Manager):
+    def submit(self, user, kind, query):
+        """
+        Submit export job unless an identical one is still pending or running.
+
+        :param user: user submitting job
+        :param kind: kind of export, see `ExportJob.KINDS`
+        :param QueryDict query: filter params of export
+        :returns: tuple of job and whether it has been created
+        """
+        normalized = sorted((key, sorted(values)) for key, values in query.lists())
+        digest = hashlib.sha1(repr((kind, normalized)).encode()).hexdigest()
+
+        existing = self.filter(
+            user=user, digest=digest, status__in=ExportJob.ACTIVE_STATUSES
+        ).first()
+        if existing is not None:
+            return existing, False
+
+        try:
+            with transaction.atomic():
+                job = self.create(
+                    user=user, kind=kind, query=query.urlencode(), digest=digest
+                )
+                return job, True
+        except IntegrityError:
+            # identical job submitted concurrently
+            return (
+                self.get(
+                    user=user, digest=digest, status__in=ExportJob.ACTIVE_STATUSES
+                ),
+                False,
+            )
+
+    def claim(self):
+        """
+        Claim oldest pending job to be run by current worker.
+
+        Pending jobs locked by other workers are skipped, so several
+        workers may run concurrently.
+
+        :returns: claimed job or None when there is no pending job
+        """
+        with transaction.atomic():
+            job = (
+                self.select_for_update(skip_locked=True)
+                .filter(status=ExportJob.PENDING)
+                .order_by("created")
+                .first()
+            )
+            if job is not None:
+                job.status = ExportJob.RUNNING
+                job.started = timezone.now()
+                job.save(update_fields=["status", "started"])
+
+        return job
+
+    def fail_stale(self):
+        """
+        Fail running jobs which exceeded timeout.
+
+        Worker running such job most likely died, so the job would never
+        finish and block identical jobs from being submitted. Jobs are not
+        run again as the job itself might have killed the worker.
+        """
+        now = timezone.now()
+        timeout = timedelta(minutes=settings.EXPORT_JOB_TIMEOUT_MINUTES)
+        self.filter(status=ExportJob.RUNNING, started__lt=now - timeout).update(
+            status=ExportJob.FAILED, error="Export job timed out", finished=now
+        )
+
+    def cleanup(self):
+        """Delete jobs and their files which exceeded retention."""
+        retention = timedelta(hours=settings.EXPORT_JOB_RETENTION_HOURS)
+        expired = self.filter(created__lt=timezone.now() - retention)
+        for job in expired:
+            job.file.delete(save=False)
+        expired.delete()
+
+
+class ExportJob(models.Model):
+    """
+    Export of reports generated in background.
+
+    Jobs are queued in the database and run by `run_export_jobs` command
+    which calls the same view a synchronous export would, authenticated
+    as user who submitted the job.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    STATUSES = ((PENDING, PENDING), (RUNNING, RUNNING), (DONE, DONE), (FAILED, FAILED))
+    ACTIVE_STATUSES = (PENDING, RUNNING)
+
+    REPORTS = "reports"
+    WORK_REPORTS = "work-reports"
+
+    KINDS = ((REPORTS, REPORTS), (WORK_REPORTS, WORK_REPORTS))
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="export_jobs"
+    )
+    kind = models.CharField(max_length=20, choices=KINDS)
+    query = models.TextField(blank=True)
+    """Url encoded filter params of export."""
+    digest = models.CharField(max_length=40)
+    status = models.CharField(max_length=10, choices=STATUSES, default=PENDING)
+    error = models.TextField(blank=True)
+    file = models.FileField(upload_to="exports", blank=True)
+    filename = models.CharField(max_length=255, blank=True)
+    content_type = models.CharField(max_length=255, blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+    started = models.DateTimeField(null=True, blank=True)
+    finished = models.DateTimeField(null=True, blank=True)
+
+    objects = ExportJobManager()
+
+    def _get_view(self):
+        from timed.reports.views import WorkReportViewSet
+        from timed.tracking.views import ReportViewSet
+
+        viewset, action = {
+            self.REPORTS: (ReportViewSet, "export"),
+            self.WORK_REPORTS: (WorkReportViewSet, "list"),
+        }[self.kind]
+
+        return viewset.as_view(
+            {"get": action}, authentication_classes=[ExportJobAuthentication]
+        )
+
+    def run(self):
+        """Generate export by calling view and store its response."""
+        request = HttpRequest()
+        request.method = "GET"
+        request.GET = QueryDict(self.query)
+        request.export_job = self
+
+        response = self._get_view()(request)
+        if hasattr(response, "render"):
+            response.render()
+
+        if response.status_code != 200:
+            self.status = self.FAILED
+            self.error = response.content.decode()
+        else:
+            with TemporaryFile() as output:
+                chunks = (
+                    response.streaming_content
+                    if response.streaming
+                    else [response.content]
+                )
+                for chunk in chunks:
+                    output.write(chunk)
+
+                match = re.search(
+                    r'filename="?([^";]+)', response.get("Content-Disposition", "")
+                )
+                self.filename = match.group(1) if match else "export"
+                self.content_type = response["Content-Type"]
+                self.file.save(
+                    "{0}/{1}".format(self.pk, self.filename), File(output), save=False
+                )
+            self.status = self.DONE
+
+        # response is not closed as that would close database connection
+        # of worker by sending `request_finished` signal
+        self.finished = timezone.now()
+        self.save()
+
+    class Meta:
+        constraints = [
+            # identical jobs are only run once at a time
+            models.UniqueConstraint(
+                fields=["user", "digest"],
+                condition=models.Q(status__in=["pending", "running"]),
+                name="unique_active_export_job",
+            )
+        ]
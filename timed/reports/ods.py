@@ -0,0 +1,87 @@
+"""
+Build rows of ods tables in a single pass.
+
+Inserting rows with ezodf shifts all following rows on every insert and
+wraps each cell in python objects. Rows built with these helpers are
+plain xml elements which are inserted into the table at once, rendered
+the same way ezodf renders them.
+"""
+
+from ezodf import Paragraph
+from ezodf.xmlns import CN, etree
+
+TABLE_ROW = CN("table:table-row")
+TABLE_CELL = CN("table:table-cell")
+STYLE_NAME = CN("table:style-name")
+VALUE_TYPE = CN("office:value-type")
+TEXT_P = CN("text:p")
+
+
+def _cell(style_name):
+    cell = etree.Element(TABLE_CELL)
+    if style_name is not None:
+        cell.set(STYLE_NAME, style_name)
+    return cell
+
+
+def empty_cell():
+    return etree.Element(TABLE_CELL)
+
+
+def date_cell(value, style_name=None):
+    cell = _cell(style_name)
+    cell.set(CN("office:date-value"), str(value))
+    cell.set(VALUE_TYPE, "date")
+    return cell
+
+
+def float_cell(value, style_name=None):
+    cell = _cell(style_name)
+    cell.set(CN("office:value"), str(value))
+    cell.set(VALUE_TYPE, "float")
+    return cell
+
+
+def string_cell(value, style_name=None):
+    cell = _cell(style_name)
+    cell.set(VALUE_TYPE, "string")
+    if "\n" in value or "\t" in value or "  " in value:
+        # whitespace needs to be encoded into elements
+        cell.append(Paragraph(value).xmlnode)
+    else:
+        etree.SubElement(cell, TEXT_P).text = value or None
+    return cell
+
+
+def row(cells, ncols, style_name=None):
+    """
+    Build table row of given cells.
+
+    :param cells: cells of row, following cells up to `ncols` stay empty
+    :param ncols: number of columns of table
+    :param style_name: style name of row
+    """
+    element = etree.Element(TABLE_ROW)
+    if style_name is not None:
+        element.set(STYLE_NAME, style_name)
+    element.extend(cells)
+    element.extend(empty_cell() for _ in range(ncols - len(cells)))
+    return element
+
+
+def insert_rows(table, rows_by_index):
+    """
+    Insert rows into table.
+
+    Table wrapper is outdated afterwards, so rows should be inserted
+    once all cells have been set through ezodf.
+
+    :param rows_by_index: rows to insert before row of given index
+                          (index of row before any insertion)
+    """
+    anchors = [
+        (table.row_info(index).xmlnode, rows) for index, rows in rows_by_index.items()
+    ]
+    for anchor, rows in anchors:
+        for element in rows:
+            anchor.addprevious(element)
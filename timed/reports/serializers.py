@@ -1,9 +1,24 @@
 from django.contrib.auth import get_user_model
+from django.http import QueryDict
+from django.utils.translation import ugettext_lazy as _
 from rest_framework_json_api import relations
-from rest_framework_json_api.serializers import DurationField, IntegerField, Serializer
-
-from timed.projects.models import Customer, Project, Task
+from rest_framework_json_api.serializers import (
+    BooleanField,
+    CharField,
+    DateField,
+    DurationField,
+    IntegerField,
+    ModelSerializer,
+    Serializer,
+    ValidationError,
+)
+
+from timed.employment.relations import CurrentUserResourceRelatedField
+from timed.projects.models import BillingType, CostCenter, Customer, Project, Task
+from timed.reports import models
 from timed.serializers import TotalTimeRootMetaMixin
+from timed.tracking.filters import ReportFilterSet
+from timed.tracking.models import Report
 
 
 class YearStatisticSerializer(TotalTimeRootMetaMixin, Serializer):
@@ -23,6 +38,34 @@ class MonthStatisticSerializer(TotalTimeRootMetaMixin, Serializer):
         resource_name = "month-statistics"
 
 
+class DayStatisticSerializer(TotalTimeRootMetaMixin, Serializer):
+    duration = DurationField()
+    date = DateField()
+
+    class Meta:
+        resource_name = "day-statistics"
+
+
+class WeekStatisticSerializer(TotalTimeRootMetaMixin, Serializer):
+    duration = DurationField()
+    year = IntegerField()
+    week = IntegerField()
+    date = DateField()
+
+    class Meta:
+        resource_name = "week-statistics"
+
+
+class QuarterStatisticSerializer(TotalTimeRootMetaMixin, Serializer):
+    duration = DurationField()
+    year = IntegerField()
+    quarter = IntegerField()
+    date = DateField()
+
+    class Meta:
+        resource_name = "quarter-statistics"
+
+
 class CustomerStatisticSerializer(TotalTimeRootMetaMixin, Serializer):
     duration = DurationField()
     customer = relations.ResourceRelatedField(
@@ -65,3 +108,78 @@ class UserStatisticSerializer(TotalTimeRootMetaMixin, Serializer):
 
     class Meta:
         resource_name = "user-statistics"
+
+
+class PivotStatisticSerializer(TotalTimeRootMetaMixin, Serializer):
+    duration = DurationField(read_only=True)
+    grouping = IntegerField(read_only=True)
+    year = IntegerField(read_only=True)
+    month = IntegerField(read_only=True)
+    week = IntegerField(read_only=True)
+    not_billable = BooleanField(read_only=True)
+    customer = relations.ResourceRelatedField(model=Customer, read_only=True)
+    project = relations.ResourceRelatedField(model=Project, read_only=True)
+    task = relations.ResourceRelatedField(model=Task, read_only=True)
+    user = relations.ResourceRelatedField(model=get_user_model(), read_only=True)
+    billing_type = relations.ResourceRelatedField(model=BillingType, read_only=True)
+    cost_center = relations.ResourceRelatedField(model=CostCenter, read_only=True)
+
+    included_serializers = {
+        "customer": "timed.projects.serializers.CustomerSerializer",
+        "project": "timed.projects.serializers.ProjectSerializer",
+        "task": "timed.projects.serializers.TaskSerializer",
+        "user": "timed.employment.serializers.UserSerializer",
+        "billing_type": "timed.projects.serializers.BillingTypeSerializer",
+        "cost_center": "timed.projects.serializers.CostCenterSerializer",
+    }
+
+    class Meta:
+        resource_name = "pivot-statistics"
+
+
+class ExportJobSerializer(ModelSerializer):
+    user = CurrentUserResourceRelatedField()
+    query = CharField(allow_blank=True, default="")
+
+    def validate(self, data):
+        """Validate query is a valid filter of reports to be exported."""
+        query = QueryDict(data["query"])
+        if data["kind"] == models.ExportJob.REPORTS and query.get("file_type") not in [
+            "csv",
+            "xlsx",
+            "ods",
+        ]:
+            raise ValidationError({"query": _("Incorrect file type")})
+
+        form = ReportFilterSet(query, queryset=Report.objects.none()).form
+        if not form.is_valid():
+            raise ValidationError({"query": form.errors})
+
+        data["query"] = query
+        return data
+
+    def create(self, validated_data):
+        job, _created = models.ExportJob.objects.submit(**validated_data)
+        return job
+
+    class Meta:
+        model = models.ExportJob
+        fields = [
+            "user",
+            "kind",
+            "query",
+            "status",
+            "error",
+            "filename",
+            "created",
+            "started",
+            "finished",
+        ]
+        read_only_fields = [
+            "status",
+            "error",
+            "filename",
+            "created",
+            "started",
+            "finished",
+        ]
@@ -0,0 +1,29 @@
+"""Signal handlers for the reports app."""
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from timed.projects.models import Customer, Project, Task
+from timed.reports import cache as statistic_cache
+
+
+@receiver(post_save, sender=Customer)
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=Customer)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=get_user_model())
+@receiver(m2m_changed, sender=Project.reviewers.through)
+@receiver(m2m_changed, sender=get_user_model().supervisors.through)
+def invalidate_statistics(sender, instance, update_fields=None, **kwargs):
+    """Invalidate statistics as shown or filtered master data changed."""
+    # last login is updated on every login but not shown in statistics
+    if update_fields is not None and set(update_fields) == {"last_login"}:
+        return
+
+    # statistics calculated before commit would still see old data
+    transaction.on_commit(statistic_cache.bump_master_data)
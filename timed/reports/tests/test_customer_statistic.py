@@ -11,7 +11,7 @@ def test_customer_statistic_list(auth_client, django_assert_num_queries):
     report2 = ReportFactory.create(duration=timedelta(hours=4))
 
     url = reverse("customer-statistic-list")
-    with django_assert_num_queries(3):
+    with django_assert_num_queries(2):
         result = auth_client.get(
             url, data={"ordering": "duration", "include": "customer"}
         )
@@ -0,0 +1,201 @@
+import io
+from datetime import date, timedelta
+from unittest import mock
+from zipfile import ZipFile
+
+import pytest
+from django.core.management import call_command
+from django.http import QueryDict
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from timed.employment.factories import UserFactory
+from timed.projects.factories import TaskFactory
+from timed.reports.models import ExportJob
+from timed.tracking.factories import ReportFactory
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+
+
+def _submit(auth_client, kind, query):
+    url = reverse("export-job-list")
+    data = {
+        "data": {
+            "type": "export-jobs",
+            "id": None,
+            "attributes": {"kind": kind, "query": query},
+        }
+    }
+    return auth_client.post(url, data)
+
+
+@pytest.mark.parametrize(
+    "file_type,content_type",
+    [
+        ("csv", "text/csv"),
+        ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",),
+        ("ods", "application/vnd.oasis.opendocument.spreadsheet"),
+    ],
+)
+def test_export_job_reports(auth_client, file_type, content_type):
+    ReportFactory.create_batch(2, user=auth_client.user)
+
+    result = _submit(
+        auth_client,
+        "reports",
+        "user={0}&file_type={1}".format(auth_client.user.id, file_type),
+    )
+    assert result.status_code == status.HTTP_201_CREATED
+    job_id = result.json()["data"]["id"]
+    assert result.json()["data"]["attributes"]["status"] == "pending"
+
+    url = reverse("export-job-download", args=[job_id])
+    assert auth_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+    call_command("run_export_jobs", once=True)
+
+    result = auth_client.get(reverse("export-job-detail", args=[job_id]))
+    assert result.status_code == status.HTTP_200_OK
+    attributes = result.json()["data"]["attributes"]
+    assert attributes["status"] == "done"
+    assert attributes["filename"] == "report.{0}".format(file_type)
+
+    result = auth_client.get(url)
+    assert result.status_code == status.HTTP_200_OK
+    assert result["Content-Type"].startswith(content_type)
+    assert "report.{0}".format(file_type) in result["Content-Disposition"]
+    assert b"".join(result.streaming_content)
+
+
+@pytest.mark.freeze_time("2017-09-01")
+def test_export_job_work_reports(auth_client):
+    for task in TaskFactory.create_batch(2):
+        ReportFactory.create(user=auth_client.user, task=task, date=date(2017, 8, 17))
+
+    result = _submit(
+        auth_client, "work-reports", "user={0}".format(auth_client.user.id)
+    )
+    assert result.status_code == status.HTTP_201_CREATED
+    job_id = result.json()["data"]["id"]
+
+    call_command("run_export_jobs", once=True)
+
+    job = ExportJob.objects.get(pk=job_id)
+    assert job.status == ExportJob.DONE
+    assert job.filename == "20170901-WorkReports.zip"
+
+    result = auth_client.get(reverse("export-job-download", args=[job_id]))
+    assert result.status_code == status.HTTP_200_OK
+    with ZipFile(io.BytesIO(b"".join(result.streaming_content))) as zf:
+        assert len(zf.namelist()) == 2
+
+
+def test_export_job_failed(auth_client):
+    result = _submit(
+        auth_client, "work-reports", "user={0}".format(auth_client.user.id)
+    )
+    assert result.status_code == status.HTTP_201_CREATED
+
+    call_command("run_export_jobs", once=True)
+
+    job = ExportJob.objects.get(pk=result.json()["data"]["id"])
+    assert job.status == ExportJob.FAILED
+    assert "No entries were selected" in job.error
+    assert job.finished is not None
+
+
+def test_export_job_error(db):
+    user = UserFactory.create()
+    job, _ = ExportJob.objects.submit(user, "reports", QueryDict("file_type=csv"))
+
+    with mock.patch.object(ExportJob, "run", side_effect=ValueError("broken")):
+        call_command("run_export_jobs", once=True)
+
+    job.refresh_from_db()
+    assert job.status == ExportJob.FAILED
+    assert job.error == "broken"
+    assert job.finished is not None
+
+
+def test_export_job_stale(db, settings):
+    user = UserFactory.create()
+    job, _ = ExportJob.objects.submit(user, "reports", QueryDict("file_type=csv"))
+    # worker claiming job died
+    job = ExportJob.objects.claim()
+
+    ExportJob.objects.filter(pk=job.pk).update(
+        started=timezone.now() - timedelta(minutes=settings.EXPORT_JOB_TIMEOUT_MINUTES)
+    )
+    call_command("run_export_jobs", once=True)
+
+    job.refresh_from_db()
+    assert job.status == ExportJob.FAILED
+    assert job.finished is not None
+    # identical job may be submitted again
+    assert ExportJob.objects.submit(user, "reports", QueryDict("file_type=csv"))[1]
+
+
+def test_export_job_deduplicate(auth_client):
+    query = "file_type=csv&user={0}&from_date=2017-01-01".format(auth_client.user.id)
+    first = _submit(auth_client, "reports", query)
+    # same params in different order are an identical job
+    second = _submit(
+        auth_client,
+        "reports",
+        "from_date=2017-01-01&user={0}&file_type=csv".format(auth_client.user.id),
+    )
+    assert first.json()["data"]["id"] == second.json()["data"]["id"]
+
+    # once done, same export may be submitted again
+    call_command("run_export_jobs", once=True)
+    third = _submit(auth_client, "reports", query)
+    assert third.json()["data"]["id"] != first.json()["data"]["id"]
+    assert ExportJob.objects.count() == 2
+
+
+@pytest.mark.parametrize(
+    "kind,query",
+    [
+        ("reports", "file_type=pdf"),
+        ("reports", "file_type=csv&from_date=invalid"),
+        ("invalid", "file_type=csv"),
+    ],
+)
+def test_export_job_invalid(auth_client, kind, query):
+    result = _submit(auth_client, kind, query)
+    assert result.status_code == status.HTTP_400_BAD_REQUEST
+    assert not ExportJob.objects.exists()
+
+
+def test_export_job_other_user(auth_client):
+    job, _ = ExportJob.objects.submit(
+        UserFactory.create(), "reports", QueryDict("file_type=csv")
+    )
+
+    result = auth_client.get(reverse("export-job-list"))
+    assert result.status_code == status.HTTP_200_OK
+    assert result.json()["data"] == []
+
+    result = auth_client.get(reverse("export-job-download", args=[job.id]))
+    assert result.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_export_job_cleanup(db, settings):
+    user = UserFactory.create()
+    ReportFactory.create(user=user)
+    job, _ = ExportJob.objects.submit(user, "reports", QueryDict("file_type=csv"))
+    call_command("run_export_jobs", once=True)
+    job.refresh_from_db()
+    path = job.file.path
+
+    ExportJob.objects.filter(pk=job.pk).update(
+        created=timezone.now() - timedelta(hours=settings.EXPORT_JOB_RETENTION_HOURS)
+    )
+    call_command("run_export_jobs", once=True)
+
+    assert not ExportJob.objects.exists()
+    assert not job.file.storage.exists(path)
@@ -0,0 +1,111 @@
+from datetime import date, timedelta
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from timed.projects.factories import TaskFactory
+from timed.reports.views import DayStatisticViewSet
+from timed.tracking.factories import ReportFactory
+
+
+@pytest.fixture
+def reports(auth_client):
+    task = TaskFactory.create()
+    for day, hours in [
+        (date(2017, 1, 2), 1),
+        (date(2017, 1, 4), 2),
+        (date(2017, 1, 30), 4),
+        (date(2017, 7, 1), 8),
+    ]:
+        ReportFactory.create(
+            task=task, user=auth_client.user, date=day, duration=timedelta(hours=hours)
+        )
+
+
+def test_day_statistic_list(auth_client, reports, django_assert_num_queries):
+    url = reverse("day-statistic-list")
+    with django_assert_num_queries(1):
+        result = auth_client.get(
+            url, data={"from_date": "2017-01-01", "to_date": "2017-01-05"}
+        )
+    assert result.status_code == status.HTTP_200_OK
+
+    json = result.json()
+    assert [
+        (entry["id"], entry["attributes"]["duration"]) for entry in json["data"]
+    ] == [
+        ("2017-01-01", "00:00:00"),
+        ("2017-01-02", "01:00:00"),
+        ("2017-01-03", "00:00:00"),
+        ("2017-01-04", "02:00:00"),
+        ("2017-01-05", "00:00:00"),
+    ]
+    assert json["meta"]["total-time"] == "03:00:00"
+
+
+def test_week_statistic_list(auth_client, reports):
+    url = reverse("week-statistic-list")
+    # without date filter periods of first till last report are returned
+    result = auth_client.get(url, data={"to_date": "2017-02-10"})
+    assert result.status_code == status.HTTP_200_OK
+
+    json = result.json()
+    assert [
+        (
+            entry["attributes"]["year"],
+            entry["attributes"]["week"],
+            entry["attributes"]["date"],
+            entry["attributes"]["duration"],
+        )
+        for entry in json["data"]
+    ] == [
+        (2017, 1, "2017-01-02", "03:00:00"),
+        (2017, 2, "2017-01-09", "00:00:00"),
+        (2017, 3, "2017-01-16", "00:00:00"),
+        (2017, 4, "2017-01-23", "00:00:00"),
+        (2017, 5, "2017-01-30", "04:00:00"),
+        (2017, 6, "2017-02-06", "00:00:00"),
+    ]
+    assert json["meta"]["total-time"] == "07:00:00"
+
+
+def test_quarter_statistic_list(auth_client, reports):
+    url = reverse("quarter-statistic-list")
+    result = auth_client.get(url)
+    assert result.status_code == status.HTTP_200_OK
+
+    json = result.json()
+    assert [
+        (entry["id"], entry["attributes"]["quarter"], entry["attributes"]["duration"])
+        for entry in json["data"]
+    ] == [("20171", 1, "07:00:00"), ("20172", 2, "00:00:00"), ("20173", 3, "08:00:00")]
+
+
+def test_day_statistic_list_empty(auth_client):
+    url = reverse("day-statistic-list")
+    result = auth_client.get(url)
+    assert result.status_code == status.HTTP_200_OK
+
+    json = result.json()
+    assert json["data"] == []
+    assert json["meta"]["total-time"] == "00:00:00"
+
+
+def test_day_statistic_list_too_many_periods(auth_client, reports, mocker):
+    mocker.patch.object(DayStatisticViewSet, "max_periods", 5)
+    url = reverse("day-statistic-list")
+    result = auth_client.get(
+        url, data={"from_date": "2017-01-01", "to_date": "2017-01-06"}
+    )
+    assert result.status_code == status.HTTP_400_BAD_REQUEST
+
+    # without date filter time frame of reports is too wide
+    result = auth_client.get(url)
+    assert result.status_code == status.HTTP_400_BAD_REQUEST
+
+    result = auth_client.get(
+        url, data={"from_date": "2017-01-01", "to_date": "2017-01-05"}
+    )
+    assert result.status_code == status.HTTP_200_OK
+    assert len(result.json()["data"]) == 5
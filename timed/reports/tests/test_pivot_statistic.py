@@ -0,0 +1,130 @@
+from datetime import date, timedelta
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from timed.projects.factories import ProjectFactory, TaskFactory
+from timed.tracking.factories import ReportFactory
+
+
+def test_pivot_statistic_list(auth_client, django_assert_num_queries):
+    project = ProjectFactory.create(cost_center=None)
+    task, other_task = TaskFactory.create_batch(2, project=project, cost_center=None)
+    other_project_task = TaskFactory.create(cost_center=None, project__cost_center=None)
+    user = auth_client.user
+    ReportFactory.create(
+        user=user, task=task, date=date(2017, 1, 3), duration=timedelta(hours=1)
+    )
+    ReportFactory.create(
+        user=user, task=other_task, date=date(2017, 2, 3), duration=timedelta(hours=2)
+    )
+    ReportFactory.create(
+        user=user,
+        task=other_project_task,
+        date=date(2017, 2, 4),
+        duration=timedelta(hours=4),
+    )
+
+    url = reverse("pivot-statistic-list")
+    with django_assert_num_queries(3):
+        result = auth_client.get(
+            url, data={"group_by": "project,month", "include": "project"}
+        )
+    assert result.status_code == status.HTTP_200_OK
+
+    json = result.json()
+    rows = [
+        (
+            entry["attributes"]["grouping"],
+            entry["relationships"]["project"]["data"]
+            and int(entry["relationships"]["project"]["data"]["id"]),
+            entry["attributes"]["month"],
+            entry["attributes"]["duration"],
+        )
+        for entry in json["data"]
+    ]
+    assert sorted(rows, key=str) == sorted(
+        [
+            (0, project.id, 1, "01:00:00"),
+            (0, project.id, 2, "02:00:00"),
+            (1, project.id, None, "03:00:00"),
+            (0, other_project_task.project.id, 2, "04:00:00"),
+            (1, other_project_task.project.id, None, "04:00:00"),
+            (3, None, None, "07:00:00"),
+        ],
+        key=str,
+    )
+    # grand total is last
+    assert rows[-1] == (3, None, None, "07:00:00")
+    assert json["meta"]["total-time"] == "07:00:00"
+    assert len(json["included"]) == 2
+
+
+def test_pivot_statistic_filter(auth_client):
+    task = TaskFactory.create()
+    ReportFactory.create(task=task, not_billable=True, duration=timedelta(hours=1))
+    ReportFactory.create(task=task, review=True, duration=timedelta(hours=2))
+
+    url = reverse("pivot-statistic-list")
+    # review is not part of rollup so reports are used
+    result = auth_client.get(url, data={"group_by": "not_billable", "review": 1})
+    assert result.status_code == status.HTTP_200_OK
+    json = result.json()
+    assert [entry["attributes"]["duration"] for entry in json["data"]] == [
+        "02:00:00",
+        "02:00:00",
+    ]
+
+    result = auth_client.get(url, data={"group_by": "not_billable,year"})
+    json = result.json()
+    assert json["meta"]["total-time"] == "03:00:00"
+    assert json["data"][0]["attributes"]["not-billable"] is False
+
+
+def test_pivot_statistic_empty(auth_client):
+    url = reverse("pivot-statistic-list")
+    result = auth_client.get(url, data={"group_by": "user"})
+    assert result.status_code == status.HTTP_200_OK
+    json = result.json()
+    # grand total of no rows
+    assert len(json["data"]) == 1
+    assert json["meta"]["total-time"] == "00:00:00"
+
+
+@pytest.mark.parametrize("group_by", [None, "", "invalid", "user,invalid"])
+def test_pivot_statistic_invalid_group_by(auth_client, group_by):
+    url = reverse("pivot-statistic-list")
+    data = {} if group_by is None else {"group_by": group_by}
+    result = auth_client.get(url, data=data)
+    assert result.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_pivot_statistic_iso_week(auth_client):
+    task = TaskFactory.create()
+    # monday of iso week 1 of 2020
+    ReportFactory.create(
+        task=task, date=date(2019, 12, 30), duration=timedelta(hours=1)
+    )
+    ReportFactory.create(task=task, date=date(2020, 1, 2), duration=timedelta(hours=2))
+    # sunday of iso week 53 of 2020
+    ReportFactory.create(task=task, date=date(2021, 1, 3), duration=timedelta(hours=4))
+
+    url = reverse("pivot-statistic-list")
+    result = auth_client.get(url, data={"group_by": "year,week"})
+    assert result.status_code == status.HTTP_200_OK
+
+    rows = [
+        (
+            entry["attributes"]["year"],
+            entry["attributes"]["week"],
+            entry["attributes"]["duration"],
+        )
+        for entry in result.json()["data"]
+    ]
+    assert rows == [
+        (2020, 1, "03:00:00"),
+        (2020, 53, "04:00:00"),
+        (2020, None, "07:00:00"),
+        (None, None, "07:00:00"),
+    ]
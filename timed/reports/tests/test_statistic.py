@@ -0,0 +1,42 @@
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from timed.employment.factories import UserFactory
+from timed.projects.factories import TaskFactory
+from timed.tracking.factories import ReportFactory
+
+
+@pytest.mark.parametrize(
+    "url_name,include,num_queries",
+    [
+        ("customer-statistic-list", "customer", 2),
+        ("project-statistic-list", "project,project.customer", 3),
+        ("task-statistic-list", "task,task.project", 3),
+        ("user-statistic-list", "user", 5),
+    ],
+)
+@pytest.mark.parametrize("page_size", [None, 2])
+def test_statistic_list_num_queries(
+    auth_client, django_assert_num_queries, url_name, include, num_queries, page_size
+):
+    users = UserFactory.create_batch(3)
+    tasks = TaskFactory.create_batch(3, cost_center=None, project__cost_center=None)
+    for task in tasks:
+        for user in users:
+            ReportFactory.create(task=task, user=user, duration=timedelta(hours=1))
+
+    data = {"include": include, "ordering": "duration"}
+    if page_size:
+        data["page[size]"] = page_size
+
+    # aggregate is only evaluated once independent of number of rows
+    with django_assert_num_queries(num_queries):
+        result = auth_client.get(reverse(url_name), data=data)
+    assert result.status_code == status.HTTP_200_OK
+
+    json = result.json()
+    assert len(json["data"]) == (page_size or 3)
+    assert json["meta"]["total-time"] == "09:00:00"
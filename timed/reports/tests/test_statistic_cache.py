@@ -0,0 +1,123 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import transaction
+from django.urls import reverse
+from rest_framework import status
+
+from timed.projects.factories import TaskFactory
+from timed.tracking.factories import ReportFactory
+
+
+@pytest.fixture(autouse=True)
+def statistic_cache(settings):
+    settings.STATISTIC_CACHE_TIMEOUT = 3600
+
+
+def test_statistic_cache_hit(auth_client, django_assert_num_queries):
+    task = TaskFactory.create()
+    ReportFactory.create(task=task, duration=timedelta(hours=1))
+
+    url = reverse("project-statistic-list")
+    data = {"include": "project", "ordering": "duration"}
+    result = auth_client.get(url, data=data)
+    assert result.status_code == status.HTTP_200_OK
+
+    with django_assert_num_queries(0):
+        cached = auth_client.get(url, data=data)
+    assert cached.status_code == status.HTTP_200_OK
+    assert cached.json() == result.json()
+
+    # report changes invalidate statistic
+    ReportFactory.create(task=task, duration=timedelta(hours=2))
+    result = auth_client.get(url, data=data)
+    assert result.json()["data"][0]["attributes"]["duration"] == "03:00:00"
+
+    stdout = StringIO()
+    call_command("statistic_cache_stats", reset=True, stdout=stdout)
+    assert stdout.getvalue() == "1 hits, 2 misses, hit ratio 33.3%\n"
+    stdout = StringIO()
+    call_command("statistic_cache_stats", stdout=stdout)
+    assert stdout.getvalue() == "0 hits, 0 misses, hit ratio 0.0%\n"
+
+
+def test_statistic_cache_project(auth_client, django_assert_num_queries):
+    task, other_task = TaskFactory.create_batch(2)
+    user = auth_client.user
+    ReportFactory.create(task=task, user=user, duration=timedelta(hours=1))
+
+    url = reverse("task-statistic-list")
+    data = {"project": task.project.id}
+    auth_client.get(url, data=data)
+
+    # reports of other projects do not invalidate statistic of project
+    ReportFactory.create(task=other_task, user=user, duration=timedelta(hours=2))
+    with django_assert_num_queries(0):
+        auth_client.get(url, data=data)
+
+    report = ReportFactory.create(task=task, user=user, duration=timedelta(hours=2))
+    result = auth_client.get(url, data=data)
+    assert result.json()["data"][0]["attributes"]["duration"] == "03:00:00"
+
+    # moving report to other project invalidates statistic as well
+    report.task = other_task
+    report.save()
+    result = auth_client.get(url, data=data)
+    assert result.json()["data"][0]["attributes"]["duration"] == "01:00:00"
+
+
+def test_statistic_cache_master_data(auth_client):
+    task = TaskFactory.create(name="Old")
+    ReportFactory.create(task=task)
+
+    url = reverse("task-statistic-list")
+    auth_client.get(url, data={"include": "task"})
+
+    task.name = "New"
+    task.save()
+    result = auth_client.get(url, data={"include": "task"})
+    assert result.json()["included"][0]["attributes"]["name"] == "New"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_statistic_cache_bump_on_commit(mocker):
+    bump_reports = mocker.patch("timed.reports.cache.bump_reports")
+    bump_master_data = mocker.patch("timed.reports.cache.bump_master_data")
+
+    with transaction.atomic():
+        report = ReportFactory.create()
+        ReportFactory.create(task=report.task)
+        bump_reports.assert_not_called()
+        bump_master_data.assert_not_called()
+
+    bump_reports.assert_called_once_with({report.task.project_id})
+    bump_master_data.assert_called()
+
+
+def test_statistic_cache_editable(auth_client, superadmin_client):
+    report = ReportFactory.create()
+
+    url = reverse("user-statistic-list")
+    result = superadmin_client.get(url, data={"editable": 1})
+    assert len(result.json()["data"]) == 1
+
+    # editable depends on requesting user
+    result = auth_client.get(url, data={"editable": 1})
+    assert len(result.json()["data"]) == 0
+
+    # becoming supervisor changes editable reports
+    report.user.supervisors.add(auth_client.user)
+    result = auth_client.get(url, data={"editable": 1})
+    assert len(result.json()["data"]) == 1
+
+
+def test_statistic_cache_disabled(auth_client, settings, django_assert_num_queries):
+    settings.STATISTIC_CACHE_TIMEOUT = 0
+    ReportFactory.create()
+
+    url = reverse("year-statistic-list")
+    auth_client.get(url)
+    with django_assert_num_queries(1):
+        auth_client.get(url)
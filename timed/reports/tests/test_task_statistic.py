@@ -14,7 +14,7 @@ def test_task_statistic_list(auth_client, django_assert_num_queries):
     ReportFactory.create(duration=timedelta(hours=2), task=task_z)
 
     url = reverse("task-statistic-list")
-    with django_assert_num_queries(4):
+    with django_assert_num_queries(3):
         result = auth_client.get(
             url,
             data={
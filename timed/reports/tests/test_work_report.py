@@ -1,5 +1,7 @@
 import io
-from datetime import date
+from collections import defaultdict
+from datetime import date, timedelta
+from unittest import mock
 from zipfile import ZipFile
 
 import ezodf
@@ -7,7 +9,9 @@ import pytest
 from django.urls import reverse
 from rest_framework import status
 
+from timed.employment.factories import UserFactory
 from timed.projects.factories import CustomerFactory, ProjectFactory, TaskFactory
+from timed.reports import ods
 from timed.reports.views import WorkReportViewSet
 from timed.tracking.factories import ReportFactory
 
@@ -49,7 +53,7 @@ def test_work_report_single_project(auth_client, django_assert_num_queries):
 
 @pytest.mark.freeze_time("2017-09-01")
 def test_work_report_multiple_projects(auth_client, django_assert_num_queries):
-    NUM_PROJECTS = 2
+    NUM_PROJECTS = 3
 
     user = auth_client.user
     customer = CustomerFactory.create(name="Customer")
@@ -65,8 +69,9 @@ def test_work_report_multiple_projects(auth_client, django_assert_num_queries):
     assert res.status_code == status.HTTP_200_OK
     assert "20170901-WorkReports.zip" in (res["Content-Disposition"])
 
-    content = io.BytesIO(res.content)
+    content = io.BytesIO(b"".join(res.streaming_content))
     with ZipFile(content, "r") as zipfile:
+        assert len(zipfile.namelist()) == NUM_PROJECTS
         for i in range(NUM_PROJECTS):
             ods_content = zipfile.read(
                 "1708-20170901-Customer-Project{0}.ods".format(i)
@@ -131,3 +136,168 @@ def test_work_report_count(
     res = auth_client.get(url, data={"user": auth_client.user.id, "verified": 0})
 
     assert res.status_code == expected_status
+
+
+def test_work_report_rows(auth_client):
+    user = auth_client.user
+    task = TaskFactory.create(name="Task")
+    other_task = TaskFactory.create(name="Other  Task", project=task.project)
+    ReportFactory.create(
+        user=user,
+        task=task,
+        date=date(2017, 8, 17),
+        duration=timedelta(hours=1),
+        comment="first\nline",
+    )
+    ReportFactory.create(
+        user=user, task=other_task, date=date(2017, 8, 18), duration=timedelta(hours=2)
+    )
+    ReportFactory.create(
+        user=user, task=task, date=date(2017, 8, 19), duration=timedelta(hours=3)
+    )
+
+    url = reverse("work-report-list")
+    res = auth_client.get(url, data={"user": user.id, "ordering": "date"})
+    assert res.status_code == status.HTTP_200_OK
+
+    table = ezodf.opendoc(io.BytesIO(res.content)).sheets[0]
+    assert [table[row, 0].value for row in range(12, 15)] == [
+        "2017-08-17",
+        "2017-08-18",
+        "2017-08-19",
+    ]
+    assert [table[row, 1].value for row in range(12, 15)] == [1.0, 2.0, 3.0]
+    assert table["D14"].value == "Other  Task"
+    assert table["E13"].value == "first\nline"
+    # task totals below empty row after reports
+    assert table[15, 0].value is None
+    assert [(table[row, 0].value, table[row, 2].value) for row in (16, 17)] == [
+        ("Other  Task", 2.0),
+        ("Task", 4.0),
+    ]
+    assert table["C19"].formula == "of:=SUM(B13:B15)"
+
+
+def test_work_report_linear(db, django_assert_num_queries):
+    """Rows of reports are built in one pass and inserted into table at once."""
+    user = UserFactory.create()
+    task = TaskFactory.create()
+    view = WorkReportViewSet()
+
+    def count_rows(count):
+        reports = ReportFactory.build_batch(
+            count, user=user, task=task, date=date(2017, 8, 17)
+        )
+        # inserting rows through ezodf shifts all following rows each time
+        insert_ezodf = mock.patch.object(
+            ezodf.table.Table, "insert_rows", side_effect=AssertionError
+        )
+        insert_ods = mock.patch(
+            "timed.reports.views.ods.insert_rows", wraps=ods.insert_rows
+        )
+        with insert_ezodf, insert_ods as insert_rows:
+            with django_assert_num_queries(0):
+                _, doc = view._create_workreport(
+                    None, None, date.today(), task.project, reports, user
+                )
+        insert_rows.assert_called_once()
+        return ezodf.opendoc(io.BytesIO(doc.tobytes())).sheets[0].nrows()
+
+    assert count_rows(1000) - count_rows(10) == 990
+
+
+def _create_workreport_row_by_row(template, today, project, reports, user):
+    """Create work report by inserting a row per report like it used to."""
+    doc = ezodf.opendoc(template)
+    table = doc.sheets[0]
+    tasks = defaultdict(int)
+    date_style = table["C5"].style_name
+    float_style = table["D3"].style_name
+    text_style = table["D4"].style_name
+    date_style_report = table["D8"].style_name
+    from_date = to_date = None
+
+    for report in reports:
+        table.insert_rows(12, 1)
+        table["A13"] = ezodf.Cell(
+            report.date, style_name=date_style_report, value_type="date"
+        )
+        hours = report.duration.total_seconds() / 60 / 60
+        table["B13"] = ezodf.Cell(hours, style_name=float_style)
+        table["C13"] = ezodf.Cell(report.user.get_full_name(), style_name=text_style)
+        table["D13"] = ezodf.Cell(report.task.name, style_name=text_style)
+        table["E13"] = ezodf.Cell(report.comment, style_name=text_style)
+        from_date = min(report.date, from_date or date.max)
+        to_date = max(report.date, to_date or date.min)
+        tasks[report.task.name] += hours
+
+    verifiers = sorted(
+        {report.verified_by.get_full_name() for report in reports if report.verified_by}
+    )
+    table["C3"] = ezodf.Cell(project.customer.name)
+    table["C4"] = ezodf.Cell(project.name)
+    table["C5"] = ezodf.Cell(from_date, style_name=date_style, value_type="date")
+    table["C6"] = ezodf.Cell(to_date, style_name=date_style, value_type="date")
+    table["C8"] = ezodf.Cell(today, style_name=date_style, value_type="date")
+    table["C9"] = ezodf.Cell(user.get_full_name())
+    table["C10"] = ezodf.Cell(", ".join(verifiers))
+    table["D3"].style_name = ""
+    table["D4"].style_name = ""
+    table["D8"].style_name = ""
+
+    pos = 13 + len(reports)
+    for task_name, task_total_hours in tasks.items():
+        table.insert_rows(pos, 1)
+        table.row_info(pos).style_name = table.row_info(pos - 1).style_name
+        table[pos, 0] = ezodf.Cell(task_name, style_name=table[pos - 1, 0].style_name)
+        table[pos, 2] = ezodf.Cell(
+            task_total_hours, style_name=table[pos - 1, 2].style_name
+        )
+    table[13 + len(reports) + len(tasks), 2].formula = "of:=SUM(B13:B{0})".format(
+        str(13 + len(reports) - 1)
+    )
+    return doc
+
+
+def _get_cells(doc):
+    table = ezodf.opendoc(io.BytesIO(doc.tobytes())).sheets[0]
+    return [
+        (
+            table.row_info(row).style_name,
+            [
+                (cell.value_type, cell.value, cell.style_name, cell.formula)
+                for cell in table.row(row)
+            ],
+        )
+        for row in range(table.nrows())
+    ]
+
+
+def test_work_report_same_as_row_by_row(db, settings):
+    """Work report has same rows and cells as when inserted row by row."""
+    user = UserFactory.create()
+    project = ProjectFactory.create()
+    tasks = TaskFactory.create_batch(3, project=project)
+    users = UserFactory.create_batch(2)
+    reports = [
+        ReportFactory.create(
+            user=users[index % 2],
+            task=tasks[index % 3],
+            date=date(2017, 8, 1) + timedelta(days=index % 7),
+            duration=timedelta(minutes=15 * (index + 1)),
+            comment=comment,
+            verified_by=user if index % 4 else None,
+        )
+        for index, comment in enumerate(
+            ["", "first\nline", "tab\tand  spaces", " leading", "<&>"] * 4
+        )
+    ]
+    today = date(2017, 9, 1)
+
+    _, doc = WorkReportViewSet()._create_workreport(
+        None, None, today, project, reports, user
+    )
+    expected = _create_workreport_row_by_row(
+        settings.WORK_REPORT_PATH, today, project, reports, user
+    )
+    assert _get_cells(doc) == _get_cells(expected)
@@ -8,9 +8,14 @@ r = SimpleRouter(trailing_slash=settings.APPEND_SLASH)
 r.register(r"work-reports", views.WorkReportViewSet, "work-report")
 r.register(r"year-statistics", views.YearStatisticViewSet, "year-statistic")
 r.register(r"month-statistics", views.MonthStatisticViewSet, "month-statistic")
+r.register(r"quarter-statistics", views.QuarterStatisticViewSet, "quarter-statistic")
+r.register(r"week-statistics", views.WeekStatisticViewSet, "week-statistic")
+r.register(r"day-statistics", views.DayStatisticViewSet, "day-statistic")
 r.register(r"task-statistics", views.TaskStatisticViewSet, "task-statistic")
 r.register(r"user-statistics", views.UserStatisticViewSet, "user-statistic")
 r.register(r"customer-statistics", views.CustomerStatisticViewSet, "customer-statistic")
 r.register(r"project-statistics", views.ProjectStatisticViewSet, "project-statistic")
+r.register(r"pivot-statistics", views.PivotStatisticViewSet, "pivot-statistic")
+r.register(r"export-jobs", views.ExportJobViewSet, "export-job")
 
 urlpatterns = r.urls
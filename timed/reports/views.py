@@ -1,51 +1,151 @@
 import re
 from collections import defaultdict
-from datetime import date
+from datetime import date, timedelta
+from functools import lru_cache
 from io import BytesIO
 from zipfile import ZipFile
 
 from django.conf import settings
-from django.db.models import F, Sum
-from django.db.models.functions import ExtractMonth, ExtractYear
-from django.http import HttpResponse
+from django.db import connection
+from django.db.models import DateField, F, Sum
+from django.db.models.functions import (
+    Coalesce,
+    ExtractIsoYear,
+    ExtractMonth,
+    ExtractWeek,
+    ExtractYear,
+    Trunc,
+)
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.dateparse import parse_date
+from django.utils.translation import ugettext_lazy as _
 from ezodf import Cell, opendoc
-from rest_framework import status
+from rest_framework import exceptions, mixins, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet, ReadOnlyModelViewSet
 
-from timed.mixins import AggregateQuerysetMixin
-from timed.reports import serializers
-from timed.tracking.filters import ReportFilterSet
-from timed.tracking.models import Report
+from timed.mixins import AggregateQuerysetMixin, TotalTimeMixin
+from timed.reports import cache as statistic_cache, ods, serializers
+from timed.reports.models import ExportJob
+from timed.tracking.filters import ReportFilterSet, ReportRollupFilterSet
+from timed.tracking.models import Report, ReportRollup
 from timed.tracking.views import ReportViewSet
 
 
-class YearStatisticViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
+class ReportRollupMixin(object):
+    """
+    Calculate statistics on report rollup whenever filters allow.
+
+    Rollup has reported time already summed up per day, user, task and
+    state. Filters which need single reports like `review` or `editable`
+    are not supported, in such a case statistics are calculated on reports.
+    """
+
+    @property
+    def filterset_class(self):
+        return ReportRollupFilterSet if self._use_rollup() else ReportFilterSet
+
+    def _use_rollup(self):
+        unsupported = set(ReportFilterSet.base_filters) - set(
+            ReportRollupFilterSet.base_filters
+        )
+        return unsupported.isdisjoint(self.request.query_params)
+
+    def get_report_queryset(self):
+        """Get queryset statistic is calculated on."""
+        if self._use_rollup():
+            return ReportRollup.objects.all()
+
+        return Report.objects.all()
+
+
+class StatisticCacheMixin(object):
+    """
+    Cache rendered statistics per query params.
+
+    Cache is invalidated by bumping generations of statistics whenever
+    reports or shown master data change, see `timed.reports.cache`.
+    """
+
+    def _get_cache_scope(self):
+        """
+        Get scope of user statistic is visible to.
+
+        Statistics are the same for all users, only `editable` filter
+        depends on requesting user.
+        """
+        if "editable" in self.request.query_params:
+            return self.request.user.id
+
+        return None
+
+    def _cached(self, handler, request, *args, **kwargs):
+        if not settings.STATISTIC_CACHE_TIMEOUT:
+            return handler(request, *args, **kwargs)
+
+        key = statistic_cache.get_key(
+            "{0} {1}".format(request.path, request.accepted_media_type),
+            request.query_params,
+            self._get_cache_scope(),
+        )
+        cached = statistic_cache.load(key)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response.add_post_render_callback(
+                lambda response: statistic_cache.store(
+                    key, (response.content, response["Content-Type"])
+                )
+            )
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._cached(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached(super().retrieve, request, *args, **kwargs)
+
+
+class YearStatisticViewSet(
+    StatisticCacheMixin,
+    ReportRollupMixin,
+    TotalTimeMixin,
+    AggregateQuerysetMixin,
+    ReadOnlyModelViewSet,
+):
     """Year statistics calculates total reported time per year."""
 
     serializer_class = serializers.YearStatisticSerializer
-    filterset_class = ReportFilterSet
     ordering_fields = ("year", "duration")
     ordering = ("year",)
 
     def get_queryset(self):
-        queryset = Report.objects.all()
+        queryset = self.get_report_queryset()
         queryset = queryset.annotate(year=ExtractYear("date")).values("year")
         queryset = queryset.annotate(duration=Sum("duration"))
         queryset = queryset.annotate(pk=F("year"))
         return queryset
 
 
-class MonthStatisticViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
+class MonthStatisticViewSet(
+    StatisticCacheMixin,
+    ReportRollupMixin,
+    TotalTimeMixin,
+    AggregateQuerysetMixin,
+    ReadOnlyModelViewSet,
+):
     """Month statistics calculates total reported time per month."""
 
     serializer_class = serializers.MonthStatisticSerializer
-    filterset_class = ReportFilterSet
     ordering_fields = ("year", "month", "duration")
     ordering = ("year", "month")
 
     def get_queryset(self):
-        queryset = Report.objects.all()
+        queryset = self.get_report_queryset()
         queryset = queryset.annotate(
             year=ExtractYear("date"), month=ExtractMonth("date")
         )
@@ -55,16 +155,155 @@ class MonthStatisticViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
         return queryset
 
 
-class CustomerStatisticViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
+class GapFilledStatisticViewSet(
+    StatisticCacheMixin, ReportRollupMixin, AggregateQuerysetMixin, GenericViewSet
+):
+    """
+    Base of statistics calculating total reported time per period.
+
+    Periods without reports are filled in with zero by a generated series
+    in the same query, so periods are continuous from `from_date` to
+    `to_date` (or first and last reported period if not set) and ordered
+    chronologically.
+    """
+
+    # kind of `DATE_TRUNC` and interval between periods
+    kind = None
+    interval = None
+    # periods of a wider time frame are rejected
+    max_periods = 5000
+
+    def get_queryset(self):
+        return self.get_report_queryset()
+
+    def get_entry(self, start):
+        """Get entry of period with given start, identified by start date."""
+        return {"pk": start.isoformat(), "date": start}
+
+    def _get_periods(self, queryset):
+        """Sum up duration per period including empty periods."""
+        queryset = queryset.annotate(
+            period=Trunc("date", self.kind, output_field=DateField())
+        )
+        queryset = queryset.values("period", "duration").order_by()
+        inner_sql, params = queryset.query.sql_with_params()
+
+        query_params = self.request.query_params
+        # series is cut off after one period more than allowed, so a wide
+        # time frame is detected without generating all of its periods
+        sql = (
+            "WITH data AS ({inner_sql}), bounds AS ("
+            "SELECT DATE_TRUNC("
+            "%s, COALESCE(%s::date, (SELECT MIN(period) FROM data))::timestamp"
+            ") AS first, "
+            "COALESCE(%s::date, (SELECT MAX(period) FROM data))::timestamp AS last"
+            ") "
+            "SELECT series.period::date, SUM(data.duration) "
+            "FROM bounds, generate_series("
+            "bounds.first, "
+            "LEAST(bounds.last, bounds.first + %s * %s::interval), "
+            "%s::interval"
+            ") AS series(period) "
+            "LEFT JOIN data ON data.period = series.period::date "
+            "GROUP BY series.period ORDER BY series.period"
+        ).format(inner_sql=inner_sql)
+        params = params + (
+            self.kind,
+            parse_date(query_params.get("from_date") or ""),
+            parse_date(query_params.get("to_date") or ""),
+            self.max_periods,
+            self.interval,
+            self.interval,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        if len(rows) > self.max_periods:
+            raise exceptions.ParseError(
+                _("Time frame may not exceed {0} periods").format(self.max_periods)
+            )
+
+        data = []
+        for start, duration in rows:
+            entry = self.get_entry(start)
+            entry["duration"] = duration or timedelta()
+            data.append(entry)
+
+        total_time = sum((entry["duration"] for entry in data), timedelta())
+        for entry in data:
+            entry["total_time"] = total_time
+
+        return data
+
+    def list(self, request, *args, **kwargs):
+        return self._cached(self._list, request, *args, **kwargs)
+
+    def _list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        data = self._get_periods(queryset)
+
+        page = self.paginate_queryset(data)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(data, many=True)
+        return Response(serializer.data)
+
+
+class DayStatisticViewSet(GapFilledStatisticViewSet):
+    """Day statistics calculates total reported time per day."""
+
+    serializer_class = serializers.DayStatisticSerializer
+    kind = "day"
+    interval = "1 day"
+
+
+class WeekStatisticViewSet(GapFilledStatisticViewSet):
+    """Week statistics calculates total reported time per iso week."""
+
+    serializer_class = serializers.WeekStatisticSerializer
+    kind = "week"
+    interval = "1 week"
+
+    def get_entry(self, start):
+        year, week = start.isocalendar()[:2]
+        return {"pk": year * 100 + week, "year": year, "week": week, "date": start}
+
+
+class QuarterStatisticViewSet(GapFilledStatisticViewSet):
+    """Quarter statistics calculates total reported time per quarter."""
+
+    serializer_class = serializers.QuarterStatisticSerializer
+    kind = "quarter"
+    interval = "3 months"
+
+    def get_entry(self, start):
+        quarter = (start.month - 1) // 3 + 1
+        return {
+            "pk": start.year * 10 + quarter,
+            "year": start.year,
+            "quarter": quarter,
+            "date": start,
+        }
+
+
+class CustomerStatisticViewSet(
+    StatisticCacheMixin,
+    ReportRollupMixin,
+    TotalTimeMixin,
+    AggregateQuerysetMixin,
+    ReadOnlyModelViewSet,
+):
     """Customer statistics calculates total reported time per customer."""
 
     serializer_class = serializers.CustomerStatisticSerializer
-    filterset_class = ReportFilterSet
     ordering_fields = ("task__project__customer__name", "duration")
     ordering = ("task__project__customer__name",)
 
     def get_queryset(self):
-        queryset = Report.objects.all()
+        queryset = self.get_report_queryset()
 
         queryset = queryset.values("task__project__customer")
         queryset = queryset.annotate(duration=Sum("duration"))
@@ -73,18 +312,23 @@ class CustomerStatisticViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
         return queryset
 
 
-class ProjectStatisticViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
+class ProjectStatisticViewSet(
+    StatisticCacheMixin,
+    ReportRollupMixin,
+    TotalTimeMixin,
+    AggregateQuerysetMixin,
+    ReadOnlyModelViewSet,
+):
     """Project statistics calculates total reported time per project."""
 
     serializer_class = serializers.ProjectStatisticSerializer
-    filterset_class = ReportFilterSet
     ordering_fields = ("task__project__name", "duration")
     ordering = ("task__project__name",)
 
     prefetch_related_for_field = {"task__project": ["reviewers"]}
 
     def get_queryset(self):
-        queryset = Report.objects.all()
+        queryset = self.get_report_queryset()
 
         queryset = queryset.values("task__project")
         queryset = queryset.annotate(duration=Sum("duration"))
@@ -93,18 +337,23 @@ class ProjectStatisticViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
         return queryset
 
 
-class TaskStatisticViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
+class TaskStatisticViewSet(
+    StatisticCacheMixin,
+    ReportRollupMixin,
+    TotalTimeMixin,
+    AggregateQuerysetMixin,
+    ReadOnlyModelViewSet,
+):
     """Task statistics calculates total reported time per task."""
 
     serializer_class = serializers.TaskStatisticSerializer
-    filterset_class = ReportFilterSet
     ordering_fields = ("task__name", "duration")
     ordering = ("task__name",)
 
     prefetch_related_for_field = {"task": ["project__reviewers"]}
 
     def get_queryset(self):
-        queryset = Report.objects.all()
+        queryset = self.get_report_queryset()
 
         queryset = queryset.values("task")
         queryset = queryset.annotate(duration=Sum("duration"))
@@ -113,16 +362,23 @@ class TaskStatisticViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
         return queryset
 
 
-class UserStatisticViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
+class UserStatisticViewSet(
+    StatisticCacheMixin,
+    ReportRollupMixin,
+    TotalTimeMixin,
+    AggregateQuerysetMixin,
+    ReadOnlyModelViewSet,
+):
     """User calculates total reported time per user."""
 
     serializer_class = serializers.UserStatisticSerializer
-    filterset_class = ReportFilterSet
     ordering_fields = ("user__username", "duration")
     ordering = ("user__username",)
 
+    prefetch_related_for_field = {"user": ["supervisors", "supervisees", "reviews"]}
+
     def get_queryset(self):
-        queryset = Report.objects.all()
+        queryset = self.get_report_queryset()
 
         queryset = queryset.values("user")
         queryset = queryset.annotate(duration=Sum("duration"))
@@ -131,6 +387,139 @@ class UserStatisticViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
         return queryset
 
 
+class PivotStatisticViewSet(
+    StatisticCacheMixin, ReportRollupMixin, AggregateQuerysetMixin, GenericViewSet
+):
+    """
+    Pivot statistics calculates total reported time per given dimensions.
+
+    Dimensions are passed as comma separated `group_by` param. Besides
+    total per combination of all dimensions, subtotals are calculated
+    with `ROLLUP` in the same query, e.g. `group_by=customer,project`
+    returns totals per customer and project, per customer and a grand
+    total. `grouping` is a bitmask of dimensions a row is a subtotal of
+    (see `GROUPING` of PostgreSQL), 0 for rows of all dimensions.
+
+    Weeks are iso weeks, so when grouped by week, year is the iso year
+    the week belongs to.
+    """
+
+    serializer_class = serializers.PivotStatisticSerializer
+
+    prefetch_related_for_field = {
+        "project": ["reviewers"],
+        "task": ["project__reviewers"],
+        "user": ["supervisors", "supervisees", "reviews"],
+    }
+
+    dimensions = {
+        "year": ExtractYear("date"),
+        "month": ExtractMonth("date"),
+        "week": ExtractWeek("date"),
+        "customer": F("task__project__customer"),
+        "project": F("task__project"),
+        "task": F("task"),
+        "user": F("user"),
+        "billing_type": F("task__project__billing_type"),
+        # cost center of task has higher priority than of project
+        "cost_center": Coalesce("task__cost_center", "task__project__cost_center"),
+        "not_billable": F("not_billable"),
+    }
+    # dimensions which are extracted from date as double precision
+    integer_dimensions = ("year", "month", "week")
+
+    def get_queryset(self):
+        return self.get_report_queryset()
+
+    def _extract_dimensions(self):
+        group_by = self.request.query_params.get("group_by", "")
+        dimensions = list(dict.fromkeys(filter(None, group_by.split(","))))
+        if not dimensions:
+            raise exceptions.ParseError(_("Group by needs to be set"))
+
+        invalid = set(dimensions) - set(self.dimensions)
+        if invalid:
+            raise exceptions.ParseError(
+                _("Invalid group by %(dimensions)s")
+                % {"dimensions": ", ".join(sorted(invalid))}
+            )
+
+        return dimensions
+
+    def _pivot(self, queryset, dimensions):
+        """Sum up duration per dimensions including subtotals in one query."""
+        expressions = dict(self.dimensions)
+        if "week" in dimensions:
+            # days around new year belong to week of previous or next year
+            expressions["year"] = ExtractIsoYear("date")
+
+        queryset = queryset.annotate(
+            **{
+                "pivot_{0}".format(dimension): expressions[dimension]
+                for dimension in dimensions
+            }
+        )
+        queryset = queryset.values(
+            *["pivot_{0}".format(dimension) for dimension in dimensions], "duration"
+        ).order_by()
+        inner_sql, params = queryset.query.sql_with_params()
+
+        columns = [
+            connection.ops.quote_name("pivot_{0}".format(dimension))
+            for dimension in dimensions
+        ]
+        sql = (
+            "SELECT {columns}, SUM(duration), GROUPING({columns}) "
+            "FROM ({inner_sql}) pivot GROUP BY ROLLUP ({columns}) "
+            "ORDER BY {ordering}"
+        ).format(
+            columns=", ".join(columns),
+            inner_sql=inner_sql,
+            # subtotals after rows they sum up
+            ordering=", ".join(column + " NULLS LAST" for column in columns),
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        data = []
+        for row in rows:
+            entry = dict.fromkeys(self.dimensions)
+            entry.update(zip(dimensions, row))
+            for dimension in self.integer_dimensions:
+                if entry[dimension] is not None:
+                    entry[dimension] = int(entry[dimension])
+            entry["duration"] = row[-2]
+            entry["grouping"] = row[-1]
+            entry["pk"] = "_".join(
+                [str(row[-1])] + [str(entry[dimension]) for dimension in dimensions]
+            )
+            data.append(entry)
+
+        # grand total is last row of rollup
+        total_time = data[-1]["duration"] if data else None
+        for entry in data:
+            entry["total_time"] = total_time
+
+        return data
+
+    def list(self, request, *args, **kwargs):
+        return self._cached(self._list, request, *args, **kwargs)
+
+    def _list(self, request, *args, **kwargs):
+        dimensions = self._extract_dimensions()
+        queryset = self.filter_queryset(self.get_queryset())
+        data = self._pivot(queryset, dimensions)
+
+        page = self.paginate_queryset(data)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(data, many=True)
+        return Response(serializer.data)
+
+
 class WorkReportViewSet(GenericViewSet):
     """
     Build a ods work report of reports with given filters.
@@ -205,9 +594,9 @@ class WorkReportViewSet(GenericViewSet):
             }
         )
 
-        tmpl = settings.WORK_REPORT_PATH
-        doc = opendoc(tmpl)
+        doc = opendoc(BytesIO(_read_template(settings.WORK_REPORT_PATH)))
         table = doc.sheets[0]
+        ncols = table.ncols()
         tasks = defaultdict(int)
         date_style = table["C5"].style_name
         # in template cell D3 is empty but styled for float and borders
@@ -217,19 +606,23 @@ class WorkReportViewSet(GenericViewSet):
         # in template cell D8 is empty but styled for date with borders
         date_style_report = table["D8"].style_name
 
-        # for simplicity insert reports in reverse order
+        report_rows = []
         for report in reports:
-            table.insert_rows(12, 1)
-            table["A13"] = Cell(
-                report.date, style_name=date_style_report, value_type="date"
-            )
-
             hours = report.duration.total_seconds() / 60 / 60
-            table["B13"] = Cell(hours, style_name=float_style)
-
-            table["C13"] = Cell(report.user.get_full_name(), style_name=text_style)
-            table["D13"] = Cell(report.task.name, style_name=text_style)
-            table["E13"] = Cell(report.comment, style_name=text_style)
+            report_rows.append(
+                ods.row(
+                    [
+                        ods.date_cell(report.date, style_name=date_style_report),
+                        ods.float_cell(hours, style_name=float_style),
+                        ods.string_cell(
+                            report.user.get_full_name(), style_name=text_style
+                        ),
+                        ods.string_cell(report.task.name, style_name=text_style),
+                        ods.string_cell(report.comment, style_name=text_style),
+                    ],
+                    ncols,
+                )
+            )
 
             # when from and to date are None find lowest and biggest date
             from_date = min(report.date, from_date or date.max)
@@ -251,19 +644,27 @@ class WorkReportViewSet(GenericViewSet):
         table["D4"].style_name = ""
         table["D8"].style_name = ""
 
-        pos = 13 + len(reports)
-        for task_name, task_total_hours in tasks.items():
-            table.insert_rows(pos, 1)
-            table.row_info(pos).style_name = table.row_info(pos - 1).style_name
-            table[pos, 0] = Cell(task_name, style_name=table[pos - 1, 0].style_name)
-            table[pos, 2] = Cell(
-                task_total_hours, style_name=table[pos - 1, 2].style_name
+        # task totals are placed below empty row after reports
+        task_row_style = table.row_info(12).style_name
+        task_rows = [
+            ods.row(
+                [
+                    ods.string_cell(task_name, style_name=table[12, 0].style_name),
+                    ods.empty_cell(),
+                    ods.float_cell(
+                        task_total_hours, style_name=table[12, 2].style_name
+                    ),
+                ],
+                ncols,
+                style_name=task_row_style,
             )
+            for task_name, task_total_hours in reversed(list(tasks.items()))
+        ]
 
-        # calculate location of total hours as insert rows moved it
-        table[13 + len(reports) + len(tasks), 2].formula = "of:=SUM(B13:B{0})".format(
-            str(13 + len(reports) - 1)
-        )
+        table[13, 2].formula = "of:=SUM(B13:B{0})".format(str(13 + len(reports) - 1))
+
+        # reports are listed in reverse order
+        ods.insert_rows(table, {12: reversed(report_rows), 13: task_rows})
 
         name = self._generate_workreport_name(from_date, today, project)
         return (name, doc)
@@ -301,29 +702,113 @@ class WorkReportViewSet(GenericViewSet):
         for report in queryset:
             reports_by_project[report.task.project].append(report)
 
-        docs = [
-            self._create_workreport(
-                from_date, to_date, today, project, reports, request.user
-            )
+        workreports = [
+            (from_date, to_date, today, project, reports, request.user)
             for project, reports in reports_by_project.items()
         ]
 
-        if len(docs) == 1:
-            name, doc = docs[0]
+        if len(workreports) == 1:
+            name, content = self._render_workreport(*workreports[0])
             response = HttpResponse(
-                doc.tobytes(),
-                content_type="application/vnd.oasis.opendocument.spreadsheet",
+                content, content_type="application/vnd.oasis.opendocument.spreadsheet"
             )
             response["Content-Disposition"] = "attachment; filename=%s" % name
             return response
 
         # zip multiple work reports
-        buf = BytesIO()
-        with ZipFile(buf, "w") as zf:
-            for name, doc in docs:
-                zf.writestr(name, doc.tobytes())
-        response = HttpResponse(buf.getvalue(), content_type="application/zip")
+        response = StreamingHttpResponse(
+            self._write_zip(
+                self._render_workreport(*workreport) for workreport in workreports
+            ),
+            content_type="application/zip",
+        )
         response["Content-Disposition"] = "attachment; filename=%s-WorkReports.zip" % (
             today.strftime("%Y%m%d")
         )
         return response
+
+    def _render_workreport(self, *args):
+        """
+        Render work report of a project into ods content.
+
+        :param args: arguments of `_create_workreport`
+        :return: tuple of name and ods content
+        """
+        name, doc = self._create_workreport(*args)
+        return name, doc.tobytes()
+
+    def _write_zip(self, docs):
+        """Stream zip, writing each work report as soon as it is rendered."""
+
+        class Stream(object):
+            """Unseekable file-like object collecting written zip content."""
+
+            def __init__(self):
+                self.chunks = []
+
+            def write(self, value):
+                self.chunks.append(value)
+                return len(value)
+
+            def flush(self):
+                pass
+
+            def pop(self):
+                content = b"".join(self.chunks)
+                self.chunks = []
+                return content
+
+        stream = Stream()
+        with ZipFile(stream, "w") as zf:
+            for name, content in docs:
+                zf.writestr(name, content)
+                yield stream.pop()
+        yield stream.pop()
+
+
+@lru_cache()
+def _read_template(path):
+    """
+    Read work report template once per process.
+
+    Parsed ezodf documents may not be copied, as ezodf keeps wrappers of
+    tables in a process wide cache keyed by id of xml elements and changes
+    on a deep copy do not end up in its content. Only the file content is
+    kept and each work report parses it again, which is cheap compared to
+    rendering.
+    """
+    with open(path, "rb") as template:
+        return template.read()
+
+
+class ExportJobViewSet(
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.ListModelMixin,
+    GenericViewSet,
+):
+    """
+    Export reports or work reports in background.
+
+    Submitted job takes same query params as synchronous export
+    respectively work report endpoint. Once job is done, generated
+    file may be downloaded till it exceeds retention.
+    """
+
+    serializer_class = serializers.ExportJobSerializer
+
+    def get_queryset(self):
+        return ExportJob.objects.filter(user=self.request.user).order_by("-created")
+
+    @action(methods=["get"], detail=True)
+    def download(self, request, pk=None):
+        job = self.get_object()
+        if job.status != ExportJob.DONE:
+            raise exceptions.NotFound(_("Export job is not done"))
+
+        return FileResponse(
+            job.file.open("rb"),
+            as_attachment=True,
+            filename=job.filename,
+            content_type=job.content_type,
+        )
@@ -10,11 +10,25 @@ class TotalTimeRootMetaMixin(object):
     def get_root_meta(self, resource, many):
         """Add total hours over whole result (not just page) to meta."""
         if many:
-            view = self.context["view"]
-            queryset = view.filter_queryset(view.get_queryset())
-            data = queryset.aggregate(total_time=Sum(self.duration_field))
-            data["total_time"] = duration_string(data["total_time"] or timedelta(0))
-            return data
+            view = self.context.get("view")
+            if getattr(getattr(view, "paginator", None), "calculates_totals", False):
+                # total time is added by paginator when requested
+                return {}
+
+            first = next(iter(self.instance), None)
+            if first is None:
+                total_time = None
+            elif hasattr(first, "total_time"):
+                # annotated by `TotalTimeMixin` of view
+                total_time = first.total_time
+            else:
+                view = self.context["view"]
+                queryset = view.filter_queryset(view.get_queryset())
+                total_time = queryset.aggregate(total_time=Sum(self.duration_field))[
+                    "total_time"
+                ]
+
+            return {"total_time": duration_string(total_time or timedelta(0))}
         return {}
 
 
@@ -142,6 +142,10 @@ USE_TZ = True
 STATIC_URL = env.str("STATIC_URL", "/static/")
 STATIC_ROOT = env.str("STATIC_ROOT", None)
 
+# Media files (generated exports)
+
+MEDIA_ROOT = env.str("DJANGO_MEDIA_ROOT", default=django_root("media"))
+
 # Cache
 
 CACHES = {
@@ -293,6 +297,33 @@ WORK_REPORTS_EXPORT_MAX_COUNT = env.int(
 
 REPORTS_EXPORT_MAX_COUNT = env.int("DJANGO_REPORTS_EXPORT_MAX_COUNT", default=0)
 
+# Number of reports updated per transaction on bulk update
+REPORTS_BULK_UPDATE_CHUNK_SIZE = env.int(
+    "DJANGO_REPORTS_BULK_UPDATE_CHUNK_SIZE", default=1000
+)
+
+# Worktime ledger: calculate worktime balances from materialized ledger
+# (needs to be built with `rebuild_worktime_ledger` command before enabling)
+WORKTIME_LEDGER_ENABLED = env.bool("DJANGO_WORKTIME_LEDGER_ENABLED", default=False)
+
+# Seconds statistics are cached for, 0 disables caching
+STATISTIC_CACHE_TIMEOUT = env.int("DJANGO_STATISTIC_CACHE_TIMEOUT", default=0)
+if (
+    STATISTIC_CACHE_TIMEOUT
+    and CACHES["default"]["BACKEND"] == "django.core.cache.backends.locmem.LocMemCache"
+):
+    # statistics are invalidated through cache so it needs to be shared
+    # between processes
+    raise environ.ImproperlyConfigured(
+        "DJANGO_STATISTIC_CACHE_TIMEOUT needs a shared CACHE_BACKEND, e.g. memcached"
+    )
+
+# Hours files of background export jobs are kept for
+EXPORT_JOB_RETENTION_HOURS = env.int("DJANGO_EXPORT_JOB_RETENTION_HOURS", default=24)
+
+# Minutes after which a running export job is considered dead and failed
+EXPORT_JOB_TIMEOUT_MINUTES = env.int("DJANGO_EXPORT_JOB_TIMEOUT_MINUTES", default=60)
+
 # Tracking: Report fields which should be included in email (when report was
 # changed during verification)
 TRACKING_REPORT_VERIFIED_CHANGES = env.list(
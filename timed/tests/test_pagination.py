@@ -0,0 +1,37 @@
+from django.db.models import IntegerField, Window
+from rest_framework.settings import api_settings
+
+from timed.employment.factories import UserFactory
+from timed.employment.models import User
+from timed.employment.views import UserViewSet
+from timed.mixins import WindowCount
+from timed.pagination import PageNumberPagination, WindowCountPaginator
+from timed.reports.views import CustomerStatisticViewSet
+
+
+def test_window_count_paginator(db, django_assert_num_queries):
+    UserFactory.create_batch(3)
+    users = User.objects.order_by("id")
+
+    # count is taken from rows of page
+    paginator = WindowCountPaginator(
+        users.annotate(total_count=Window(WindowCount(), output_field=IntegerField())),
+        2,
+    )
+    with django_assert_num_queries(1):
+        page = paginator.page(2)
+        assert len(page) == 1
+        assert paginator.count == 3
+
+    # rows without count are not fetched twice
+    paginator = WindowCountPaginator(users, 2)
+    with django_assert_num_queries(2):
+        page = paginator.page(2)
+        assert len(page) == 1
+        assert paginator.count == 3
+
+
+def test_window_count_pagination_class():
+    # only views annotating count use window count paginator
+    assert CustomerStatisticViewSet.pagination_class is PageNumberPagination
+    assert UserViewSet.pagination_class is api_settings.DEFAULT_PAGINATION_CLASS
@@ -0,0 +1,34 @@
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from timed.employment.factories import UserFactory
+from timed.permissions import IsReviewer, IsSupervisor
+from timed.tracking.factories import ReportFactory
+
+
+def test_permission_context_loaded_once(db, django_assert_num_queries):
+    user = UserFactory.create()
+    supervisee = UserFactory.create()
+    supervisee.supervisors.add(user)
+    reviewed_report = ReportFactory.create()
+    reviewed_report.task.project.reviewers.add(user)
+    supervised_report = ReportFactory.create(user=supervisee)
+    other_report = ReportFactory.create()
+
+    http_request = APIRequestFactory().patch("/")
+    force_authenticate(http_request, user)
+    request = Request(http_request)
+
+    reports = [reviewed_report, supervised_report, other_report]
+    # supervisees and reviewed projects are queried once for all checks
+    with django_assert_num_queries(2):
+        assert IsReviewer().has_permission(request, None)
+        for _ in range(2):
+            assert [
+                IsReviewer().has_object_permission(request, None, report)
+                for report in reports
+            ] == [True, False, False]
+            assert [
+                IsSupervisor().has_object_permission(request, None, report)
+                for report in reports
+            ] == [False, True, False]
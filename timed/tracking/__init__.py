@@ -0,0 +1,3 @@
+# noqa: D104
+
+default_app_config = "timed.tracking.apps.TrackingConfig"
@@ -8,3 +8,6 @@ class TrackingConfig(AppConfig):
 
     name = "timed.tracking"
     label = "tracking"
+
+    def ready(self):
+        from timed.tracking import signals  # noqa: F401
@@ -12,6 +12,7 @@ from django_filters.rest_framework import (
     NumberFilter,
 )
 
+from timed.permissions import get_permission_context
 from timed.tracking import models
 
 
@@ -104,12 +105,12 @@ class ReportFilterSet(FilterSet):
         user. If set to `0` to not editable.
         """
         user = self.request.user
+        context = get_permission_context(self.request)
 
         def get_editable_query():
             return (
-                # avoid duplicates by using subqueries instead of joins
-                Q(user__in=user.supervisees.values("id"))
-                | Q(task__project__in=user.reviews.values("id"))
+                Q(user__in=context.supervisee_ids)
+                | Q(task__project__in=context.reviewed_project_ids)
                 | Q(user=user)
             ) & Q(verified_by__isnull=True)
 
@@ -161,6 +162,45 @@ class ReportFilterSet(FilterSet):
         )
 
 
+class ReportRollupFilterSet(FilterSet):
+    """
+    Filter set for the report rollup.
+
+    Supports all filters of `ReportFilterSet` which do not need single
+    reports.
+    """
+
+    from_date = DateFilter(field_name="date", lookup_expr="gte")
+    to_date = DateFilter(field_name="date", lookup_expr="lte")
+    project = NumberFilter(field_name="task__project")
+    customer = NumberFilter(field_name="task__project__customer")
+    not_billable = NumberFilter(field_name="not_billable")
+    verified = NumberFilter(field_name="verified")
+    reviewer = NumberFilter(field_name="task__project__reviewers")
+    billing_type = NumberFilter(field_name="task__project__billing_type")
+    user = NumberFilter(field_name="user_id")
+    cost_center = NumberFilter(method="filter_cost_center")
+
+    filter_cost_center = ReportFilterSet.filter_cost_center
+
+    class Meta:
+        """Meta information for the report rollup filter set."""
+
+        model = models.ReportRollup
+        fields = (
+            "date",
+            "from_date",
+            "to_date",
+            "user",
+            "task",
+            "project",
+            "verified",
+            "not_billable",
+            "reviewer",
+            "billing_type",
+        )
+
+
 class AbsenceFilterSet(FilterSet):
     """Filter set for the absences endpoint."""
 
@@ -0,0 +1,33 @@
+# Generated by Django 2.2.13 on 2026-10-17 07:04
+
+from django.db import migrations, models
+
+
+def migrate_on_public_holiday(apps, schema_editor):
+    Absence = apps.get_model("tracking", "Absence")
+    PublicHoliday = apps.get_model("employment", "PublicHoliday")
+    Absence.objects.update(
+        on_public_holiday=models.Exists(
+            PublicHoliday.objects.filter(
+                location__employments__user=models.OuterRef("user"),
+                date=models.OuterRef("date"),
+            )
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employment", "0012_auto_20181026_1528"),
+        ("tracking", "0012_migrate_report_review_false"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="absence",
+            name="on_public_holiday",
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.RunPython(migrate_on_public_holiday, migrations.RunPython.noop),
+    ]
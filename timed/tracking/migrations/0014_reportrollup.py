@@ -0,0 +1,69 @@
+# Generated by Django 2.2.13 on 2026-10-17 07:21
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+FILL_ROLLUP = """
+INSERT INTO tracking_reportrollup
+    (date, user_id, task_id, not_billable, verified, duration)
+SELECT date, user_id, task_id, not_billable, verified_by_id IS NOT NULL,
+    SUM(duration)
+FROM tracking_report
+GROUP BY date, user_id, task_id, not_billable, verified_by_id IS NOT NULL
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("projects", "0008_auto_20190220_1133"),
+        ("tracking", "0013_absence_on_public_holiday"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReportRollup",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("not_billable", models.BooleanField()),
+                ("verified", models.BooleanField()),
+                ("duration", models.DurationField()),
+                (
+                    "task",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="projects.Task",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="reportrollup",
+            index=models.Index(fields=["date"], name="tracking_re_date_f22e66_idx"),
+        ),
+        migrations.AlterUniqueTogether(
+            name="reportrollup",
+            unique_together={("date", "user", "task", "not_billable", "verified")},
+        ),
+        migrations.RunSQL(FILL_ROLLUP, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 2.2.13 on 2026-10-17 07:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # indexes are built concurrently which is not possible in a transaction
+    atomic = False
+
+    dependencies = [
+        ("tracking", "0014_reportrollup"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    "CREATE INDEX CONCURRENTLY IF NOT EXISTS "
+                    "tracking_re_date_01a854_idx ON tracking_report (date, id)",
+                    "DROP INDEX CONCURRENTLY IF EXISTS tracking_re_date_01a854_idx",
+                ),
+                migrations.RunSQL(
+                    "DROP INDEX CONCURRENTLY IF EXISTS tracking_re_date_8770c2_idx",
+                    "CREATE INDEX CONCURRENTLY IF NOT EXISTS "
+                    "tracking_re_date_8770c2_idx ON tracking_report (date)",
+                ),
+            ],
+            state_operations=[
+                migrations.RemoveIndex(
+                    model_name="report", name="tracking_re_date_8770c2_idx",
+                ),
+                migrations.AddIndex(
+                    model_name="report",
+                    index=models.Index(
+                        fields=["date", "id"], name="tracking_re_date_01a854_idx"
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 2.2.13 on 2026-10-17 08:02
+
+from django.db import migrations, models
+
+
+def create_index_concurrently(name, definition):
+    return migrations.RunSQL(
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS {0} ON tracking_report {1}".format(
+            name, definition
+        ),
+        "DROP INDEX CONCURRENTLY IF EXISTS {0}".format(name),
+    )
+
+
+class Migration(migrations.Migration):
+
+    # indexes are built concurrently which is not possible in a transaction
+    atomic = False
+
+    dependencies = [
+        ("tracking", "0015_report_date_id_index"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                create_index_concurrently(
+                    "tracking_report_user_date_idx", "(user_id, date)"
+                ),
+                create_index_concurrently(
+                    "tracking_report_task_date_idx", "(task_id, date)"
+                ),
+                create_index_concurrently(
+                    "tracking_report_unverified_idx",
+                    "(date) WHERE verified_by_id IS NULL",
+                ),
+                create_index_concurrently(
+                    "tracking_report_review_idx", "(date) WHERE review = true"
+                ),
+            ],
+            state_operations=[
+                migrations.AddIndex(
+                    model_name="report",
+                    index=models.Index(
+                        fields=["user", "date"], name="tracking_report_user_date_idx"
+                    ),
+                ),
+                migrations.AddIndex(
+                    model_name="report",
+                    index=models.Index(
+                        fields=["task", "date"], name="tracking_report_task_date_idx"
+                    ),
+                ),
+                migrations.AddIndex(
+                    model_name="report",
+                    index=models.Index(
+                        condition=models.Q(verified_by__isnull=True),
+                        fields=["date"],
+                        name="tracking_report_unverified_idx",
+                    ),
+                ),
+                migrations.AddIndex(
+                    model_name="report",
+                    index=models.Index(
+                        condition=models.Q(review=True),
+                        fields=["date"],
+                        name="tracking_report_review_idx",
+                    ),
+                ),
+            ],
+        ),
+    ]
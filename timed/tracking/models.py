@@ -1,9 +1,12 @@
 """Models for the tracking app."""
 
+import operator
+from collections import defaultdict
 from datetime import timedelta
+from functools import reduce
 
 from django.conf import settings
-from django.db import models
+from django.db import connection, models, transaction
 
 
 class Activity(models.Model):
@@ -123,22 +126,210 @@ class Report(models.Model):
     class Meta:
         """Meta information for the report model."""
 
+        indexes = [
+            # matches default ordering of reports used by keyset pagination
+            models.Index(fields=["date", "id"]),
+            # filters of reports of a user or project in a date range
+            models.Index(fields=["user", "date"], name="tracking_report_user_date_idx"),
+            models.Index(fields=["task", "date"], name="tracking_report_task_date_idx"),
+            # unverified reports and reports to review are rare
+            models.Index(
+                fields=["date"],
+                name="tracking_report_unverified_idx",
+                condition=models.Q(verified_by__isnull=True),
+            ),
+            models.Index(
+                fields=["date"],
+                name="tracking_report_review_idx",
+                condition=models.Q(review=True),
+            ),
+        ]
+
+
+class ReportRollupManager(models.Manager):
+    lock_namespace = 1
+    """
+    First key of advisory locks taken on refresh, second one is user id.
+    """
+
+    def get_keys(self, reports):
+        """
+        Get keys of rollup rows given reports are counted in.
+
+        :param reports: queryset of reports
+        :returns: set of tuples of date, user id and task id which can be
+                  passed on to `refresh`
+        """
+        return set(reports.values_list("date", "user", "task").distinct())
+
+    def refresh(self, keys):
+        """
+        Recalculate rollup rows of given keys from reports.
+
+        Needs to be called whenever reports get changed without signals
+        being sent, e.g. on a queryset update.
+
+        Rows of a user are recalculated under an advisory lock, so they
+        can't be inserted twice concurrently while writes on the user
+        itself are not blocked.
+
+        :param keys: tuples of date, user id and task id of rows to refresh
+        """
+        dates = defaultdict(set)
+        for day, user, task in keys:
+            dates[(user, task)].add(day)
+        if not dates:
+            return
+
+        filters = reduce(
+            operator.or_,
+            (
+                models.Q(user=user, task=task, date__in=days)
+                for (user, task), days in dates.items()
+            ),
+        )
+        users = sorted({user for user, task in dates})
+
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                # locks are taken ordered by user to prevent deadlocks
+                cursor.execute(
+                    "SELECT pg_advisory_xact_lock(%s, id) "
+                    "FROM (SELECT unnest(%s) AS id ORDER BY id) AS users",
+                    [self.lock_namespace, users],
+                )
+            self.filter(filters).delete()
+            self.bulk_create(
+                ReportRollup(
+                    date=entry["date"],
+                    user_id=entry["user"],
+                    task_id=entry["task"],
+                    not_billable=entry["not_billable"],
+                    verified=entry["verified"],
+                    duration=entry["duration"],
+                )
+                for entry in Report.objects.filter(filters)
+                .annotate(
+                    verified=models.Case(
+                        models.When(verified_by__isnull=True, then=models.Value(False)),
+                        default=models.Value(True),
+                        output_field=models.BooleanField(),
+                    )
+                )
+                .values("date", "user", "task", "not_billable", "verified")
+                .annotate(duration=models.Sum("duration"))
+                .order_by()
+            )
+
+
+class ReportRollup(models.Model):
+    """
+    Reported time summed up per day, user, task and state.
+
+    Statistics are calculated on rollup instead of reports where filters
+    allow. Kept current by signals on report changes.
+    """
+
+    date = models.DateField()
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+"
+    )
+    task = models.ForeignKey(
+        "projects.Task", on_delete=models.CASCADE, related_name="+"
+    )
+    not_billable = models.BooleanField()
+    verified = models.BooleanField()
+    duration = models.DurationField()
+
+    objects = ReportRollupManager()
+
+    class Meta:
+        unique_together = ("date", "user", "task", "not_billable", "verified")
         indexes = [models.Index(fields=["date"])]
 
 
 class AbsenceManager(models.Manager):
     def get_queryset(self):
+        """Exclude absences on public holidays of any location of user."""
+        return super().get_queryset().filter(on_public_holiday=False)
+
+    def update_public_holidays(self, **filters):
+        """
+        Update whether absences fall on a public holiday.
+
+        Needs to be called whenever public holidays or employments of users
+        change, as an absence on a public holiday of any location the user
+        is employed at is hidden.
+
+        :param filters: filters of absences to update, e.g. user or date
+        """
         from timed.employment.models import PublicHoliday
 
-        queryset = super().get_queryset()
-        queryset = queryset.exclude(
-            date__in=models.Subquery(
+        self.model._base_manager.filter(**filters).update(
+            on_public_holiday=models.Exists(
                 PublicHoliday.objects.filter(
-                    location__employments__user=models.OuterRef("user")
-                ).values("date")
+                    location__employments__user=models.OuterRef("user"),
+                    date=models.OuterRef("date"),
+                )
             )
         )
-        return queryset
+
+    def calculate_durations(self, absences, employments):
+        """
+        Calculate durations of given absences.
+
+        For fullday absences duration is equal worktime per day of the
+        employment the absence is in. For absences which need to fill day
+        the time reported on the same day is subtracted, which is loaded
+        for all absences at once in a single grouped query.
+
+        :param absences: absences with selected type
+        :param employments: employments of users of absences
+        :returns: dict mapping absence id to duration; absences outside
+                  of given employments are left out
+        """
+        employments_per_user = defaultdict(list)
+        for employment in employments:
+            employments_per_user[employment.user_id].append(employment)
+
+        absences_employments = [
+            (absence, employment)
+            for absence in absences
+            for employment in employments_per_user[absence.user_id]
+            if employment.start_date <= absence.date
+            and (employment.end_date is None or absence.date <= employment.end_date)
+        ]
+
+        fill_days = {
+            (absence.user_id, absence.date)
+            for absence, employment in absences_employments
+            if absence.type.fill_worktime
+        }
+        reported_per_day = {}
+        if fill_days:
+            reported_per_day = {
+                (entry["user"], entry["date"]): entry["duration"]
+                for entry in Report.objects.filter(
+                    user__in={user for user, day in fill_days},
+                    date__in={day for user, day in fill_days},
+                )
+                .values("user", "date")
+                .annotate(duration=models.Sum("duration"))
+            }
+
+        durations = {}
+        for absence, employment in absences_employments:
+            duration = employment.worktime_per_day
+            if absence.type.fill_worktime:
+                reported_time = reported_per_day.get(
+                    (absence.user_id, absence.date), timedelta()
+                )
+                # prevent negative duration in case user already
+                # reported more time than worktime per day
+                duration = max(duration - reported_time, timedelta())
+            durations[absence.id] = duration
+
+        return durations
 
 
 class Absence(models.Model):
@@ -156,28 +347,24 @@ class Absence(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="absences"
     )
+    on_public_holiday = models.BooleanField(default=False, db_index=True)
+    """
+    Whether absence is on a public holiday of any location of user.
+
+    Maintained by `AbsenceManager.update_public_holidays`.
+    """
+
     objects = AbsenceManager()
 
-    def calculate_duration(self, employment):
-        """
-        Calculate duration of absence with given employment.
+    def save(self, *args, **kwargs):
+        """Save the absence and check whether it is on a public holiday."""
+        from timed.employment.models import PublicHoliday
 
-        For fullday absences duration is equal worktime per day of employment
-        for absences which need to fill day calcuation needs to check
-        how much time has been reported on that day.
-        """
-        if not self.type.fill_worktime:
-            return employment.worktime_per_day
-
-        reports = Report.objects.filter(date=self.date, user=self.user_id)
-        data = reports.aggregate(reported_time=models.Sum("duration"))
-        reported_time = data["reported_time"] or timedelta()
-        if reported_time >= employment.worktime_per_day:
-            # prevent negative duration in case user already
-            # reported more time than worktime per day
-            return timedelta()
-
-        return employment.worktime_per_day - reported_time
+        self.on_public_holiday = PublicHoliday.objects.filter(
+            location__employments__user=self.user_id, date=self.date
+        ).exists()
+
+        super().save(*args, **kwargs)
 
     class Meta:
         """Meta informations for the absence model."""
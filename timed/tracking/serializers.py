@@ -2,9 +2,11 @@
 from datetime import timedelta
 
 from django.contrib.auth import get_user_model
-from django.db.models import BooleanField, Case, When
+from django.db.models import Case, Count, F, IntegerField, Min, Q, When
+from django.db.models.functions import Cast
 from django.utils.duration import duration_string
 from django.utils.translation import ugettext_lazy as _
+from rest_framework.serializers import ListSerializer
 from rest_framework_json_api import relations, serializers
 from rest_framework_json_api.relations import ResourceRelatedField
 from rest_framework_json_api.serializers import (
@@ -203,56 +205,91 @@ class ReportIntersectionSerializer(Serializer):
     not_billable = SerializerMethodField()
     verified = SerializerMethodField()
 
-    def _intersection(self, instance, field, model=None):
-        """Get intersection of given field.
+    def _get_intersection(self, instance):
+        """
+        Get intersection of all fields at once.
+
+        Fields are intersected in a single aggregate as a field has a
+        common value when it has only one distinct value. Common customer,
+        project and task are fetched in one additional query.
 
-        :return: Returns value of field if objects have same value;
-                 otherwise None
+        :return: dict of common value per field, None where values differ
         """
-        value = None
-        queryset = instance["queryset"]
-        values = queryset.values(field).distinct()
-        if values.count() == 1:
-            value = values.first()[field]
-            if model:
-                value = model.objects.get(pk=value)
+        if "intersection" in instance:
+            return instance["intersection"]
+
+        fields = {
+            "customer": F("task__project__customer"),
+            "project": F("task__project"),
+            "task": F("task"),
+            "comment": F("comment"),
+            # booleans have no min aggregate
+            "review": Cast("review", IntegerField()),
+            "not_billable": Cast("not_billable", IntegerField()),
+            "verified": Case(
+                When(verified_by_id__isnull=True, then=0),
+                default=1,
+                output_field=IntegerField(),
+            ),
+        }
+        aggregates = {"count": Count("id")}
+        for name, expression in fields.items():
+            aggregates["{0}_count".format(name)] = Count(expression, distinct=True)
+            aggregates[name] = Min(expression)
+        result = instance["queryset"].order_by().aggregate(**aggregates)
+
+        intersection = {
+            name: result[name] if result["{0}_count".format(name)] == 1 else None
+            for name in fields
+        }
+        for name in ["review", "not_billable", "verified"]:
+            if intersection[name] is not None:
+                intersection[name] = bool(intersection[name])
+
+        # a common task implies a common project and customer
+        if intersection["task"] is not None:
+            task = Task.objects.select_related("project__customer").get(
+                pk=intersection["task"]
+            )
+            intersection.update(
+                task=task, project=task.project, customer=task.project.customer
+            )
+        elif intersection["project"] is not None:
+            project = Project.objects.select_related("customer").get(
+                pk=intersection["project"]
+            )
+            intersection.update(project=project, customer=project.customer)
+        elif intersection["customer"] is not None:
+            intersection["customer"] = Customer.objects.get(pk=intersection["customer"])
 
-        return value
+        intersection["count"] = result["count"]
+        instance["intersection"] = intersection
+        return intersection
 
     def get_customer(self, instance):
-        return self._intersection(instance, "task__project__customer", Customer)
+        return self._get_intersection(instance)["customer"]
 
     def get_project(self, instance):
-        return self._intersection(instance, "task__project", Project)
+        return self._get_intersection(instance)["project"]
 
     def get_task(self, instance):
-        return self._intersection(instance, "task", Task)
+        return self._get_intersection(instance)["task"]
 
     def get_comment(self, instance):
-        return self._intersection(instance, "comment")
+        return self._get_intersection(instance)["comment"]
 
     def get_review(self, instance):
-        return self._intersection(instance, "review")
+        return self._get_intersection(instance)["review"]
 
     def get_not_billable(self, instance):
-        return self._intersection(instance, "not_billable")
+        return self._get_intersection(instance)["not_billable"]
 
     def get_verified(self, instance):
-        queryset = instance["queryset"]
-        queryset = queryset.annotate(
-            verified=Case(
-                When(verified_by_id__isnull=True, then=False),
-                default=True,
-                output_field=BooleanField(),
-            )
-        )
-        instance["queryset"] = queryset
-        return self._intersection(instance, "verified")
+        return self._get_intersection(instance)["verified"]
 
     def get_root_meta(self, resource, many):
         """Add number of results to meta."""
-        queryset = self.instance["queryset"]
-        return {"count": queryset.count()}
+        return {"count": self._get_intersection(self.instance)["count"]}
 
     included_serializers = {
         "customer": "timed.projects.serializers.CustomerSerializer",
@@ -264,6 +301,14 @@ class ReportIntersectionSerializer(Serializer):
         resource_name = "report-intersections"
 
 
+class AbsenceListSerializer(ListSerializer):
+    """Calculate durations of all listed absences at once."""
+
+    def to_representation(self, data):
+        self.child.durations = self.child.calculate_durations(data)
+        return super().to_representation(data)
+
+
 class AbsenceSerializer(ModelSerializer):
     """Absence serializer."""
 
@@ -276,14 +321,27 @@ class AbsenceSerializer(ModelSerializer):
         "type": "timed.employment.serializers.AbsenceTypeSerializer",
     }
 
+    def calculate_durations(self, absences):
+        """Calculate durations of given absences within their employments."""
+        absences = list(absences)
+        if not absences:
+            return {}
+
+        dates = [absence.date for absence in absences]
+        employments = Employment.objects.filter(
+            Q(end_date__gte=min(dates)) | Q(end_date__isnull=True),
+            user__in={absence.user_id for absence in absences},
+            start_date__lte=max(dates),
+        )
+        return models.Absence.objects.calculate_durations(absences, employments)
+
     def get_duration(self, instance):
-        try:
-            employment = Employment.objects.get_at(instance.user, instance.date)
-        except Employment.DoesNotExist:
-            # absence is invalid if no employment exists on absence date
-            return duration_string(timedelta())
+        durations = getattr(self, "durations", None)
+        if durations is None:
+            durations = self.calculate_durations([instance])
 
-        return duration_string(instance.calculate_duration(employment))
+        # absence is invalid if no employment exists on absence date
+        return duration_string(durations.get(instance.id, timedelta()))
 
     def validate_date(self, value):
         """Only owner is allowed to change date."""
@@ -338,3 +396,4 @@ class AbsenceSerializer(ModelSerializer):
 
         model = models.Absence
         fields = ["comment", "date", "duration", "type", "user"]
+        list_serializer_class = AbsenceListSerializer
@@ -0,0 +1,28 @@
+"""Signal handlers for the tracking app."""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from timed.reports import cache as statistic_cache
+from timed.tracking.models import Report, ReportRollup
+from timed.transaction import on_commit_batched
+
+
+@receiver(post_save, sender=Report)
+@receiver(post_delete, sender=Report)
+def update_rollup(sender, instance, **kwargs):
+    """Refresh rollup rows and statistics the report was and is counted in."""
+    date_field = instance._meta.get_field("date")
+    # date may not yet be converted when report is created with a string
+    keys = {(date_field.to_python(instance.date), instance.user_id, instance.task_id)}
+    projects = {instance.task.project_id}
+    # remembered by `remember_previous_day` of employment app
+    previous = getattr(instance, "_previous_day", None)
+    if previous is not None:
+        keys.add((previous["date"], previous["user"], previous["task"]))
+        projects.add(previous["task__project"])
+
+    # rows changed within a transaction, e.g. by a cascading delete, are
+    # refreshed at once, before statistics are invalidated
+    on_commit_batched(ReportRollup.objects.refresh, keys)
+    on_commit_batched(statistic_cache.bump_reports, projects)
@@ -1,40 +1,45 @@
+from itertools import groupby
+from operator import attrgetter
+
 from django.conf import settings
 from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
 from django.template.loader import get_template
 
 template = get_template("mail/notify_user_changed_reports.tmpl", using="text")
 
 
-def _send_notification_emails(changes, reviewer):
-    """Send email for each user."""
+def _get_notification_email(user, changes, reviewer, connection):
+    """Get email notifying user of changes of reports."""
+    body = template.render(
+        {
+            # we need start and end date in system format
+            "reviewer": reviewer,
+            "user_changes": changes,
+        }
+    )
 
-    subject = "[Timed] Your reports have been changed"
-    from_email = settings.DEFAULT_FROM_EMAIL
-    connection = get_connection()
+    return EmailMessage(
+        subject="[Timed] Your reports have been changed",
+        body=body,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[user.email],
+        connection=connection,
+        headers=settings.EMAIL_EXTRA_HEADERS,
+    )
 
-    messages = []
 
-    for user_changes in changes:
-        user = user_changes["user"]
+def _send_notification_emails(changes, reviewer):
+    """Send email for each user."""
 
-        body = template.render(
-            {
-                # we need start and end date in system format
-                "reviewer": reviewer,
-                "user_changes": user_changes["changes"],
-            }
-        )
+    connection = get_connection()
 
-        message = EmailMessage(
-            subject=subject,
-            body=body,
-            from_email=from_email,
-            to=[user.email],
-            connection=connection,
-            headers=settings.EMAIL_EXTRA_HEADERS,
+    messages = [
+        _get_notification_email(
+            user_changes["user"], user_changes["changes"], reviewer, connection
         )
-
-        messages.append(message)
+        for user_changes in changes
+    ]
     if len(messages) > 0:
         connection.send_messages(messages)
 
@@ -65,24 +70,67 @@ def notify_user_changed_report(report, fields, reviewer):
     _send_notification_emails([user_changes], reviewer)
 
 
-def notify_user_changed_reports(queryset, fields, reviewer):
-    users = [report.user for report in queryset.order_by("user").distinct("user")]
-    user_changes = []
+def get_user_changed_reports(queryset, fields, reviewer):
+    """
+    Get changes of reports per user which users are notified of.
+
+    Needs to be called before reports are updated. Reports are fetched in
+    a single pass ordered by user.
+
+    :returns: dict of user and list of changesets of reports
+    """
+    if not set(fields).intersection(settings.TRACKING_REPORT_VERIFIED_CHANGES):
+        # e.g. verifying only, users are not notified
+        return {}
+
+    reports = (
+        queryset.exclude(user=reviewer)
+        .select_related("user", "task")
+        .order_by("user", "date", "id")
+        .iterator()
+    )
+    changes = {}
+
+    for user, user_reports in groupby(reports, key=attrgetter("user")):
+        user_changes = [
+            changeset
+            for changeset in (
+                _get_report_changeset(report, fields) for report in user_reports
+            )
+            # skip empty changes
+            if changeset
+        ]
 
-    for user in users:
-        changes = []
-        for report in queryset.filter(user=user).order_by("date"):
-            changeset = _get_report_changeset(report, fields)
+        # skip user if changes are empty
+        if user_changes:
+            changes[user] = user_changes
 
-            # skip edits of own reports and empty changes
-            if report.user == reviewer or not changeset:
-                continue
-            changes.append(changeset)
+    return changes
 
-        # skip user if changes are empty
-        if not changes:
-            continue
 
-        user_changes.append({"user": user, "changes": changes})
+def notify_user_changed_reports(changes, reviewer):
+    """
+    Notify users of changes of their reports once changes are committed.
+
+    :param changes: dict of user and list of changesets of reports, see
+                    `get_user_changed_reports`
+    """
+    connection = get_connection()
+    messages = [
+        _get_notification_email(
+            user,
+            sorted(
+                user_changes,
+                key=lambda changeset: (
+                    changeset["report"].date,
+                    changeset["report"].id,
+                ),
+            ),
+            reviewer,
+            connection,
+        )
+        for user, user_changes in changes.items()
+    ]
 
-    _send_notification_emails(user_changes, reviewer)
+    if messages:
+        transaction.on_commit(lambda: connection.send_messages(messages))
@@ -9,6 +9,7 @@ from timed.employment.factories import (
     PublicHolidayFactory,
     UserFactory,
 )
+from timed.projects.factories import TaskFactory
 from timed.tracking.factories import AbsenceFactory, ReportFactory
 
 
@@ -34,6 +35,36 @@ def test_absence_list_authenticated(auth_client):
     assert json["data"][0]["id"] == str(absence.id)
 
 
+def test_absence_list_public_holiday_changed(auth_client):
+    absence = AbsenceFactory.create(
+        user=auth_client.user, date=datetime.date(2018, 1, 1)
+    )
+    employment = EmploymentFactory.create(
+        user=auth_client.user, start_date=datetime.date(2017, 12, 31)
+    )
+    holiday = PublicHolidayFactory.create(
+        date=absence.date, location=employment.location
+    )
+    url = reverse("absence-list")
+
+    response = auth_client.get(url)
+    assert len(response.json()["data"]) == 0
+
+    holiday.date = datetime.date(2018, 1, 2)
+    holiday.save()
+    response = auth_client.get(url)
+    assert len(response.json()["data"]) == 1
+
+    absence.date = datetime.date(2018, 1, 2)
+    absence.save()
+    response = auth_client.get(url)
+    assert len(response.json()["data"]) == 0
+
+    employment.delete()
+    response = auth_client.get(url)
+    assert len(response.json()["data"]) == 1
+
+
 def test_absence_list_superuser(superadmin_client):
     AbsenceFactory.create_batch(2)
 
@@ -291,6 +322,36 @@ def test_absence_fill_worktime_reported_time_to_long(auth_client):
     assert json["data"]["attributes"]["duration"] == "00:00:00"
 
 
+def test_absence_list_fill_worktime(auth_client, django_assert_num_queries):
+    """Durations of all listed absences should be calculated at once."""
+    date = datetime.date(2017, 5, 8)
+    user = auth_client.user
+    EmploymentFactory.create(
+        user=user, start_date=date, worktime_per_day=datetime.timedelta(hours=8)
+    )
+    type = AbsenceTypeFactory.create(fill_worktime=True)
+    task = TaskFactory.create()
+    for day in range(5):
+        absence_date = date + datetime.timedelta(days=day)
+        ReportFactory.create(
+            user=user,
+            date=absence_date,
+            task=task,
+            duration=datetime.timedelta(hours=day + 1),
+        )
+        AbsenceFactory.create(user=user, date=absence_date, type=type)
+
+    url = reverse("absence-list")
+
+    with django_assert_num_queries(3):
+        response = auth_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+
+    json = response.json()
+    durations = sorted(entry["attributes"]["duration"] for entry in json["data"])
+    assert durations == ["03:00:00", "04:00:00", "05:00:00", "06:00:00", "07:00:00"]
+
+
 def test_absence_weekend(auth_client):
     """Should not be able to create an absence on a weekend."""
     date = datetime.date(2017, 5, 14)
@@ -1,9 +1,11 @@
 """Tests for the reports endpoint."""
 
-from datetime import timedelta
+from datetime import date, timedelta
+from unittest import mock
 
 import pyexcel
 import pytest
+from django.db import DatabaseError
 from django.urls import reverse
 from django.utils.duration import duration_string
 from rest_framework import status
@@ -11,6 +13,7 @@ from rest_framework import status
 from timed.employment.factories import UserFactory
 from timed.projects.factories import CostCenterFactory, ProjectFactory, TaskFactory
 from timed.tracking.factories import ReportFactory
+from timed.tracking.models import ReportRollup
 
 
 def test_report_list(auth_client):
@@ -39,6 +42,107 @@ def test_report_list(auth_client):
     assert json["meta"]["total-time"] == "01:00:00"
 
 
+def test_report_list_paginated(auth_client, django_assert_num_queries):
+    task = TaskFactory.create()
+    ReportFactory.create_batch(
+        3, user=auth_client.user, task=task, duration=timedelta(hours=1)
+    )
+    url = reverse("report-list")
+
+    # page, count and total time are calculated in one query
+    with django_assert_num_queries(1):
+        response = auth_client.get(url, data={"page[size]": 2, "page[number]": 2})
+
+    assert response.status_code == status.HTTP_200_OK
+    json = response.json()
+    assert len(json["data"]) == 1
+    assert json["meta"]["total-time"] == "03:00:00"
+    assert json["meta"]["pagination"]["count"] == 3
+    assert json["meta"]["pagination"]["pages"] == 2
+
+
+def test_report_list_page_out_of_range(auth_client):
+    ReportFactory.create(user=auth_client.user)
+    url = reverse("report-list")
+
+    response = auth_client.get(url, data={"page[size]": 2, "page[number]": 2})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_report_list_cursor(auth_client, django_assert_num_queries):
+    task = TaskFactory.create()
+    reports = [
+        ReportFactory.create(
+            user=auth_client.user, task=task, date=date(2017, 1, day % 3 + 1)
+        )
+        for day in range(5)
+    ]
+    expected = [
+        str(report.id) for report in sorted(reports, key=lambda r: (r.date, r.id))
+    ]
+    url = reverse("report-list")
+
+    # page without count or total time is a single query
+    with django_assert_num_queries(1):
+        response = auth_client.get(url, data={"page[cursor]": "", "page[size]": 2})
+    assert response.status_code == status.HTTP_200_OK
+    json = response.json()
+    assert [entry["id"] for entry in json["data"]] == expected[:2]
+    assert "total-time" not in json["meta"]
+    assert json["links"]["prev"] is None
+
+    ids = [entry["id"] for entry in json["data"]]
+    while json["links"]["next"]:
+        json = auth_client.get(json["links"]["next"]).json()
+        ids.extend(entry["id"] for entry in json["data"])
+    assert ids == expected
+
+    # last page only links back
+    assert [entry["id"] for entry in json["data"]] == expected[4:]
+    json = auth_client.get(json["links"]["prev"]).json()
+    assert [entry["id"] for entry in json["data"]] == expected[2:4]
+    json = auth_client.get(json["links"]["prev"]).json()
+    assert [entry["id"] for entry in json["data"]] == expected[:2]
+    assert json["links"]["prev"] is None
+
+
+@pytest.mark.parametrize(
+    "count,expected",
+    [
+        ("exact", {"count": 3, "estimated": False}),
+        ("estimate", {"count": mock.ANY, "estimated": True}),
+    ],
+)
+def test_report_list_cursor_count(auth_client, count, expected):
+    ReportFactory.create_batch(
+        3, user=auth_client.user, task=TaskFactory.create(), duration=timedelta(hours=1)
+    )
+    url = reverse("report-list")
+
+    response = auth_client.get(url, data={"page[cursor]": "", "page[count]": count})
+    assert response.status_code == status.HTTP_200_OK
+    json = response.json()
+    assert json["meta"]["pagination"] == expected
+    if count == "exact":
+        assert json["meta"]["total-time"] == "03:00:00"
+
+
+@pytest.mark.parametrize(
+    "params,expected_status",
+    [
+        ({"page[cursor]": "invalid"}, status.HTTP_404_NOT_FOUND),
+        ({"page[cursor]": "", "page[count]": "invalid"}, status.HTTP_400_BAD_REQUEST),
+        ({"page[cursor]": "", "ordering": "-duration"}, status.HTTP_400_BAD_REQUEST),
+        ({"page[cursor]": "", "ordering": "date,id"}, status.HTTP_200_OK),
+    ],
+)
+def test_report_list_cursor_invalid(auth_client, params, expected_status):
+    url = reverse("report-list")
+
+    response = auth_client.get(url, data=params)
+    assert response.status_code == expected_status
+
+
 def test_report_intersection_full(auth_client):
     report = ReportFactory.create()
 
@@ -122,6 +226,30 @@ def test_report_intersection_partial(auth_client):
     assert json == expected
 
 
+def test_report_intersection_num_queries(auth_client, django_assert_num_queries):
+    task = TaskFactory.create()
+    ReportFactory.create_batch(3, task=task, comment="test")
+    ReportFactory.create_batch(
+        2, task=task, comment="other", verified_by=auth_client.user
+    )
+
+    url = reverse("report-intersection")
+    # validating task filter, intersecting all fields and fetching common task
+    with django_assert_num_queries(3):
+        response = auth_client.get(url, data={"task": task.id})
+    assert response.status_code == status.HTTP_200_OK
+
+    json = response.json()
+    assert json["meta"]["count"] == 5
+    assert json["data"]["attributes"]["comment"] is None
+    assert json["data"]["attributes"]["verified"] is None
+    assert json["data"]["attributes"]["review"] is False
+    relationships = json["data"]["relationships"]
+    assert relationships["task"]["data"]["id"] == str(task.id)
+    assert relationships["project"]["data"]["id"] == str(task.project.id)
+    assert relationships["customer"]["data"]["id"] == str(task.project.customer.id)
+
+
 def test_report_list_filter_id(auth_client):
     report_1 = ReportFactory.create(date="2017-01-01")
     report_2 = ReportFactory.create(date="2017-02-01")
@@ -424,6 +552,33 @@ def test_report_update_bulk_reset_verify(superadmin_client):
     assert report.verified_by_id is None
 
 
+def test_report_update_bulk_chunks(superadmin_client, settings):
+    settings.REPORTS_BULK_UPDATE_CHUNK_SIZE = 2
+    user = superadmin_client.user
+    reports = ReportFactory.create_batch(5, date=date(2017, 8, 17))
+    verified = ReportFactory.create(verified_by=user, date=date(2017, 8, 17))
+
+    url = reverse("report-bulk")
+
+    data = {
+        "data": {"type": "report-bulks", "id": None, "attributes": {"verified": True}}
+    }
+
+    # reports drop out of filter once verified
+    response = superadmin_client.post(url + "?editable=1&verified=0", data)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    for report in reports + [verified]:
+        report.refresh_from_db()
+        assert report.verified_by == user
+
+    assert set(
+        ReportRollup.objects.filter(date=date(2017, 8, 17)).values_list(
+            "verified", flat=True
+        )
+    ) == {True}
+
+
 def test_report_update_bulk_not_editable(auth_client):
     url = reverse("report-bulk")
 
@@ -797,10 +952,12 @@ def test_report_export(
 
     with django_assert_num_queries(1):
         response = auth_client.get(url, data={"file_type": file_type})
+        # streamed content is only fetched while consuming it
+        content = response.getvalue()
 
     assert response.status_code == status.HTTP_200_OK
 
-    book = pyexcel.get_book(file_content=response.content, file_type=file_type)
+    book = pyexcel.get_book(file_content=content, file_type=file_type)
     # bookdict is a dict of tuples(name, content)
     sheet = book.bookdict.popitem()[1]
 
@@ -837,6 +994,7 @@ def test_report_export_max_count(
     assert response.status_code == expected_status
 
 
+@pytest.mark.django_db(transaction=True)
 def test_report_update_bulk_verify_reviewer_multiple_notify(
     auth_client, task, task_factory, project, report_factory, user_factory, mailoutbox
 ):
@@ -951,6 +1109,73 @@ def test_report_update_reviewer_notify(
         assert mail.to[0] == user.email
 
 
+@pytest.mark.django_db(transaction=True)
+def test_report_update_bulk_notify_committed(
+    auth_client, settings, project, task, report_factory, user_factory, mailoutbox
+):
+    settings.REPORTS_BULK_UPDATE_CHUNK_SIZE = 1
+    reviewer = auth_client.user
+    project.reviewers.add(reviewer)
+    user1, user2 = user_factory.create_batch(2)
+    report1 = report_factory(user=user1, task=task)
+    report2 = report_factory(user=user2, task=task)
+
+    url = reverse("report-bulk")
+    data = {
+        "data": {
+            "type": "report-bulks",
+            "id": None,
+            "attributes": {"comment": "some comment"},
+        }
+    }
+
+    # second chunk fails
+    get_keys = mock.patch.object(
+        ReportRollup.objects, "get_keys", side_effect=[set(), DatabaseError]
+    )
+    with get_keys, pytest.raises(DatabaseError):
+        auth_client.post(url + f"?editable=1&reviewer={reviewer.id}", data)
+
+    report1.refresh_from_db()
+    report2.refresh_from_db()
+    assert report1.comment == "some comment"
+    assert report2.comment != "some comment"
+    # only users of committed chunk are notified
+    assert [mail.to for mail in mailoutbox] == [[user1.email]]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_report_update_bulk_notify_once(
+    auth_client, settings, project, task, report_factory, user_factory, mailoutbox
+):
+    settings.REPORTS_BULK_UPDATE_CHUNK_SIZE = 1
+    reviewer = auth_client.user
+    project.reviewers.add(reviewer)
+    user1, user2 = user_factory.create_batch(2)
+    report_factory(user=user1, task=task, date=date(2017, 8, 18), comment="later")
+    report_factory(user=user2, task=task)
+    report_factory(user=user1, task=task, date=date(2017, 8, 17), comment="earlier")
+
+    url = reverse("report-bulk")
+    data = {
+        "data": {
+            "type": "report-bulks",
+            "id": None,
+            "attributes": {"comment": "some comment"},
+        }
+    }
+    response = auth_client.post(url + f"?editable=1&reviewer={reviewer.id}", data)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    # user of reports in several chunks receives one mail of all changes
+    assert sorted(mail.to[0] for mail in mailoutbox) == sorted(
+        [user1.email, user2.email]
+    )
+    body = next(mail.body for mail in mailoutbox if mail.to == [user1.email])
+    assert body.index("earlier") < body.index("later")
+
+
+@pytest.mark.django_db(transaction=True)
 def test_report_notify_rendering(
     auth_client,
     user_factory,
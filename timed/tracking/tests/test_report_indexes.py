@@ -0,0 +1,92 @@
+"""Tests whether hot report queries are backed by an index."""
+
+from datetime import date, timedelta
+
+import pytest
+from django.db import connection
+
+from timed.employment.factories import UserFactory
+from timed.projects.factories import ProjectFactory, TaskFactory
+from timed.reports.management.commands.notify_reviewers_unverified import (
+    Command as NotifyReviewersUnverifiedCommand,
+)
+from timed.tracking.filters import ReportFilterSet
+from timed.tracking.models import Report
+
+
+@pytest.fixture
+def seeded_reports(db):
+    """Seed reports of two years, mostly verified and rarely to review."""
+    users = UserFactory.create_batch(10)
+    projects = ProjectFactory.create_batch(5, cost_center=None)
+    tasks = [
+        TaskFactory.create(project=project, cost_center=None)
+        for project in projects
+        for _ in range(4)
+    ]
+    start = date(2016, 1, 1)
+    Report.objects.bulk_create(
+        Report(
+            date=start + timedelta(days=index % 730),
+            duration=timedelta(hours=1),
+            user=users[index % len(users)],
+            task=tasks[index % len(tasks)],
+            verified_by=None if index % 50 == 0 else users[0],
+            review=index % 97 == 0,
+        )
+        for index in range(8000)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE tracking_report")
+
+    return users, projects
+
+
+def _get_scanned_relations(plan):
+    """Get names of relations scanned sequentially in plan."""
+    relations = set()
+    if plan["Node Type"] == "Seq Scan":
+        relations.add(plan["Relation Name"])
+    for subplan in plan.get("Plans", []):
+        relations |= _get_scanned_relations(subplan)
+    return relations
+
+
+def _explain(queryset):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN (FORMAT JSON) {0}".format(sql), params)
+        return cursor.fetchone()[0][0]["Plan"]
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"from_date": "2017-03-01", "to_date": "2017-03-31"},
+        {"user": 0, "from_date": "2017-01-01", "to_date": "2017-03-31"},
+        {"project": 0, "from_date": "2017-01-01", "to_date": "2017-03-31"},
+        {"verified": 0, "from_date": "2017-01-01", "to_date": "2017-06-30"},
+        {"review": 1},
+    ],
+)
+def test_report_filter_uses_index(seeded_reports, params):
+    users, projects = seeded_reports
+    if "user" in params:
+        params["user"] = users[1].id
+    if "project" in params:
+        params["project"] = projects[1].id
+
+    filterset = ReportFilterSet(params, queryset=Report.objects.all())
+    assert filterset.is_valid()
+
+    plan = _explain(filterset.qs)
+    assert "tracking_report" not in _get_scanned_relations(plan)
+
+
+def test_notify_reviewers_unverified_uses_index(seeded_reports):
+    queryset = NotifyReviewersUnverifiedCommand()._get_unverified_reports(
+        date(2017, 1, 1), date(2017, 1, 31)
+    )
+
+    plan = _explain(queryset)
+    assert "tracking_report" not in _get_scanned_relations(plan)
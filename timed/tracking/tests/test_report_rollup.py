@@ -0,0 +1,126 @@
+from datetime import date, timedelta
+
+import pytest
+from django.db import transaction
+from django.db.models import Sum
+from django.urls import reverse
+from rest_framework import status
+
+from timed.employment.factories import UserFactory
+from timed.projects.factories import TaskFactory
+from timed.tracking.factories import ReportFactory
+from timed.tracking.models import Report, ReportRollup
+
+
+def _rollup():
+    return {
+        (
+            entry.date,
+            entry.user_id,
+            entry.task_id,
+            entry.not_billable,
+            entry.verified,
+        ): entry.duration
+        for entry in ReportRollup.objects.all()
+    }
+
+
+def test_report_rollup_create_update_delete(db):
+    day = date(2017, 3, 1)
+    task = TaskFactory.create()
+    user = UserFactory.create()
+    report = ReportFactory.create(
+        user=user, task=task, date=day, duration=timedelta(hours=2)
+    )
+    ReportFactory.create(user=user, task=task, date=day, duration=timedelta(hours=1))
+
+    assert _rollup() == {(day, user.id, task.id, False, False): timedelta(hours=3)}
+
+    other_task = TaskFactory.create()
+    report.task = other_task
+    report.verified_by = user
+    report.save()
+
+    assert _rollup() == {
+        (day, user.id, task.id, False, False): timedelta(hours=1),
+        (day, user.id, other_task.id, False, True): timedelta(hours=2),
+    }
+
+    report.delete()
+
+    assert _rollup() == {(day, user.id, task.id, False, False): timedelta(hours=1)}
+
+
+def test_report_rollup_bulk_update(superadmin_client):
+    task = TaskFactory.create()
+    other_task = TaskFactory.create()
+    ReportFactory.create_batch(
+        2,
+        task=task,
+        user=superadmin_client.user,
+        date=date(2017, 3, 1),
+        duration=timedelta(hours=1),
+    )
+
+    url = reverse("report-bulk")
+    data = {
+        "data": {
+            "type": "report-bulks",
+            "id": None,
+            "attributes": {"not-billable": True},
+            "relationships": {"task": {"data": {"type": "tasks", "id": other_task.id}}},
+        }
+    }
+    response = superadmin_client.post(url + "?editable=1", data)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    assert not ReportRollup.objects.filter(task=task).exists()
+    rollup = ReportRollup.objects.get(task=other_task)
+    assert rollup.not_billable
+    assert rollup.duration == timedelta(hours=2)
+
+
+def test_report_rollup_refresh(db):
+    task = TaskFactory.create()
+    ReportFactory.create_batch(3, task=task)
+    # changes without signals are not reflected in rollup
+    Report.objects.update(duration=timedelta(hours=1))
+
+    ReportRollup.objects.refresh(ReportRollup.objects.get_keys(Report.objects))
+
+    total = ReportRollup.objects.aggregate(total=Sum("duration"))["total"]
+    assert total == timedelta(hours=3)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_report_rollup_refresh_on_commit(mocker):
+    task = TaskFactory.create()
+    ReportFactory.create_batch(3, task=task)
+    refresh = mocker.spy(ReportRollup.objects, "refresh")
+
+    with transaction.atomic():
+        Report.objects.all().delete()
+        assert ReportRollup.objects.exists()
+
+    # rows of all deleted reports are refreshed at once
+    assert refresh.call_count == 1
+    assert not ReportRollup.objects.exists()
+
+
+def test_report_rollup_statistic_fallback(auth_client):
+    task = TaskFactory.create()
+    user = auth_client.user
+    ReportFactory.create(user=user, task=task, review=True, duration=timedelta(hours=1))
+    ReportFactory.create(user=user, task=task, duration=timedelta(hours=2))
+
+    url = reverse("user-statistic-list")
+    # review is not part of rollup so statistic is calculated on reports
+    result = auth_client.get(url, data={"review": 1})
+    assert result.status_code == status.HTTP_200_OK
+    json = result.json()
+    assert json["data"][0]["attributes"]["duration"] == "01:00:00"
+
+    result = auth_client.get(url, data={"verified": 0, "user": user.id})
+    assert result.status_code == status.HTTP_200_OK
+    json = result.json()
+    assert json["data"][0]["attributes"]["duration"] == "03:00:00"
@@ -1,15 +1,24 @@
 """Viewsets for the tracking app."""
 
+import csv
+from collections import defaultdict
+from itertools import chain
+from tempfile import TemporaryFile
+
 import django_excel
 from django.conf import settings
+from django.db import transaction
 from django.db.models import Case, CharField, F, Q, Value, When
-from django.http import HttpResponseBadRequest
+from django.http import FileResponse, HttpResponseBadRequest, StreamingHttpResponse
 from django.utils.translation import ugettext_lazy as _
+from openpyxl import Workbook
 from rest_framework import exceptions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
+from timed.mixins import TotalTimeMixin
+from timed.pagination import KeysetPagination
 from timed.permissions import (
     IsAuthenticated,
     IsNotDelete,
@@ -21,8 +30,10 @@ from timed.permissions import (
     IsSupervisor,
     IsUnverified,
 )
+from timed.reports import cache as statistic_cache
 from timed.serializers import AggregateObject
 from timed.tracking import filters, models, serializers
+from timed.transaction import on_commit_batched
 
 from . import tasks
 
@@ -66,7 +77,7 @@ class AttendanceViewSet(ModelViewSet):
         )
 
 
-class ReportViewSet(ModelViewSet):
+class ReportViewSet(TotalTimeMixin, ModelViewSet):
     """Report view set."""
 
     queryset = models.Report.objects.select_related(
@@ -100,6 +111,14 @@ class ReportViewSet(ModelViewSet):
         "not_billable",
     )
 
+    @property
+    def pagination_class(self):
+        """Paginate by cursor when requested, even by an empty one."""
+        if KeysetPagination.cursor_query_param in self.request.query_params:
+            return KeysetPagination
+
+        return super().pagination_class
+
     def update(self, request, *args, **kwargs):
         """Override so we can issue emails on update."""
 
@@ -190,18 +209,71 @@ class ReportViewSet(ModelViewSet):
             if (
                 "review" in fields
                 and fields["review"]
-                or any(queryset.values_list("review", flat=True))
+                or queryset.filter(review=True).exists()
             ):
                 raise exceptions.ParseError(
                     _("Reports can't both be set as `review` and `verified`.")
                 )
 
         if fields:
-            tasks.notify_user_changed_reports(queryset, fields, user)
-            queryset.update(**fields)
+            self._update_in_chunks(queryset, fields)
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    def _update_in_chunks(self, queryset, fields):
+        """
+        Update reports in chunks of primary keys.
+
+        Each chunk is updated in its own transaction, so rows are only
+        locked for the duration of one chunk. Reports are selected by
+        primary key greater than last updated one, hence reports which
+        do not match filters anymore after update are not an issue.
+
+        Fields and permissions are validated before the first chunk, but
+        a chunk failing e.g. on a database error leaves previous chunks
+        updated. As an update sets the same values on every report, the
+        request may simply be repeated to update the remaining reports.
+
+        Users are notified once of all changes of committed chunks.
+        """
+        chunk_size = settings.REPORTS_BULK_UPDATE_CHUNK_SIZE
+        ids = queryset.order_by("pk").values_list("pk", flat=True)
+        last_id = None
+        changes = defaultdict(list)
+
+        try:
+            while True:
+                with transaction.atomic():
+                    chunk = ids if last_id is None else ids.filter(pk__gt=last_id)
+                    chunk = list(chunk[:chunk_size])
+                    if not chunk:
+                        break
+
+                    reports = models.Report.objects.filter(pk__in=chunk)
+                    chunk_changes = tasks.get_user_changed_reports(
+                        reports, fields, self.request.user
+                    )
+                    # update does not send signals so rollup and statistics
+                    # need to be refreshed
+                    rollup_keys = models.ReportRollup.objects.get_keys(reports)
+                    projects = set(reports.values_list("task__project", flat=True))
+                    if "task" in fields:
+                        rollup_keys |= {
+                            (day, user, fields["task"].id)
+                            for day, user, _ in rollup_keys
+                        }
+                        projects.add(fields["task"].project_id)
+
+                    reports.update(**fields)
+                    on_commit_batched(models.ReportRollup.objects.refresh, rollup_keys)
+
+                for user, user_changes in chunk_changes.items():
+                    changes[user].extend(user_changes)
+                statistic_cache.bump_reports(projects)
+                last_id = chunk[-1]
+        finally:
+            tasks.notify_user_changed_reports(changes, self.request.user)
+
     @action(methods=["get"], detail=False)
     def export(self, request):
         """Export filtered reports to given file format."""
@@ -276,11 +348,58 @@ class ReportViewSet(ModelViewSet):
         if file_type not in ["csv", "xlsx", "ods"]:
             return HttpResponseBadRequest()
 
+        if file_type == "csv":
+            return self._export_csv(content, colnames)
+        if file_type == "xlsx":
+            return self._export_xlsx(content, colnames)
+
         sheet = django_excel.pe.Sheet(content, name="Report", colnames=colnames)
         return django_excel.make_response(
             sheet, file_type=file_type, file_name="report.%s" % file_type
         )
 
+    def _export_csv(self, content, colnames):
+        """Stream csv rows while fetching reports in chunks from database."""
+
+        class Echo(object):
+            """File-like object which returns written value instead."""
+
+            def write(self, value):
+                return value
+
+        writer = csv.writer(Echo())
+        rows = chain([colnames], content.iterator())
+        response = StreamingHttpResponse(
+            (writer.writerow(row) for row in rows), content_type="text/csv"
+        )
+        response["Content-Disposition"] = "attachment; filename=report.csv"
+        return response
+
+    def _export_xlsx(self, content, colnames):
+        """
+        Write xlsx with constant memory.
+
+        Rows are fetched in chunks from database and written row by row to
+        a temporary file, which is sent once workbook is complete.
+        """
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Report")
+        sheet.append(colnames)
+        for row in content.iterator():
+            sheet.append(row)
+
+        output = TemporaryFile()
+        workbook.save(output)
+        output.seek(0)
+        return FileResponse(
+            output,
+            as_attachment=True,
+            filename="report.xlsx",
+            content_type=(
+                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            ),
+        )
+
 
 class AbsenceViewSet(ModelViewSet):
     """Absence view set."""
@@ -0,0 +1,31 @@
+"""Helpers to defer work till the current transaction commits."""
+
+from django.db import transaction
+
+
+def on_commit_batched(func, items, using=None):
+    """
+    Call function once with all items passed on till transaction commits.
+
+    Work for many rows changed in a single transaction, e.g. by a cascading
+    delete, is done at once. Outside of a transaction the function is
+    called right away.
+
+    Items passed on within a savepoint which is rolled back are still
+    handed to the function, so it needs to cope with superfluous items.
+
+    :param func: function to call with set of collected items
+    :param items: hashable items to pass on to function
+    """
+    connection = transaction.get_connection(using)
+    for savepoint_ids, callback in connection.run_on_commit:
+        if getattr(callback, "batched_func", None) == func:
+            callback.items.update(items)
+            return
+
+    def callback():
+        func(callback.items)
+
+    callback.batched_func = func
+    callback.items = set(items)
+    transaction.on_commit(callback, using)